@@ -1,6 +1,5 @@
 from datetime import timedelta
 from flask import Flask, request, jsonify
-from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_mail import Mail
 from flask_cors import CORS
@@ -8,24 +7,45 @@ from flask_login import LoginManager
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
 from flask import send_from_directory
-from models import db, TokenBlocklist, Admin, Student
+from models import db
+from token_blocklist import TokenBlocklistCache
+from counters import ReactionBuffer
+from cache import MemoryCache, create_cache
+from search import MemorySearchBackend, create_search_backend
+from serializers import init_json
+from feed import FeedIndex
+from leaderboard import LeaderboardRefresher
+from jobs import create_job_queue
+from auth_providers import create_auth_provider, project_id_from_credentials
+from passwords import create_password_hasher
+from db_pool import PoolMetrics, engine_options
 
+import atexit
+import importlib
 import logging
 import os
 
-from views.auth import auth_bp  # Example import for blueprints
-from views.comment import comment_bp
-from views.admin import admin_bp
-from views.student import student_bp
-from views.post import post_bp
-from views.category import category_bp
-from views.content import content_bp
-from views.subscription import subscription_bp
-from views.wishlist import wishlist_bp
-from views.share import share_bp
-from views.preference import preference_bp
-from views.notification import notification_bp
-from views.profile import profile_bp
+# (module, blueprint, url_prefix), imported when create_app registers them so
+# importing this module stays cheap and BLUEPRINTS can leave some out entirely
+BLUEPRINTS = [
+    ("views.auth", "auth_bp", None),
+    ("views.comment", "comment_bp", None),
+    ("views.admin", "admin_bp", None),
+    ("views.student", "student_bp", None),
+    ("views.post", "post_bp", None),
+    ("views.category", "category_bp", None),
+    ("views.content", "content_bp", None),
+    ("views.subscription", "subscription_bp", None),
+    ("views.wishlist", "wishlist_bp", None),
+    ("views.share", "share_bp", None),
+    ("views.preference", "preference_bp", None),
+    ("views.notification", "notification_bp", None),
+    ("views.profile", "profile_bp", "/profile"),
+    ("views.search", "search_bp", None),
+    ("views.feed", "feed_bp", None),
+    ("views.leaderboard", "leaderboard_bp", None),
+    ("views.metrics", "metrics_bp", None),
+]
 
 # Initialize extensions
 mail = Mail()
@@ -46,8 +66,92 @@ def create_app():
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "your_default_secret_key")
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Connection pool, per worker process (PostgreSQL/MySQL; SQLite keeps its own
+    # pool). Workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) must stay under the
+    # server's connection limit. DB_POOL_RECYCLE=-1 never recycles;
+    # DB_STATEMENT_TIMEOUT_MS=0 leaves statements unbounded (PostgreSQL only)
+    app.config["DB_POOL_SIZE"] = int(os.getenv("DB_POOL_SIZE", "5"))
+    app.config["DB_MAX_OVERFLOW"] = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    app.config["DB_POOL_TIMEOUT"] = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    app.config["DB_POOL_RECYCLE"] = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    app.config["DB_POOL_PRE_PING"] = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    app.config["DB_STATEMENT_TIMEOUT_MS"] = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
+    # Bearer token required by GET /metrics; unset, the endpoint is not served
+    app.config["METRICS_TOKEN"] = os.getenv("METRICS_TOKEN")
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "your_jwt_secret")
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=24)
+    # How stale (in seconds) this worker's view of revoked tokens may get
+    app.config["JWT_BLOCKLIST_POLL_SECONDS"] = float(os.getenv("JWT_BLOCKLIST_POLL_SECONDS", "5"))
+    # Like/dislike write batching window in ms; 0 writes every reaction immediately
+    app.config["REACTION_FLUSH_MS"] = int(os.getenv("REACTION_FLUSH_MS", "0"))
+    # Seconds a buffered reaction's returned count may lag other workers' reactions
+    app.config["REACTION_COUNT_TTL"] = float(os.getenv("REACTION_COUNT_TTL", "5"))
+
+    # Response cache for public read endpoints: "memory" (per worker), "redis" (shared) or "none"
+    app.config["CACHE_BACKEND"] = os.getenv("CACHE_BACKEND", "memory")
+    app.config["CACHE_REDIS_URL"] = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    app.config["CACHE_DEFAULT_TTL"] = int(os.getenv("CACHE_DEFAULT_TTL", "60"))
+    app.config["CACHE_MAX_ENTRIES"] = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+
+    # Full-text search: "memory" (per-worker BM25) or "postgres" (tsvector + GIN);
+    # unset picks "postgres" on a PostgreSQL database
+    app.config["SEARCH_BACKEND"] = os.getenv("SEARCH_BACKEND")
+
+    # Response JSON encoder: "orjson" (used when installed) or "default" (stdlib)
+    app.config["JSON_PROVIDER"] = os.getenv("JSON_PROVIDER", "orjson")
+
+    # "For You" feed: newest items kept per category, seconds before a pool's
+    # engagement counts are re-read, the recency half-life in hours, and how
+    # many student profiles this worker keeps
+    app.config["FEED_POOL_SIZE"] = int(os.getenv("FEED_POOL_SIZE", "200"))
+    app.config["FEED_POOL_TTL"] = int(os.getenv("FEED_POOL_TTL", "60"))
+    app.config["FEED_HALF_LIFE_HOURS"] = float(os.getenv("FEED_HALF_LIFE_HOURS", "24"))
+    app.config["FEED_PROFILE_CACHE_SIZE"] = int(os.getenv("FEED_PROFILE_CACHE_SIZE", "10000"))
+
+    # Seconds between leaderboard refreshes in this process. Off by default so
+    # web workers don't all refresh at once: run scripts/refresh_leaderboards.py
+    # from cron, or set this in exactly one process
+    app.config["LEADERBOARD_REFRESH_SECONDS"] = int(os.getenv("LEADERBOARD_REFRESH_SECONDS", "0"))
+
+    # Background jobs (email, notification fan-out): "memory" (worker threads),
+    # "database" (durable jobs table with retries) or "none" (run inline)
+    app.config["JOB_BACKEND"] = os.getenv("JOB_BACKEND", "memory")
+    app.config["JOB_WORKERS"] = int(os.getenv("JOB_WORKERS", "2"))
+    app.config["JOB_MAX_ATTEMPTS"] = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    app.config["JOB_POLL_SECONDS"] = float(os.getenv("JOB_POLL_SECONDS", "1"))
+
+    # Sign-in token verification: "firebase" (local, against Google's cached
+    # signing keys; the default when the project id is known) or
+    # "firebase-admin" (the Admin SDK, initialized on first use)
+    app.config["AUTH_PROVIDER"] = os.getenv("AUTH_PROVIDER")
+    app.config["FIREBASE_PROJECT_ID"] = os.getenv("FIREBASE_PROJECT_ID") or project_id_from_credentials()
+    app.config["FIREBASE_TOKEN_CACHE_SIZE"] = int(os.getenv("FIREBASE_TOKEN_CACHE_SIZE", "10000"))
+    # Refresh the signing keys from a background thread in this process. Off
+    # by default (keys are fetched on the first verification instead), since
+    # scripts and workers that never verify a token need no thread of their own
+    app.config["AUTH_KEY_PREFETCH"] = os.getenv("AUTH_KEY_PREFETCH", "false").lower() in ("1", "true", "yes")
+
+    # Password hashing: "pbkdf2", "scrypt" or "argon2" (needs argon2-cffi). Raising
+    # a cost (or switching scheme) upgrades each stored hash at its next login
+    app.config["PASSWORD_HASH_SCHEME"] = os.getenv("PASSWORD_HASH_SCHEME", "pbkdf2")
+    app.config["PASSWORD_PBKDF2_ITERATIONS"] = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "600000"))
+    app.config["PASSWORD_SCRYPT_N"] = int(os.getenv("PASSWORD_SCRYPT_N", "32768"))
+    app.config["PASSWORD_ARGON2_TIME_COST"] = int(os.getenv("PASSWORD_ARGON2_TIME_COST", "3"))
+    app.config["PASSWORD_ARGON2_MEMORY_KIB"] = int(os.getenv("PASSWORD_ARGON2_MEMORY_KIB", "65536"))
+    # Hashes computed at once in this process (0 = one per CPU core)
+    app.config["PASSWORD_HASH_CONCURRENCY"] = int(os.getenv("PASSWORD_HASH_CONCURRENCY", "0"))
+
+    # Processes hashing passwords during bulk student imports (0 = one per CPU core)
+    app.config["STUDENT_IMPORT_WORKERS"] = int(os.getenv("STUDENT_IMPORT_WORKERS", "0"))
+
+    # Seconds a looked-up caller (identity.get_current_user) is reused across
+    # requests in this worker; 0 looks the caller up once per request
+    app.config["CURRENT_USER_CACHE_TTL"] = int(os.getenv("CURRENT_USER_CACHE_TTL", "30"))
+    app.config["CURRENT_USER_CACHE_SIZE"] = int(os.getenv("CURRENT_USER_CACHE_SIZE", "10000"))
+
+    # Comma-separated view modules to serve (e.g. "auth,post"); unset serves all
+    app.config["BLUEPRINTS"] = os.getenv("BLUEPRINTS")
 
     # Mail configuration
     app.config["MAIL_SERVER"] = "smtp.gmail.com"
@@ -56,6 +160,10 @@ def create_app():
     app.config["MAIL_USERNAME"] = os.getenv("MAIL_USERNAME")
     app.config["MAIL_PASSWORD"] = os.getenv("MAIL_PASSWORD")
     app.config["MAIL_DEFAULT_SENDER"] = os.getenv("MAIL_DEFAULT_SENDER")
+    # Batch sends (digests, announcements): messages per SMTP connection before
+    # reconnecting, and an optional messages/second cap (0 = unthrottled)
+    app.config["MAIL_MAX_PER_CONNECTION"] = int(os.getenv("MAIL_MAX_PER_CONNECTION", "100"))
+    app.config["MAIL_RATE_PER_SECOND"] = float(os.getenv("MAIL_RATE_PER_SECOND", "0"))
 
     # CORS configuration
     CORS(
@@ -64,6 +172,7 @@ def create_app():
         "origins": "*",  # Allow all origins
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         "allow_headers": ["Content-Type", "Authorization"],
+        "expose_headers": ["X-Next-Cursor"],
         "supports_credentials": True
     }}
 )
@@ -73,29 +182,71 @@ def create_app():
 
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        app.extensions["pool_metrics"] = PoolMetrics().instrument(db.engine)
     Migrate(app, db)
     mail.init_app(app)
     jwt.init_app(app)
     login_manager.init_app(app)
 
     login_manager.login_view = "auth_bp.google_login"
+    init_json(app)
+
+    if app.config["REACTION_FLUSH_MS"] > 0:
+        reaction_buffer = ReactionBuffer(app, app.config["REACTION_FLUSH_MS"], app.config["REACTION_COUNT_TTL"])
+        reaction_buffer.start()
+        atexit.register(reaction_buffer.stop)
+        app.extensions["reaction_buffer"] = reaction_buffer
+
+    app.extensions["response_cache"] = create_cache(app.config)
+    app.extensions["search_backend"] = create_search_backend(app.config)
+    if isinstance(app.extensions["search_backend"], MemorySearchBackend):
+        app.extensions["search_backend"].start(app)
+    app.extensions["feed_index"] = FeedIndex(
+        pool_size=app.config["FEED_POOL_SIZE"],
+        pool_ttl=app.config["FEED_POOL_TTL"],
+        half_life_hours=app.config["FEED_HALF_LIFE_HOURS"],
+        max_profiles=app.config["FEED_PROFILE_CACHE_SIZE"],
+    )
+
+    if app.config["LEADERBOARD_REFRESH_SECONDS"] > 0:
+        leaderboard_refresher = LeaderboardRefresher(app, app.config["LEADERBOARD_REFRESH_SECONDS"])
+        leaderboard_refresher.start()
+        atexit.register(leaderboard_refresher.stop)
+
+    app.extensions["password_hasher"] = create_password_hasher(app.config)
+    app.extensions["user_cache"] = (
+        MemoryCache(app.config["CURRENT_USER_CACHE_SIZE"], app.config["CURRENT_USER_CACHE_TTL"])
+        if app.config["CURRENT_USER_CACHE_TTL"] > 0 else None
+    )
+
+    auth_provider = create_auth_provider(app.config)
+    if app.config["AUTH_KEY_PREFETCH"]:
+        auth_provider.start()  # Pre-warms signing keys in the background
+        atexit.register(auth_provider.stop)
+    app.extensions["auth_provider"] = auth_provider
+
+    # Email and subscriber notifications run off the request thread
+    job_queue = create_job_queue(app)
+    if job_queue is not None:
+        atexit.register(job_queue.stop)
+    app.extensions["job_queue"] = job_queue
 
     # Register blueprints
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(comment_bp)
-    app.register_blueprint(admin_bp)
-    app.register_blueprint(student_bp)
-    app.register_blueprint(post_bp)
-    app.register_blueprint(category_bp)
-    app.register_blueprint(content_bp)
-    app.register_blueprint(subscription_bp)
-    app.register_blueprint(wishlist_bp)
-    app.register_blueprint(share_bp)
-    app.register_blueprint(preference_bp)
-    app.register_blueprint(notification_bp)
-    app.register_blueprint(profile_bp, url_prefix="/profile")
-
-    # Token blocklist check
+    enabled = app.config["BLUEPRINTS"]
+    enabled = {name.strip() for name in enabled.split(",")} if enabled else None
+    for module_name, blueprint, url_prefix in BLUEPRINTS:
+        if enabled is None or module_name.rsplit(".", 1)[1] in enabled:
+            module = importlib.import_module(module_name)
+            app.register_blueprint(getattr(module, blueprint), url_prefix=url_prefix)
+
+    # Token blocklist check, served from an in-process cache of revoked JTIs
+    blocklist = TokenBlocklistCache(
+        app.config["JWT_ACCESS_TOKEN_EXPIRES"],
+        poll_interval=app.config["JWT_BLOCKLIST_POLL_SECONDS"],
+    )
+    app.extensions["token_blocklist"] = blocklist
+
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(_jwt_header, jwt_payload: dict) -> bool:
         jti = jwt_payload.get("jti")  # Get the unique JWT token identifier
@@ -103,7 +254,7 @@ def create_app():
         if not jti:
             return True  # If there's no JTI, treat it as revoked for safety
 
-        return db.session.query(TokenBlocklist.id).filter_by(jti=jti).first() is not None
+        return blocklist.is_revoked(jti)
 
     # Root route handler
     @app.route('/')
@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from flask import current_app
+
+# Service account file at the project root, as the Admin SDK has always read it
+FIREBASE_CREDENTIALS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "firebase-service-account.json"
+)
+
+
+def project_id_from_credentials(path=FIREBASE_CREDENTIALS_PATH):
+    """The project_id in a service account JSON file, or None if it cannot be read."""
+    try:
+        with open(path) as f:
+            return json.load(f).get("project_id")
+    except (OSError, ValueError):
+        return None
+
+
+class InvalidIdToken(ValueError):
+    """The token is malformed, expired, or not signed for this Firebase project."""
+
+
+class AuthProviderUnavailable(RuntimeError):
+    """The provider cannot verify anything right now, e.g. its credentials or signing keys are missing."""
+
+
+class AuthProvider(ABC):
+    """
+    Verifies the ID tokens clients get from third-party sign-in.
+
+    verify_id_token returns the token's claims (at least "uid" and "email"),
+    raises InvalidIdToken for a bad token, or AuthProviderUnavailable when it
+    cannot check any token. Providers set themselves up on first use, so
+    building the app or importing the auth views stays cheap.
+    """
+
+    @abstractmethod
+    def verify_id_token(self, id_token):
+        """The claims of a valid ID token."""
+
+    def start(self):
+        """Begin any background work (e.g. key refresh). Optional."""
+
+    def stop(self):
+        """Stop what start() began."""
+
+
+class FirebaseAdminProvider(AuthProvider):
+    """
+    The Firebase Admin SDK, imported and initialized on the first
+    verification rather than when the auth views are imported. A missing
+    service account file fails that request, not the whole app.
+    """
+
+    def __init__(self, credentials_path=FIREBASE_CREDENTIALS_PATH):
+        self.credentials_path = credentials_path
+        self._auth = None
+        self._lock = threading.Lock()
+
+    def _sdk(self):
+        if self._auth is None:
+            with self._lock:
+                if self._auth is None:
+                    import firebase_admin
+                    from firebase_admin import auth, credentials
+
+                    if not firebase_admin._apps:
+                        if not os.path.exists(self.credentials_path):
+                            raise AuthProviderUnavailable(
+                                f"Firebase service account JSON file not found at {self.credentials_path}"
+                            )
+                        firebase_admin.initialize_app(credentials.Certificate(self.credentials_path))
+                    self._auth = auth
+        return self._auth
+
+    def verify_id_token(self, id_token):
+        auth = self._sdk()
+        try:
+            return auth.verify_id_token(id_token)
+        except auth.CertificateFetchError as e:
+            raise AuthProviderUnavailable(f"Could not fetch Firebase signing keys: {e}")
+        except (auth.InvalidIdTokenError, ValueError) as e:
+            raise InvalidIdToken(str(e))
+
+
+def create_auth_provider(config):
+    """
+    Build the provider selected by AUTH_PROVIDER: "firebase" (local
+    verification with cached keys and tokens, the default when the Firebase
+    project id is known) or "firebase-admin" (the Admin SDK, loaded lazily).
+    """
+    name = config.get("AUTH_PROVIDER") or ("firebase" if config.get("FIREBASE_PROJECT_ID") else "firebase-admin")
+    if name == "firebase":
+        from firebase_tokens import FirebaseTokenVerifier
+
+        return FirebaseTokenVerifier(config["FIREBASE_PROJECT_ID"],
+                                     max_entries=config.get("FIREBASE_TOKEN_CACHE_SIZE", 10000))
+    if name == "firebase-admin":
+        return FirebaseAdminProvider(config.get("FIREBASE_CREDENTIALS_PATH") or FIREBASE_CREDENTIALS_PATH)
+    raise ValueError(f"Unknown AUTH_PROVIDER: {name}")
+
+
+def get_auth_provider():
+    """The app's provider; apps that never configured one get the lazy Admin SDK."""
+    provider = current_app.extensions.get("auth_provider")
+    if provider is None:
+        provider = current_app.extensions["auth_provider"] = FirebaseAdminProvider()
+    return provider
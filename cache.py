@@ -0,0 +1,162 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL. Each worker has its own copy."""
+
+    def __init__(self, max_entries=1024, default_ttl=60, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisCache:
+    """
+    Same interface over a Redis-compatible client (redis.Redis or a stand-in with
+    get/set/delete). Shared by all workers, so invalidations are seen everywhere.
+    """
+
+    def __init__(self, client, default_ttl=60, prefix="motivation:cache:"):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl or None)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+def create_cache(config):
+    """Build the backend selected by CACHE_BACKEND ("memory", "redis" or "none")."""
+    backend = config.get("CACHE_BACKEND", "memory")
+    ttl = config.get("CACHE_DEFAULT_TTL", 60)
+    if backend == "none":
+        return None
+    if backend == "redis":
+        import redis  # Optional dependency, only needed for the shared backend
+        return RedisCache(redis.Redis.from_url(config["CACHE_REDIS_URL"]), default_ttl=ttl)
+    if backend == "memory":
+        return MemoryCache(max_entries=config.get("CACHE_MAX_ENTRIES", 1024), default_ttl=ttl)
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+def get_cache():
+    return current_app.extensions.get("response_cache")
+
+
+# Every cached response is stored under its namespace's current generation.
+# Invalidating a namespace deletes the generation; the next read mints a new
+# one, so all of its old entries become unreachable at once and age out.
+def _generation(cache, namespace):
+    key = f"gen:{namespace}"
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid.uuid4().hex[:12]
+        cache.set(key, generation, ttl=0)
+    return generation
+
+
+def invalidate(*namespaces):
+    """Drop every cached response in the given namespaces (e.g. "posts", "post:12")."""
+    cache = get_cache()
+    if cache is not None:
+        cache.delete(*(f"gen:{namespace}" for namespace in namespaces))
+
+
+def cached_response(namespace, ttl=None, bypass=None):
+    """
+    Cache a GET view's 200 responses, keyed by path and query string.
+
+    namespace may reference the view's URL arguments, e.g. "post:{post_id}".
+    Responses carry an ETag; a matching If-None-Match gets a 304 straight from
+    the cache. Streamed responses pass through uncached, as do all responses
+    when no cache is configured.
+
+    Views that pick their format from the Accept header pass a bypass
+    predicate (e.g. wants_ndjson): requests it matches skip the cache, which
+    only ever holds the default format, and every response says Vary: Accept
+    so shared caches keep the formats apart too.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = cached(*args, **kwargs)
+            if bypass is not None:
+                response.vary.add("Accept")
+            return response
+
+        def cached(*args, **kwargs):
+            cache = get_cache()
+            if cache is None or (bypass is not None and bypass()):
+                return current_app.make_response(view(*args, **kwargs))
+
+            resolved = namespace.format(**kwargs)
+            key = f"view:{resolved}:{_generation(cache, resolved)}:{request.full_path}"
+            entry = cache.get(key)
+
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                entry = {
+                    "body": body.decode("utf-8"),
+                    "etag": hashlib.sha1(body).hexdigest(),
+                    "mimetype": response.mimetype,
+                    "headers": [
+                        (name, value) for name, value in response.headers
+                        if name not in ("Content-Type", "Content-Length")
+                    ],
+                }
+                cache.set(key, entry, ttl)
+
+            response = current_app.response_class(
+                entry["body"], status=200, mimetype=entry["mimetype"], headers=entry["headers"]
+            )
+            response.set_etag(entry["etag"])
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
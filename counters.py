@@ -0,0 +1,215 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.exc import IntegrityError
+from models import db, Post, PostReaction
+
+logger = logging.getLogger(__name__)
+
+
+# Which Post counter each reaction contributes to
+REACTION_COUNTERS = {"like": "likes", "dislike": "dislikes"}
+
+
+def increment_counter(model, row_id, column, delta=1, commit=True):
+    """
+    Add delta to one counter column in a single UPDATE ... SET col = col + delta.
+
+    The database does the arithmetic, so concurrent requests can't lose each
+    other's increments. Returns the new value, or None if the row doesn't exist.
+    Pass commit=False to leave the update in the caller's transaction.
+    """
+    col = getattr(model, column)
+    stmt = (
+        update(model)
+        .where(model.id == row_id)
+        .values({column: func.coalesce(col, 0) + delta})
+        .returning(col)
+        .execution_options(synchronize_session=False)
+    )
+    new_value = db.session.execute(stmt).scalar()
+    if commit:
+        db.session.commit()
+    return new_value
+
+
+def set_post_reaction(post_id, student_id, reaction, retry=True):
+    """
+    Make a student's reaction to a post "like", "dislike" or None (cleared).
+
+    Repeating the current reaction is a no-op, so client retries can't inflate
+    the counters. The ledger row and the Post counters change in one transaction.
+    Returns {"likes", "dislikes", "reaction"}, or None if the post doesn't exist.
+    """
+    counts = db.session.query(Post.likes, Post.dislikes).filter(Post.id == post_id).first()
+    if counts is None:
+        return None
+    result = {"likes": counts.likes or 0, "dislikes": counts.dislikes or 0}
+
+    existing = (
+        PostReaction.query.filter_by(student_id=student_id, post_id=post_id)
+        .with_for_update()
+        .first()
+    )
+    previous = existing.reaction if existing else None
+    if previous == reaction:
+        db.session.rollback()  # Release the row lock taken above
+        return dict(result, reaction=reaction)
+
+    if existing is None:
+        db.session.add(PostReaction(student_id=student_id, post_id=post_id, reaction=reaction))
+    elif reaction is None:
+        db.session.delete(existing)
+    else:
+        existing.reaction = reaction
+
+    try:
+        db.session.flush()  # Surface a concurrent duplicate insert before touching counters
+        if previous:
+            column = REACTION_COUNTERS[previous]
+            result[column] = increment_counter(Post, post_id, column, -1, commit=False)
+        if reaction:
+            column = REACTION_COUNTERS[reaction]
+            result[column] = increment_counter(Post, post_id, column, 1, commit=False)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request from the same student recorded a reaction first;
+        # re-run once against its row. Anything else (e.g. a bad student id) is re-raised.
+        db.session.rollback()
+        if not retry:
+            raise
+        return set_post_reaction(post_id, student_id, reaction, retry=False)
+
+    return dict(result, reaction=reaction)
+
+
+def get_post_reactions(student_id, post_ids):
+    """The student's reaction to each of post_ids in one query; posts without one map to None."""
+    rows = (
+        db.session.query(PostReaction.post_id, PostReaction.reaction)
+        .filter(PostReaction.student_id == student_id, PostReaction.post_id.in_(post_ids))
+        .all()
+    )
+    reactions = dict.fromkeys(post_ids)
+    reactions.update(rows)
+    return reactions
+
+
+class ReactionBuffer:
+    """
+    Aggregates counter deltas in memory and writes them in bulk.
+
+    Each flush issues one executemany UPDATE per (table, column) with the summed
+    delta per row, so a burst of likes on a hot post costs one row write per
+    flush interval instead of one per click. Deltas still pending when the
+    process dies are lost; use it where approximate counts are acceptable.
+
+    The count add() returns is the row's stored value, read at most once
+    every count_ttl seconds per row, plus what this worker has added since;
+    the burst itself reads nothing. Other workers' reactions show up when the
+    stored value is next read. A read never overlaps a flush, so a delta is
+    counted once whether the read sees it committed or still pending.
+    """
+
+    def __init__(self, app, flush_interval_ms=500, count_ttl=5.0, clock=time.monotonic):
+        self.app = app
+        self.flush_interval = flush_interval_ms / 1000
+        self.count_ttl = count_ttl
+        self._clock = clock
+        self._pending = defaultdict(int)  # (model, column, row_id) -> delta
+        self._flushing = {}  # Deltas the running flush has taken but not yet committed
+        self._counts = {}  # (model, column, row_id) -> (stored value incl. our flushed deltas, read at)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Held from taking the deltas until the counts include them
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, model, row_id, column, delta=1):
+        """Queue a delta; returns the approximate new count, or None if the row is missing."""
+        key = (model, column, row_id)
+        now = self._clock()
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None and now - count[1] < self.count_ttl:
+                self._pending[key] += delta
+                return count[0] + self._flushing.get(key, 0) + self._pending[key]
+        with self._flush_lock:
+            row = db.session.query(getattr(model, column)).filter(model.id == row_id).first()
+            if row is None:
+                return None
+            with self._lock:
+                self._counts[key] = (row[0] or 0, now)
+                self._pending[key] += delta
+                return (row[0] or 0) + self._pending[key]
+
+    def flush(self):
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._flushing = pending
+        if not pending:
+            return
+
+        batches = defaultdict(list)
+        for (model, column, row_id), delta in pending.items():
+            if delta:
+                batches[(model, column)].append({"row_id": row_id, "delta": delta})
+
+        with self.app.app_context():
+            try:
+                for (model, column), params in batches.items():
+                    table = model.__table__
+                    stmt = (
+                        update(table)
+                        .where(table.c.id == bindparam("row_id"))
+                        .values({column: func.coalesce(table.c[column], 0) + bindparam("delta")})
+                    )
+                    db.session.execute(stmt, params)
+                db.session.commit()
+                self._flushed(pending)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Reaction flush failed, re-queueing {len(pending)} deltas: {e}")
+                with self._lock:
+                    self._flushing = {}
+                    for key, delta in pending.items():
+                        self._pending[key] += delta
+
+    def _flushed(self, deltas):
+        """Move flushed deltas into the cached stored counts and forget counts too old to serve."""
+        cutoff = self._clock() - self.count_ttl
+        with self._lock:
+            self._flushing = {}
+            for key, delta in deltas.items():
+                count = self._counts.get(key)
+                if count is not None:
+                    self._counts[key] = (count[0] + delta, count[1])
+            self._counts = {key: count for key, count in self._counts.items() if count[1] > cutoff}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="reaction-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+def record_reaction(model, row_id, column):
+    """Count one reaction, buffered if the app has a ReactionBuffer, otherwise immediately."""
+    buffer = current_app.extensions.get("reaction_buffer")
+    if buffer is not None:
+        return buffer.add(model, row_id, column)
+    return increment_counter(model, row_id, column)
@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout took to its PoolMetrics, if it has one."""
+
+    metrics = None
+
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            metrics.record_timeout()
+            raise
+        finally:
+            metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()  # After engine.dispose(); keep reporting
+        pool.metrics = self.metrics
+        return pool
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings. Pool sizing only
+    applies to server databases: SQLite keeps Flask-SQLAlchemy's own pool
+    choice. The statement timeout is set per connection on PostgreSQL.
+    """
+    options = {"pool_pre_ping": config.get("DB_POOL_PRE_PING", True)}
+    uri = config.get("SQLALCHEMY_DATABASE_URI")
+    backend = make_url(uri).get_backend_name() if uri else None
+    if backend is None or backend == "sqlite":
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.get("DB_POOL_SIZE", 5),
+        max_overflow=config.get("DB_MAX_OVERFLOW", 10),
+        pool_timeout=config.get("DB_POOL_TIMEOUT", 30),
+        pool_recycle=config.get("DB_POOL_RECYCLE", 1800),
+    )
+    timeout_ms = config.get("DB_STATEMENT_TIMEOUT_MS", 0)
+    if timeout_ms and backend == "postgresql":
+        options["connect_args"] = {"options": f"-c statement_timeout={int(timeout_ms)}"}
+    return options
+
+
+class PoolMetrics:
+    """
+    Connection pool counters for one engine in this process: checkouts,
+    checkout wait (a histogram; needs InstrumentedQueuePool), timeouts and
+    connection churn (opened, closed, invalidated), plus the pool's current
+    size, checked-out and overflow counts read at render time.
+    """
+
+    def __init__(self):
+        self.engine = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.opened = 0
+        self.closed = 0
+        self.invalidated = 0
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def instrument(self, engine):
+        self.engine = engine
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool.metrics = self
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "close_detached", self._on_close)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        return self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_close(self, dbapi_connection, *args):
+        with self._lock:
+            self.closed += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidated += 1
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        """Current gauges and counters as a dict."""
+        pool = self.engine.pool if self.engine is not None else None
+        size = pool.size() if isinstance(pool, QueuePool) else None
+        with self._lock:
+            return {
+                "pool": type(pool).__name__ if pool is not None else None,
+                "size": size,
+                "max_overflow": pool._max_overflow if isinstance(pool, QueuePool) else None,
+                "checked_out": pool.checkedout() if isinstance(pool, QueuePool) else None,
+                "idle": pool.checkedin() if isinstance(pool, QueuePool) else None,
+                # Negative until the pool has opened `size` connections
+                "overflow": pool.overflow() if isinstance(pool, QueuePool) else None,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "opened": self.opened,
+                "closed": self.closed,
+                "invalidated": self.invalidated,
+                "wait_count": self.wait_count,
+                "wait_sum": self.wait_sum,
+                "wait_max": self.wait_max,
+                "wait_buckets": list(zip(WAIT_BUCKETS, self.wait_buckets)),
+            }
+
+    def render_prometheus(self):
+        """The snapshot in the Prometheus text exposition format, labelled with this process's pid."""
+        snap = self.snapshot()
+        label = f'pid="{os.getpid()}"'
+        lines = []
+
+        def metric(name, kind, help_text, value, labels=label):
+            if value is None:
+                return
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name}{{{labels}}} {value}")
+
+        metric("db_pool_size", "gauge", "Connections the pool keeps open.", snap["size"])
+        metric("db_pool_max_overflow", "gauge", "Connections allowed beyond the pool size.", snap["max_overflow"])
+        metric("db_pool_checked_out", "gauge", "Connections currently in use.", snap["checked_out"])
+        metric("db_pool_idle", "gauge", "Open connections waiting in the pool.", snap["idle"])
+        metric("db_pool_overflow", "gauge", "Connections open beyond the pool size.", snap["overflow"])
+        metric("db_pool_checkouts_total", "counter", "Connections handed out.", snap["checkouts"])
+        metric("db_pool_checkout_timeouts_total", "counter", "Checkouts that gave up waiting.", snap["timeouts"])
+        metric("db_pool_connections_opened_total", "counter", "New database connections.", snap["opened"])
+        metric("db_pool_connections_closed_total", "counter", "Database connections closed.", snap["closed"])
+        metric("db_pool_connections_invalidated_total", "counter", "Connections discarded as broken or stale.",
+               snap["invalidated"])
+
+        name = "db_pool_checkout_wait_seconds"
+        lines.append(f"# HELP {name} Time to get a connection from the pool, including opening one.")
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in snap["wait_buckets"]:
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label},le="+Inf"}} {snap["wait_count"]}')
+        lines.append(f"{name}_sum{{{label}}} {snap['wait_sum']}")
+        lines.append(f"{name}_count{{{label}}} {snap['wait_count']}")
+        metric("db_pool_checkout_wait_max_seconds", "gauge", "Longest checkout wait since start.", snap["wait_max"])
+        return "\n".join(lines) + "\n"
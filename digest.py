@@ -0,0 +1,204 @@
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import and_, exists, func, not_, or_, select
+from models import db, Category, Content, DigestRun, Post, Student, Subscription, UserPreference
+from mailer import BatchTemplate
+
+logger = logging.getLogger(__name__)
+
+FREQUENCIES = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(days=7),
+}
+DIGEST_PREFERENCE = "digest"  # UserPreference type; value "daily", "weekly" or "off"
+DEFAULT_FREQUENCY = "weekly"  # For students who never chose
+ITEMS_PER_CATEGORY = 10
+DIGEST_CHUNK_SIZE = 1000
+MAX_CACHED_TEMPLATES = 1024  # Distinct subscription sets kept rendered at once
+
+
+def category_sections(since, until, limit=ITEMS_PER_CATEGORY):
+    """
+    Render the digest section of every category with new posts or newly
+    approved content in [since, until): {category_id: (item count, text)}.
+
+    Two queries in total, each keeping the newest `limit` items per category
+    with a window function, however many students end up receiving them.
+    """
+    items = {}
+    post_rank = func.row_number().over(partition_by=Post.category_id, order_by=Post.created_at.desc())
+    posts = (
+        select(Post.category_id, Post.title, post_rank.label("rank"))
+        .where(Post.created_at >= since, Post.created_at < until, Post.is_flagged.isnot(True))
+        .subquery()
+    )
+    content_rank = func.row_number().over(partition_by=Content.category_id, order_by=Content.approved_at.desc())
+    contents = (
+        select(Content.category_id, Content.title, Content.content_type, content_rank.label("rank"))
+        .where(Content.status == "approved", Content.approved_at >= since, Content.approved_at < until)
+        .subquery()
+    )
+    for row in db.session.execute(select(posts.c.category_id, posts.c.title).where(posts.c.rank <= limit)):
+        items.setdefault(row.category_id, []).append(f"  - {row.title}")
+    for row in db.session.execute(
+        select(contents.c.category_id, contents.c.title, contents.c.content_type).where(contents.c.rank <= limit)
+    ):
+        items.setdefault(row.category_id, []).append(f"  - {row.title} ({row.content_type})")
+    if not items:
+        return {}
+
+    names = dict(db.session.query(Category.id, Category.name).filter(Category.id.in_(items)))
+    return {
+        category_id: (len(lines), f"{names.get(category_id, 'Other')}\n" + "\n".join(lines))
+        for category_id, lines in items.items()
+    }
+
+
+def _wants_frequency(frequency):
+    """SQL condition: the student's digest preference selects `frequency` (or defaults to it)."""
+    chosen = exists().where(
+        UserPreference.student_id == Student.id,
+        UserPreference.preference_type == DIGEST_PREFERENCE,
+    )
+    picked = exists().where(
+        UserPreference.student_id == Student.id,
+        UserPreference.preference_type == DIGEST_PREFERENCE,
+        UserPreference.preference_value == frequency,
+    )
+    return or_(picked, not_(chosen)) if frequency == DEFAULT_FREQUENCY else picked
+
+
+def iter_recipient_chunks(category_ids, frequency, after_id=0, chunk_size=DIGEST_CHUNK_SIZE):
+    """
+    Yield lists of (student_id, email, username, category ids) for active
+    students subscribed to any of category_ids, in id order, chunk_size at
+    a time. Each chunk costs two queries (a keyset page of students and their
+    subscriptions) and nothing is held between chunks.
+    """
+    category_ids = list(category_ids)
+    subscribed = exists().where(
+        Subscription.student_id == Student.id, Subscription.category_id.in_(category_ids)
+    )
+    while True:
+        students = db.session.execute(
+            select(Student.id, Student.email, Student.username)
+            .where(Student.id > after_id, Student.is_active.isnot(False), subscribed, _wants_frequency(frequency))
+            .order_by(Student.id)
+            .limit(chunk_size)
+        ).all()
+        if not students:
+            return
+        subscriptions = {}
+        for student_id, category_id in db.session.execute(
+            select(Subscription.student_id, Subscription.category_id).where(
+                and_(Subscription.student_id.in_([s.id for s in students]),
+                     Subscription.category_id.in_(category_ids))
+            )
+        ):
+            subscriptions.setdefault(student_id, set()).add(category_id)
+        yield [(s.id, s.email, s.username, tuple(sorted(subscriptions.get(s.id, ())))) for s in students]
+        after_id = students[-1].id
+
+
+class DigestComposer:
+    """
+    Builds one BatchTemplate per distinct set of subscribed categories from
+    the shared sections, so students with the same subscriptions share the
+    rendered text and only $username is filled in per message. The sections
+    hold user-written titles, so they go in as BatchTemplate context (which
+    escapes them), never as template text.
+    """
+
+    def __init__(self, sections, frequency):
+        self.sections = sections
+        self.frequency = frequency
+        self._templates = {}
+
+    def template(self, category_ids):
+        template = self._templates.get(category_ids)
+        if template is None:
+            if len(self._templates) >= MAX_CACHED_TEMPLATES:
+                self._templates.clear()
+            picked = [self.sections[c] for c in category_ids if c in self.sections]
+            count = sum(n for n, _ in picked)
+            subject = f"Your {self.frequency} digest: {count} new item{'s' if count != 1 else ''}"
+            body = "Hi $username,\n\nHere is what is new in the categories you follow:\n\n$sections"
+            template = self._templates[category_ids] = BatchTemplate(
+                subject, body, {"sections": "\n\n".join(text for _, text in picked)}
+            )
+        return template
+
+
+def start_run(frequency, now=None):
+    """Resume the unfinished run for `frequency`, or start one covering the time since the last finished run."""
+    now = now or datetime.utcnow()
+    run = (
+        DigestRun.query.filter_by(frequency=frequency, finished_at=None)
+        .order_by(DigestRun.id.desc())
+        .first()
+    )
+    if run is not None:
+        return run
+    last_end = (
+        db.session.query(func.max(DigestRun.period_end))
+        .filter(DigestRun.frequency == frequency, DigestRun.finished_at.isnot(None))
+        .scalar()
+    )
+    return DigestRun(frequency=frequency, period_start=last_end or now - FREQUENCIES[frequency],
+                     period_end=now, last_student_id=0, sent=0, failed=0)
+
+
+def send_digests(mailer, frequency=DEFAULT_FREQUENCY, now=None, chunk_size=DIGEST_CHUNK_SIZE,
+                 dry_run=False, progress=None):
+    """
+    Email every subscriber of a category with news since the last run one
+    consolidated digest through `mailer` (anything with send(to, subject, body),
+    normally a BatchMailer). Progress is committed after each chunk, so an
+    interrupted run resumes after the last student it reached. With dry_run
+    nothing is sent or written. `progress(run)` is called after every chunk.
+    Returns the DigestRun.
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown digest frequency: {frequency}")
+    # Only this process writes the run, so the per-chunk commits need not reload it
+    session = db.session()
+    expire_on_commit, session.expire_on_commit = session.expire_on_commit, False
+    try:
+        run = start_run(frequency, now)
+        if dry_run:
+            if run in session:
+                session.expunge(run)  # Resumed run: count on a detached copy, write nothing back
+        else:
+            session.add(run)
+            session.commit()
+        _send(run, mailer, frequency, chunk_size, dry_run, progress)
+    finally:
+        session.expire_on_commit = expire_on_commit
+    return run
+
+
+def _send(run, mailer, frequency, chunk_size, dry_run, progress):
+
+    sections = category_sections(run.period_start, run.period_end)
+    composer = DigestComposer(sections, frequency)
+    for chunk in iter_recipient_chunks(sections, frequency, run.last_student_id, chunk_size):
+        for student_id, email, username, category_ids in chunk:
+            if dry_run:
+                run.sent += 1
+                continue
+            subject, body = composer.template(category_ids).render({"username": username})
+            if mailer.send(email, subject, body):
+                run.sent += 1
+            else:
+                run.failed += 1
+        run.last_student_id = chunk[-1][0]
+        if not dry_run:
+            db.session.commit()
+        if progress:
+            progress(run)
+
+    run.finished_at = datetime.utcnow()
+    if not dry_run:
+        db.session.commit()
+    logger.info(f"{frequency} digest for {run.period_start:%Y-%m-%d %H:%M}..{run.period_end:%Y-%m-%d %H:%M}: "
+                f"{run.sent} sent, {run.failed} failed across {len(sections)} categories")
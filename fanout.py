@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime
+from sqlalchemy import exists, insert, literal, select, false
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db, Post, Content, Category, Notification, Subscription
+from jobs import job
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_LENGTH = Notification.__table__.c.message.type.length
+
+# INSERTs that can skip rows clashing with a unique key
+_INSERT_IGNORING_CONFLICTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _fan_out(category_id, message, post_id=None, content_id=None, exclude_student_id=None):
+    """
+    Insert one notification per subscriber of category_id in a single
+    INSERT ... SELECT, so the database copies the rows without any of them
+    passing through Python. Returns the number of notifications created.
+
+    Running it again is a no-op, since a job can run twice (e.g. when it
+    outlives its DatabaseJobQueue lease): subscribers who already have the
+    notification are skipped, and the unique (student_id, post_id) and
+    (student_id, content_id) keys settle two runs that overlap.
+    """
+    if post_id is not None:
+        same = Notification.post_id == post_id
+    else:
+        same = Notification.content_id == content_id
+    subscribers = select(
+        Subscription.student_id,
+        literal(category_id),
+        literal(post_id),
+        literal(content_id),
+        literal(message[:MESSAGE_LENGTH]),
+        false(),
+        literal(datetime.utcnow()),
+    ).where(
+        Subscription.category_id == category_id,
+        ~exists().where(Notification.student_id == Subscription.student_id, same),
+    )
+    if exclude_student_id is not None:
+        subscribers = subscribers.where(Subscription.student_id != exclude_student_id)
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in _INSERT_IGNORING_CONFLICTS:
+        stmt = _INSERT_IGNORING_CONFLICTS[dialect](Notification).on_conflict_do_nothing()
+    else:
+        stmt = insert(Notification)
+    stmt = stmt.from_select(
+        ["student_id", "category_id", "post_id", "content_id", "message", "is_read", "created_at"],
+        subscribers,
+    )
+    result = db.session.execute(stmt)
+    db.session.commit()
+    logger.info(f"Fanned out {result.rowcount} notifications for category {category_id}")
+    return result.rowcount
+
+
+@job
+def fan_out_post(post_id):
+    """Notify the subscribers of a new post's category (except its author)."""
+    row = (
+        db.session.query(Post.title, Post.category_id, Post.student_id, Category.name)
+        .join(Category, Post.category_id == Category.id)
+        .filter(Post.id == post_id)
+        .first()
+    )
+    if row is None:
+        return 0
+    return _fan_out(
+        row.category_id, f"New post in {row.name}: {row.title}",
+        post_id=post_id, exclude_student_id=row.student_id
+    )
+
+
+@job
+def fan_out_content(content_id):
+    """Notify the subscribers of an approved content item's category."""
+    row = (
+        db.session.query(Content.title, Content.category_id, Category.name)
+        .join(Category, Content.category_id == Category.id)
+        .filter(Content.id == content_id)
+        .first()
+    )
+    if row is None:
+        return 0
+    return _fan_out(row.category_id, f"New content in {row.name}: {row.title}", content_id=content_id)
+
@@ -0,0 +1,235 @@
+import heapq
+import math
+import threading
+import time
+from datetime import datetime
+from operator import itemgetter
+from flask import current_app
+from sqlalchemy import func, select
+from cache import MemoryCache
+from models import db, Category, Comment, Content, Post, Share, Subscription, UserPreference
+from serializers import Serializer
+
+SUBSCRIPTION_WEIGHT = 2.0  # Affinity for a category the student subscribed to
+PREFERENCE_WEIGHT = 1.0  # Affinity per matching preference (category or content type)
+BASE_AFFINITY = 0.5  # Lets popular items from the global pool compete with subscribed ones
+COMMENT_WEIGHT = 2  # Engagement points per comment; likes count 1
+SHARE_WEIGHT = 3
+GLOBAL_POOL = None  # Pool key for the newest items across all categories
+
+feed_item_serializer = Serializer(
+    ("type", "id", "title", "category_id", "content_type", "created_at", "likes", "comments", "shares"),
+    datetime_fields=("created_at",)
+)
+
+
+class FeedItem:
+    __slots__ = ("type", "id", "title", "category_id", "content_type", "created_at",
+                 "author_id", "likes", "comments", "shares")
+
+    def __init__(self, type, id, title, category_id, content_type=None, created_at=None,
+                 author_id=None, likes=0, comments=0, shares=0):
+        self.type = type
+        self.id = id
+        self.title = title
+        self.category_id = category_id
+        self.content_type = content_type
+        self.created_at = created_at
+        self.author_id = author_id
+        self.likes = likes or 0
+        self.comments = comments or 0
+        self.shares = shares or 0
+
+
+class FeedIndex:
+    """
+    Per-process candidate sets for the "For You" feed.
+
+    Every category has a pool of its newest pool_size posts and approved
+    content, loaded with their engagement counts in one query per kind and
+    shared by all students; a global pool covers everything else. A student's
+    candidates are the pools of the categories in their profile (built from
+    subscriptions and preferences) plus the global pool, so ranking touches a
+    few hundred rows however large the posts table is.
+
+    Write endpoints push new items into loaded pools and drop changed
+    profiles, so both stay current in this worker. Pools are reloaded after
+    pool_ttl seconds to pick up engagement and other workers' writes.
+    Profiles live in an LRU of max_profiles entries that expire after
+    profile_ttl seconds, so memory stays bounded however many students visit.
+    """
+
+    def __init__(self, pool_size=200, pool_ttl=60, profile_ttl=300, half_life_hours=24,
+                 max_profiles=10000, clock=time.monotonic):
+        self.pool_size = pool_size
+        self.pool_ttl = pool_ttl
+        self.profile_ttl = profile_ttl
+        self.half_life = half_life_hours * 3600
+        self.clock = clock
+        self._pools = {}  # category_id (or GLOBAL_POOL) -> (loaded_at, [FeedItem])
+        # student_id -> ({category_id: affinity}, {content_type: affinity})
+        self._profiles = MemoryCache(max_entries=max_profiles, default_ttl=profile_ttl, clock=clock)
+        self._lock = threading.Lock()
+
+    # -- Candidate pools -------------------------------------------------
+
+    def pool(self, category_id):
+        entry = self._pools.get(category_id)
+        if entry is None or self.clock() - entry[0] >= self.pool_ttl:
+            entry = (self.clock(), self._load_pool(category_id))
+            with self._lock:
+                self._pools[category_id] = entry
+        return entry[1]
+
+    def _load_pool(self, category_id):
+        comments = (
+            select(func.count()).where(Comment.post_id == Post.id).correlate(Post).scalar_subquery()
+        )
+        shares = (
+            select(func.count()).where(Share.post_id == Post.id).correlate(Post).scalar_subquery()
+        )
+        posts = (
+            select(Post.id, Post.title, Post.category_id, Post.created_at, Post.student_id,
+                   Post.likes, comments, shares)
+            .where(Post.is_flagged.isnot(True))
+            .order_by(Post.created_at.desc().nullslast(), Post.id.desc())
+            .limit(self.pool_size)
+        )
+        content = (
+            select(Content.id, Content.title, Content.category_id, Content.content_type, Content.likes)
+            .where(Content.status == "approved")
+            .order_by(Content.id.desc())
+            .limit(self.pool_size)
+        )
+        if category_id is not GLOBAL_POOL:
+            posts = posts.where(Post.category_id == category_id)
+            content = content.where(Content.category_id == category_id)
+
+        items = [
+            FeedItem("post", row[0], row[1], row[2], created_at=row[3], author_id=row[4],
+                     likes=row[5], comments=row[6], shares=row[7])
+            for row in db.session.execute(posts)
+        ]
+        items.extend(
+            FeedItem("content", row[0], row[1], row[2], content_type=row[3], likes=row[4])
+            for row in db.session.execute(content)
+        )
+        return items
+
+    def add_item(self, item):
+        """Put a new post or content item at the front of its loaded pools."""
+        with self._lock:
+            for key in (item.category_id, GLOBAL_POOL):
+                entry = self._pools.get(key)
+                if entry is not None:
+                    items = [existing for existing in entry[1]
+                             if (existing.type, existing.id) != (item.type, item.id)]
+                    self._pools[key] = (entry[0], [item] + items[:self.pool_size * 2 - 1])
+
+    def remove_item(self, kind, item_id):
+        with self._lock:
+            for key, (loaded_at, items) in list(self._pools.items()):
+                kept = [item for item in items if (item.type, item.id) != (kind, item_id)]
+                if len(kept) != len(items):
+                    self._pools[key] = (loaded_at, kept)
+
+    # -- Student profiles ------------------------------------------------
+
+    def profile(self, student_id):
+        profile = self._profiles.get(student_id)
+        if profile is None:
+            profile = self._load_profile(student_id)
+            self._profiles.set(student_id, profile)
+        return profile
+
+    def _load_profile(self, student_id):
+        categories = {}
+        content_types = {}
+        for (category_id,) in db.session.execute(
+            select(Subscription.category_id).where(Subscription.student_id == student_id)
+        ):
+            categories[category_id] = categories.get(category_id, 0) + SUBSCRIPTION_WEIGHT
+
+        preferences = db.session.execute(
+            select(UserPreference.preference_type, UserPreference.preference_value)
+            .where(UserPreference.student_id == student_id)
+        ).all()
+        category_values = [value for kind, value in preferences if kind == "category"]
+        if category_values:
+            # Category preferences may name a category or give its id
+            for (category_id,) in db.session.execute(
+                select(Category.id).where(
+                    Category.name.in_(category_values)
+                    | Category.id.in_([int(v) for v in category_values if v.isdigit()])
+                )
+            ):
+                categories[category_id] = categories.get(category_id, 0) + PREFERENCE_WEIGHT
+        for kind, value in preferences:
+            if kind == "content_type":
+                content_types[value] = content_types.get(value, 0) + PREFERENCE_WEIGHT
+        return categories, content_types
+
+    def invalidate_profile(self, student_id):
+        self._profiles.delete(student_id)
+
+    # -- Ranking ---------------------------------------------------------
+
+    def rank(self, student_id, limit=20, offset=0, now=None):
+        """Return [(score, FeedItem)] for one page of the student's feed, best first."""
+        categories, content_types = self.profile(student_id)
+        now = now or datetime.utcnow()
+        half_life = self.half_life
+
+        candidates = {}
+        for key in (*categories, GLOBAL_POOL):
+            for item in self.pool(key):
+                candidates[item.type, item.id] = item
+
+        scored = []
+        for item in candidates.values():
+            if item.author_id == student_id:
+                continue
+            affinity = BASE_AFFINITY + categories.get(item.category_id, 0)
+            if item.content_type is not None:
+                affinity += content_types.get(item.content_type, 0)
+            engagement = item.likes + COMMENT_WEIGHT * item.comments + SHARE_WEIGHT * item.shares
+            if item.created_at is not None:
+                age = max((now - item.created_at).total_seconds(), 0)
+                decay = 0.5 ** (age / half_life)
+            else:
+                decay = 0.5  # Content has no timestamp; score it as one half-life old
+            scored.append((affinity * (1 + math.log1p(max(engagement, 0))) * decay, item))
+
+        return heapq.nlargest(offset + limit, scored, key=itemgetter(0))[offset:]
+
+
+def get_feed_index():
+    return current_app.extensions.get("feed_index")
+
+
+def feed_add_post(post):
+    index = get_feed_index()
+    if index is not None:
+        index.add_item(FeedItem("post", post.id, post.title, post.category_id,
+                                created_at=post.created_at, author_id=post.student_id,
+                                likes=post.likes))
+
+
+def feed_add_content(content):
+    index = get_feed_index()
+    if index is not None:
+        index.add_item(FeedItem("content", content.id, content.title, content.category_id,
+                                content_type=content.content_type, likes=content.likes))
+
+
+def feed_remove(kind, item_id):
+    index = get_feed_index()
+    if index is not None:
+        index.remove_item(kind, item_id)
+
+
+def feed_profile_changed(student_id):
+    """Drop a student's cached profile after their subscriptions or preferences change."""
+    index = get_feed_index()
+    if index is not None and student_id is not None:
+        index.invalidate_profile(student_id)
@@ -0,0 +1,221 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from auth_providers import AuthProvider, AuthProviderUnavailable, InvalidIdToken
+
+logger = logging.getLogger(__name__)
+
+# Certificates Google signs Firebase ID tokens with, rotated every few hours
+GOOGLE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+DEFAULT_MAX_AGE = 3600  # Seconds to keep certs when the response has no max-age
+MIN_REFETCH_INTERVAL = 60  # Unknown kids trigger a refetch at most this often
+
+
+def fetch_google_certs(url=GOOGLE_CERTS_URL, timeout=10):
+    """Download the signing certificates: ({kid: PEM}, seconds they may be cached for)."""
+    import requests  # Only the key refresher needs it; keep it off the import path
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+    return response.json(), int(match.group(1)) if match else DEFAULT_MAX_AGE
+
+
+class PublicKeyCache:
+    """
+    Parsed signing keys by kid, refetched when Google's max-age runs out.
+
+    Certificates are parsed into key objects once per fetch instead of once
+    per verification. A kid we have not seen (keys rotated early) forces a
+    refetch, at most every MIN_REFETCH_INTERVAL seconds so a flood of forged
+    kids cannot turn into a flood of requests to Google. start() pre-warms
+    the cache and keeps it fresh from a background thread, so requests never
+    wait on the fetch.
+    """
+
+    def __init__(self, fetch=fetch_google_certs, clock=time.monotonic):
+        self.fetch = fetch
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._expires = float("-inf")  # Load on first use
+        self._fetched = float("-inf")
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self, kid):
+        if self._clock() >= self._expires:
+            self.refresh()
+        key = self._keys.get(kid)
+        if key is None and self._clock() - self._fetched >= MIN_REFETCH_INTERVAL:
+            self.refresh(force=True)
+            key = self._keys.get(kid)
+        return key
+
+    def refresh(self, force=False):
+        with self._lock:
+            if not force and self._clock() < self._expires:
+                return  # Another thread refreshed while we waited for the lock
+            certs, max_age = self.fetch()
+            self._keys = {
+                kid: x509.load_pem_x509_certificate(pem.encode()).public_key()
+                for kid, pem in certs.items()
+            }
+            self._fetched = self._clock()
+            self._expires = self._fetched + max_age
+
+    def seconds_until_expiry(self):
+        return self._expires - self._clock()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="firebase-keys", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        delay = 0  # Pre-warm straight away
+        while not self._stop.wait(delay):
+            try:
+                self.refresh(force=True)
+                # Refetch a little before expiry so lookups never find the cache stale
+                delay = max(MIN_REFETCH_INTERVAL, self.seconds_until_expiry() * 0.9)
+            except Exception as e:
+                logger.warning(f"Fetching Firebase signing keys failed: {e}")
+                delay = MIN_REFETCH_INTERVAL
+
+
+class FirebaseTokenVerifier(AuthProvider):
+    """
+    Verifies Firebase ID tokens locally and remembers the result.
+
+    A verified token's claims are cached under the SHA-256 of the token until
+    its exp, so the repeat verifications a client makes with the same token
+    (every /profile load) are a hash and a dict probe rather than an RSA
+    check. Only successes are cached. Like firebase_admin's verify_id_token
+    without check_revoked, revocation is not consulted, so caching up to exp
+    accepts exactly what verifying again would.
+    """
+
+    def __init__(self, project_id, keys=None, max_entries=10000, clock=time.time):
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.keys = keys or PublicKeyCache()
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._verified = OrderedDict()  # token hash -> (exp, claims), oldest first
+
+    def verify(self, token):
+        """Return the token's claims (with "uid" set, as firebase_admin does) or raise InvalidIdToken."""
+        if isinstance(token, str):
+            token = token.encode()
+        if not token:
+            raise InvalidIdToken("ID token must be a non-empty string")
+        digest = hashlib.sha256(token).digest()
+        now = self._clock()
+
+        entry = self._verified.get(digest)
+        if entry is not None:
+            if now < entry[0]:
+                return entry[1]
+            with self._lock:
+                self._verified.pop(digest, None)
+
+        claims = self._verify(token, now)
+        with self._lock:
+            self._verified[digest] = (claims["exp"], claims)
+            while len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+        return claims
+
+    verify_id_token = verify
+
+    def start(self):
+        self.keys.start()
+
+    def stop(self):
+        self.keys.stop()
+
+    def _verify(self, token, now):
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise InvalidIdToken(f"Malformed ID token: {e}")
+        if header.get("alg") != "RS256":
+            raise InvalidIdToken("ID token has an unexpected signing algorithm")
+        try:
+            key = self.keys.get(header.get("kid"))
+        except Exception as e:  # Google unreachable and no usable keys cached
+            raise AuthProviderUnavailable(f"Could not fetch Firebase signing keys: {e}")
+        if key is None:
+            raise InvalidIdToken("ID token is signed with an unknown key")
+
+        try:
+            claims = jwt.decode(
+                token, key, algorithms=["RS256"], audience=self.project_id, issuer=self.issuer,
+                options={"require": ["exp", "iat", "sub"]},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidIdToken(f"Invalid ID token: {e}")
+
+        subject = claims["sub"]
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise InvalidIdToken("ID token has an invalid subject")
+        if claims.get("auth_time", 0) > now:
+            raise InvalidIdToken("ID token has an authentication time in the future")
+        claims["uid"] = subject
+        return claims
+
+    def __len__(self):
+        return len(self._verified)
+
+
+class LocalKeySet:
+    """
+    A stand-in for Google's key set for tests and offline development: an
+    RSA key with a self-signed certificate, a fetch() for PublicKeyCache and
+    sign() to mint ID tokens it will accept.
+    """
+
+    def __init__(self, kid="local-test-key", max_age=DEFAULT_MAX_AGE):
+        self.kid = kid
+        self.max_age = max_age
+        self.fetches = 0
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+        now = datetime.utcnow()
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name).issuer_name(name)
+            .public_key(self._key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(days=1)).not_valid_after(now + timedelta(days=1))
+            .sign(self._key, hashes.SHA256())
+        )
+        self.pem = cert.public_bytes(serialization.Encoding.PEM).decode()
+
+    def fetch(self):
+        self.fetches += 1
+        return {self.kid: self.pem}, self.max_age
+
+    def sign(self, project_id, email, uid="local-user", ttl=3600, **claims):
+        now = int(time.time())
+        payload = {
+            "iss": f"https://securetoken.google.com/{project_id}", "aud": project_id,
+            "sub": uid, "email": email, "iat": now, "auth_time": now, "exp": now + ttl,
+            **claims,
+        }
+        return jwt.encode(payload, self._key, algorithm="RS256", headers={"kid": self.kid})
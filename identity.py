@@ -0,0 +1,101 @@
+from flask import current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import select
+from models import db, Admin, Student
+
+ROLES = {"student": Student, "admin": Admin}
+
+
+def _caller():
+    """(role, id) from either identity format we issue: a bare id (a student) or {"id": ..., "role": ...}."""
+    identity = get_jwt_identity()
+    if isinstance(identity, dict):
+        return identity.get("role", "student"), identity.get("id")
+    return "student", identity
+
+
+def get_student_id():
+    """The calling student's id from the token; None when the caller is an admin."""
+    role, user_id = _caller()
+    return user_id if role == "student" else None
+
+
+def get_admin_id():
+    """The calling admin's id from the token; None when the caller is a student."""
+    role, user_id = _caller()
+    return user_id if role == "admin" else None
+
+
+def is_admin():
+    """Whether the token was issued to an admin. Needs no database lookup."""
+    return _caller()[0] == "admin"
+
+
+class Principal:
+    """The authenticated caller: just the columns handlers read, not a session-bound model."""
+
+    __slots__ = ("id", "role", "email", "username", "profile_pic", "is_active")
+
+    def __init__(self, id, role, email, username, profile_pic, is_active):
+        self.id = id
+        self.role = role
+        self.email = email
+        self.username = username
+        self.profile_pic = profile_pic
+        self.is_active = is_active
+
+    @property
+    def is_admin(self):
+        return self.role == "admin"
+
+    @property
+    def is_student(self):
+        return self.role == "student"
+
+
+def load_principal(role, user_id):
+    """One SELECT of the Principal columns for a student or admin; None if there is no such user."""
+    model = ROLES.get(role)
+    if model is None or user_id is None:
+        return None
+    row = db.session.execute(
+        select(model.id, model.email, model.username, model.profile_pic, model.is_active)
+        .where(model.id == user_id)
+    ).first()
+    return Principal(row.id, role, row.email, row.username, row.profile_pic, row.is_active) if row else None
+
+
+def get_current_user():
+    """
+    The caller as a Principal (None if their account no longer exists).
+
+    Loaded at most once per request. When the app has a user cache
+    (CURRENT_USER_CACHE_TTL > 0) principals are also kept across requests
+    for that many seconds, so most authenticated requests need no lookup at
+    all; handlers that change a user's row call forget_user() so this
+    worker stops serving the old copy at once.
+    """
+    token = get_jwt()
+    loaded = g.get("current_user")
+    # Keyed by the decoded token, not just kept on g: g belongs to the app
+    # context, which several requests can share (e.g. under a test client)
+    if loaded is not None and loaded[0] is token:
+        return loaded[1]
+    role, user_id = _caller()
+    cache = current_app.extensions.get("user_cache")
+    key = f"{role}:{user_id}"
+    principal = cache.get(key) if cache is not None else None
+    if principal is None:
+        principal = load_principal(role, user_id)
+        if principal is not None and cache is not None:
+            cache.set(key, principal)
+    g.current_user = (token, principal)
+    return principal
+
+
+def forget_user(role, user_id):
+    """Drop a cached principal after the user's row changed or was deleted."""
+    cache = current_app.extensions.get("user_cache")
+    if cache is not None:
+        cache.delete(f"{role}:{user_id}")
+    g.pop("current_user", None)
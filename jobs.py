@@ -0,0 +1,261 @@
+import importlib
+import json
+import logging
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import update
+from models import db, Job
+
+logger = logging.getLogger(__name__)
+
+JOBS = {}  # name -> function, filled by @job
+
+
+def job_name(fn):
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def job(fn):
+    """Register fn so it can be enqueued; its arguments must be JSON-serializable."""
+    JOBS[job_name(fn)] = fn
+    return fn
+
+
+def resolve_job(name):
+    """Look up a registered job, importing its module first if this process has not yet."""
+    if name not in JOBS:
+        importlib.import_module(name.rsplit(".", 1)[0])
+    return JOBS[name]
+
+
+def backoff_delay(attempt, base=2.0, cap=600.0):
+    """Seconds to wait before retry number `attempt`: exponential, capped, with jitter."""
+    return min(cap, base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+def run_job(app, name, args):
+    with app.app_context():
+        try:
+            return resolve_job(name)(*args)
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+class MemoryJobQueue:
+    """
+    Runs jobs on a worker thread pool in this process.
+
+    A failed job is retried after an exponential backoff, up to max_attempts
+    runs, then kept in dead_letters for inspection. Queued jobs are lost if
+    the process exits; use DatabaseJobQueue where that matters.
+    """
+
+    def __init__(self, app, workers=2, max_attempts=3, backoff_base=2.0):
+        self.app = app
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.dead_letters = deque(maxlen=100)  # (name, args, error)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jobs")
+        self._timers = set()
+        self._lock = threading.Lock()
+
+    def enqueue(self, name, args, max_attempts=None):
+        return self._submit(name, args, 1, max_attempts or self.max_attempts)
+
+    def _submit(self, name, args, attempt, max_attempts):
+        return self._executor.submit(self._execute, name, args, attempt, max_attempts)
+
+    def _execute(self, name, args, attempt, max_attempts):
+        try:
+            return run_job(self.app, name, args)
+        except Exception as e:
+            if attempt >= max_attempts:
+                logger.error(f"Job {name}{tuple(args)} failed {attempt} times, giving up: {e}")
+                self.dead_letters.append((name, args, str(e)))
+                return None
+            delay = backoff_delay(attempt, self.backoff_base)
+            logger.warning(f"Job {name}{tuple(args)} failed (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+            self._schedule(delay, name, args, attempt + 1, max_attempts)
+
+    def _schedule(self, delay, *job_args):
+        def fire():
+            with self._lock:
+                self._timers.discard(timer)
+            try:
+                self._submit(*job_args)
+            except RuntimeError:  # Executor already shut down
+                pass
+
+        timer = threading.Timer(delay, fire)
+        timer.daemon = True
+        with self._lock:
+            self._timers.add(timer)
+        timer.start()
+
+    def stop(self, wait=True):
+        with self._lock:
+            for timer in self._timers:
+                timer.cancel()
+            self._timers.clear()
+        self._executor.shutdown(wait=wait)
+
+
+class DatabaseJobQueue:
+    """
+    Durable queue on the jobs table, worked by a pool of polling threads.
+
+    A worker claims a due job with a conditional UPDATE that also pushes its
+    run_at out by `lease` seconds, so two workers (or processes) never run it
+    at once and a job whose worker died becomes due again when the lease
+    expires. On Postgres the candidate row is read FOR UPDATE SKIP LOCKED so
+    workers do not even contend for it. Finished jobs are deleted; failures
+    are rescheduled with backoff until max_attempts, then marked "dead".
+    """
+
+    def __init__(self, app, workers=2, max_attempts=5, backoff_base=2.0, poll_interval=1.0, lease=300):
+        self.app = app
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def enqueue(self, name, args, max_attempts=None):
+        """
+        Insert a job row and commit the current session with it, so the job
+        is durable exactly when the caller's own changes are. Anything else
+        pending in the session is committed too: enqueue after the request's
+        own commit, as the views do.
+        """
+        now = datetime.utcnow()
+        row = Job(name=name, args=json.dumps(list(args)), status="queued", attempts=0,
+                  max_attempts=max_attempts or self.max_attempts, run_at=now, created_at=now)
+        db.session.add(row)
+        db.session.commit()
+        self._wake.set()
+        return row.id
+
+    def claim(self):
+        """Claim the next due job; returns (id, name, args, attempts, max_attempts) or None."""
+        now = datetime.utcnow()
+        candidate = (
+            db.session.query(Job.id)
+            .filter(Job.status.in_(("queued", "running")), Job.run_at <= now)
+            .order_by(Job.run_at, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if candidate is None:
+            db.session.commit()
+            return None
+
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == candidate.id, Job.status.in_(("queued", "running")), Job.run_at <= now)
+            .values(status="running", attempts=Job.attempts + 1,
+                    run_at=now + timedelta(seconds=self.lease), updated_at=now)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return None  # Another worker got there first
+        row = db.session.get(Job, candidate.id)
+        return row.id, row.name, json.loads(row.args), row.attempts, row.max_attempts
+
+    def run_once(self):
+        """Claim and run one job; returns False when nothing was due."""
+        with self.app.app_context():
+            claimed = self.claim()
+        if claimed is None:
+            return False
+
+        job_id, name, args, attempts, max_attempts = claimed
+        try:
+            run_job(self.app, name, args)
+        except Exception as e:
+            self._failed(job_id, name, attempts, max_attempts, e)
+        else:
+            with self.app.app_context():
+                db.session.query(Job).filter(Job.id == job_id).delete()
+                db.session.commit()
+        return True
+
+    def _failed(self, job_id, name, attempts, max_attempts, error):
+        now = datetime.utcnow()
+        if attempts >= max_attempts:
+            logger.error(f"Job {job_id} ({name}) failed {attempts} times, dead-lettered: {error}")
+            values = {"status": "dead", "last_error": str(error), "updated_at": now}
+        else:
+            delay = backoff_delay(attempts, self.backoff_base)
+            logger.warning(f"Job {job_id} ({name}) failed (attempt {attempts}), retrying in {delay:.1f}s: {error}")
+            values = {"status": "queued", "last_error": str(error), "updated_at": now,
+                      "run_at": now + timedelta(seconds=delay)}
+        with self.app.app_context():
+            db.session.execute(update(Job).where(Job.id == job_id).values(**values))
+            db.session.commit()
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"jobs-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, wait=True):
+        self._stop.set()
+        self._wake.set()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception as e:
+                logger.error(f"Job worker error: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+
+def create_job_queue(app):
+    """Build the queue selected by JOB_BACKEND ("memory", "database" or "none" to run jobs inline)."""
+    backend = app.config.get("JOB_BACKEND", "memory")
+    workers = app.config.get("JOB_WORKERS", 2)
+    max_attempts = app.config.get("JOB_MAX_ATTEMPTS", 5)
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryJobQueue(app, workers=workers, max_attempts=max_attempts)
+    if backend == "database":
+        queue = DatabaseJobQueue(app, workers=workers, max_attempts=max_attempts,
+                                 poll_interval=app.config.get("JOB_POLL_SECONDS", 1.0))
+        queue.start()
+        return queue
+    raise ValueError(f"Unknown JOB_BACKEND: {backend}")
+
+
+def enqueue(fn, *args, max_attempts=None):
+    """
+    Run a registered job in the background and return immediately. Apps
+    without a job queue (e.g. tests) run it inline instead.
+
+    With the database queue this commits the current session (see
+    DatabaseJobQueue.enqueue). Jobs may run more than once, so they must be
+    idempotent.
+    """
+    name = job_name(fn)
+    if JOBS.get(name) is not fn:
+        raise ValueError(f"{name} is not a registered job")
+    queue = current_app.extensions.get("job_queue")
+    if queue is None:
+        return fn(*args)
+    return queue.enqueue(name, args, max_attempts)
@@ -0,0 +1,172 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from models import db, Comment, LeaderboardEntry, Post, PostReaction, Share, Student, Wishlist
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+LEADERBOARD_SIZE = 100  # Ranks materialized per board and window
+
+# Points per event in the window
+LIKE_POINTS = 1
+COMMENT_POINTS = 2
+SHARE_POINTS = 3
+WISHLIST_POINTS = 2
+POST_POINTS = 3  # Contributors: per post written
+
+# PostgreSQL advisory lock key that serializes refreshes across processes
+REFRESH_LOCK_KEY = 0x1EADB0A2D
+
+
+def _ranked(events, size, join_posts=False):
+    """Top `size` subjects of an events subquery (subject_id, points) by total points."""
+    score = func.sum(events.c.points).label("score")
+    query = select(events.c.subject_id, score)
+    if join_posts:  # Flagged posts never trend
+        query = query.join(Post, Post.id == events.c.subject_id).where(Post.is_flagged.isnot(True))
+    return (
+        query.group_by(events.c.subject_id)
+        .order_by(score.desc(), events.c.subject_id)
+        .limit(size)
+    )
+
+
+def _trending(since, size):
+    events = union_all(
+        select(PostReaction.post_id.label("subject_id"), literal(LIKE_POINTS).label("points"))
+        .where(PostReaction.reaction == "like", PostReaction.created_at >= since),
+        select(Comment.post_id, literal(COMMENT_POINTS)).where(Comment.created_at >= since),
+        select(Share.post_id, literal(SHARE_POINTS)).where(Share.created_at >= since),
+        select(Wishlist.post_id, literal(WISHLIST_POINTS)).where(Wishlist.created_at >= since),
+    ).subquery()
+    return _ranked(events, size, join_posts=True)
+
+
+def _contributors(since, size):
+    events = union_all(
+        select(Post.student_id.label("subject_id"), literal(POST_POINTS).label("points"))
+        .where(Post.created_at >= since, Post.student_id.isnot(None)),
+        select(Comment.student_id, literal(1)).where(Comment.created_at >= since),
+        # Likes received on the contributor's posts
+        select(Post.student_id, literal(LIKE_POINTS))
+        .join(PostReaction, PostReaction.post_id == Post.id)
+        .where(PostReaction.reaction == "like", PostReaction.created_at >= since,
+               Post.student_id.isnot(None)),
+    ).subquery()
+    return _ranked(events, size)
+
+
+def _most_shared(since, size):
+    events = (
+        select(Share.post_id.label("subject_id"), literal(1).label("points"))
+        .where(Share.created_at >= since)
+        .subquery()
+    )
+    return _ranked(events, size, join_posts=True)
+
+
+BOARDS = {
+    "trending": _trending,
+    "contributors": _contributors,
+    "most-shared": _most_shared,
+}
+
+
+def refresh_leaderboards(now=None, size=LEADERBOARD_SIZE):
+    """
+    Recompute every board for every window and swap the results in with one
+    commit. Each aggregation only reads the window's rows through the
+    created_at indexes, never the whole history. Returns the rows written.
+
+    On PostgreSQL a transaction-scoped advisory lock makes concurrent
+    refreshes (cron overlapping a refresher thread) take turns instead of
+    colliding on the (board, period, rank) key.
+    """
+    now = now or datetime.utcnow()
+    written = 0
+    try:
+        if db.session.get_bind().dialect.name == "postgresql":
+            db.session.execute(select(func.pg_advisory_xact_lock(REFRESH_LOCK_KEY)))
+        for board, ranked in BOARDS.items():
+            for period, length in WINDOWS.items():
+                rows = db.session.execute(ranked(now - length, size)).all()
+                db.session.execute(
+                    delete(LeaderboardEntry)
+                    .where(LeaderboardEntry.board == board, LeaderboardEntry.period == period)
+                )
+                if rows:
+                    db.session.execute(insert(LeaderboardEntry), [
+                        {"board": board, "period": period, "rank": rank, "subject_id": subject_id,
+                         "score": score, "refreshed_at": now}
+                        for rank, (subject_id, score) in enumerate(rows, start=1)
+                    ])
+                written += len(rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return written
+
+
+def get_leaderboard(board, period, limit=10):
+    """Read the top `limit` ranks of a materialized board: one query over at most `limit` rows."""
+    if board == "contributors":
+        subject = (Student.username,)
+        join = (Student, Student.id == LeaderboardEntry.subject_id)
+    else:
+        subject = (Post.title, Post.category_id, Post.student_id)
+        join = (Post, Post.id == LeaderboardEntry.subject_id)
+
+    return db.session.execute(
+        select(LeaderboardEntry.rank, LeaderboardEntry.subject_id, LeaderboardEntry.score,
+               LeaderboardEntry.refreshed_at, *subject)
+        .join(*join)
+        .where(LeaderboardEntry.board == board, LeaderboardEntry.period == period)
+        .order_by(LeaderboardEntry.rank)
+        .limit(limit)
+    ).all()
+
+
+class LeaderboardRefresher:
+    """
+    Background thread that calls refresh_leaderboards every interval seconds.
+
+    Started only when LEADERBOARD_REFRESH_SECONDS > 0, which should be set
+    in one process (not every web worker); the default is to run
+    scripts/refresh_leaderboards.py from cron. Refreshes that do overlap
+    wait on each other's advisory lock rather than failing.
+    """
+
+    def __init__(self, app, interval=60):
+        self.app = app
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        with self.app.app_context():
+            try:
+                refresh_leaderboards()
+            except Exception as e:
+                logger.warning(f"Leaderboard refresh failed: {e}")
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="leaderboard-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        # Wait before the first refresh too, so commands that merely build the
+        # app (flask db upgrade, scripts) are not racing it for the database
+        while not self._stop.wait(self.interval):
+            self.refresh()
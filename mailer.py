@@ -0,0 +1,217 @@
+import logging
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from string import Template
+from flask import current_app, url_for
+from flask_mail import Message
+from itsdangerous import URLSafeTimedSerializer
+from config import Config
+from jobs import job, enqueue
+
+logger = logging.getLogger(__name__)
+
+serializer = URLSafeTimedSerializer(Config.SECRET_KEY)
+
+def generate_reset_token(email):
+    return serializer.dumps(email, salt="password-reset")
+
+@job
+def send_email(subject, recipients, body):
+    """Send one message through the app's Flask-Mail connection; runs as a background job."""
+    current_app.extensions["mail"].send(Message(subject, recipients=recipients, body=body))
+
+def send_reset_email(user):
+    token = generate_reset_token(user.email)
+    reset_link = url_for('reset_password', token=token, _external=True)
+
+    body = f"Click the link to reset your password: {reset_link}\n\nThis link will expire in 1 hour."
+    # SMTP can take seconds; queue it so the request returns straight away
+    enqueue(send_email, "Password Reset Request", [user.email], body)
+
+
+class BatchTemplate:
+    """
+    A subject/body pair rendered in two stages: the batch-wide context is
+    substituted once up front, leaving only the $placeholders that differ
+    per recipient (e.g. $username) for a cheap string.Template pass each.
+
+    Text that comes out of the first pass is parsed again by the second, so
+    the first pass re-escapes: context values go in with their $ doubled, and
+    the template's own $$ escapes are doubled so they survive as $$.
+    """
+
+    def __init__(self, subject, body, context=None):
+        context = {key: str(value).replace("$", "$$") for key, value in (context or {}).items()}
+        self.subject = Template(self._fill(subject, context))
+        self.body = Template(self._fill(body, context))
+
+    @staticmethod
+    def _fill(text, context):
+        return Template(text.replace("$$", "$$$$")).safe_substitute(context)
+
+    def render(self, recipient):
+        return self.subject.safe_substitute(recipient), self.body.safe_substitute(recipient)
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` acquisitions per second with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            self.sleep(wait)
+
+
+class BatchMailer:
+    """
+    Sends many messages over one authenticated SMTP connection.
+
+    Flask-Mail opens a new connection (TCP + STARTTLS + AUTH) per message,
+    which dominates the cost of mailing thousands of students. This keeps the
+    connection open across sends, recycles it every `max_per_connection`
+    messages (Gmail drops long sessions), reconnects once if the server hangs
+    up mid-batch, and throttles to `rate_per_second` when set. A refused
+    recipient is recorded in `failed` without aborting the batch.
+
+    Use as a context manager:
+
+        with BatchMailer.from_app(app) as mailer:
+            mailer.send_batch(BatchTemplate(subject, body, context), recipients)
+    """
+
+    def __init__(self, host, port, sender, username=None, password=None, use_tls=False, use_ssl=False,
+                 timeout=30, max_per_connection=100, rate_per_second=None, limiter=None):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.max_per_connection = max_per_connection
+        self.limiter = limiter or (RateLimiter(rate_per_second) if rate_per_second else None)
+        self.connections = 0  # Connections opened so far, for stats and tests
+        self.sent = 0
+        self.failed = []  # (email, error)
+        self._smtp = None
+        self._on_connection = 0
+
+    @classmethod
+    def from_app(cls, app, **overrides):
+        config = app.config
+        options = dict(
+            host=config.get("MAIL_SERVER", "localhost"),
+            port=config.get("MAIL_PORT", 25),
+            sender=config.get("MAIL_DEFAULT_SENDER"),
+            username=config.get("MAIL_USERNAME"),
+            password=config.get("MAIL_PASSWORD"),
+            use_tls=config.get("MAIL_USE_TLS", False),
+            use_ssl=config.get("MAIL_USE_SSL", False),
+            max_per_connection=config.get("MAIL_MAX_PER_CONNECTION", 100),
+            rate_per_second=config.get("MAIL_RATE_PER_SECOND") or None,
+        )
+        options.update(overrides)
+        return cls(**options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self):
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            smtp.starttls()
+        if self.username and self.password:
+            smtp.login(self.username, self.password)
+        self._smtp = smtp
+        self._on_connection = 0
+        self.connections += 1
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                self._smtp.close()
+            except OSError:
+                pass
+            self._smtp = None
+
+    def _message(self, to, subject, body):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(body)
+        return message
+
+    def send(self, to, subject, body):
+        """Send one message on the shared connection; returns False if the recipient was refused."""
+        if self.limiter:
+            self.limiter.acquire()
+        if self._smtp is None or self._on_connection >= self.max_per_connection:
+            self.close()
+            self._connect()
+
+        message = self._message(to, subject, body)
+        try:
+            try:
+                self._smtp.send_message(message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # Idle timeout or server-side session limit; one retry on a fresh connection
+                self._smtp = None
+                self._connect()
+                self._smtp.send_message(message)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+            logger.warning(f"Mail to {to} refused: {e}")
+            self.failed.append((to, str(e)))
+            return False
+        finally:
+            self._on_connection += 1
+        self.sent += 1
+        return True
+
+    def send_batch(self, template, recipients):
+        """
+        Render and send `template` to each recipient, a dict with an "email"
+        key plus any per-recipient placeholders. Returns the number sent.
+        """
+        sent = 0
+        for recipient in recipients:
+            subject, body = template.render(recipient)
+            sent += self.send(recipient["email"], subject, body)
+        return sent
+
+
+@job
+def send_batch(subject, body, recipients, context=None):
+    """
+    Send one templated email to many recipients over a single connection;
+    runs as a background job. Keep batches to a few hundred recipients so a
+    retry after a failure does not resend to a large audience.
+    """
+    template = BatchTemplate(subject, body, context)
+    with BatchMailer.from_app(current_app) as mailer:
+        sent = mailer.send_batch(template, recipients)
+    logger.info(f"Sent {sent}/{len(recipients)} emails over {mailer.connections} connection(s)")
+    return sent
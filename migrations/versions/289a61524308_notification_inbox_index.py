@@ -0,0 +1,28 @@
+"""Widen the unread notifications index for the paginated inbox
+
+Revision ID: 289a61524308
+Revises: cb5d968793ab
+Create Date: 2026-10-18 15:22:09.431876
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '289a61524308'
+down_revision = 'cb5d968793ab'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_student_id_is_read_created_at', ['student_id', 'is_read', 'created_at'], unique=False)
+        batch_op.drop_index('ix_notifications_student_id_is_read')
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_student_id_is_read', ['student_id', 'is_read'], unique=False)
+        batch_op.drop_index('ix_notifications_student_id_is_read_created_at')
@@ -0,0 +1,36 @@
+"""Add GIN full-text search indexes on posts and content (Postgres only)
+
+Revision ID: 29f2ed56eb93
+Revises: 289a61524308
+Create Date: 2026-10-18 16:48:35.110274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '29f2ed56eb93'
+down_revision = '289a61524308'
+branch_labels = None
+depends_on = None
+
+# Must match the expressions in search.PostgresSearchBackend for the planner to use them
+POST_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, ''))"
+CONTENT_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return  # The in-memory BM25 backend needs no schema support
+
+    op.create_index('ix_posts_search', 'posts', [sa.text(POST_DOCUMENT)], unique=False, postgresql_using='gin')
+    op.create_index('ix_content_search', 'content', [sa.text(CONTENT_DOCUMENT)], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_content_search', table_name='content')
+    op.drop_index('ix_posts_search', table_name='posts')
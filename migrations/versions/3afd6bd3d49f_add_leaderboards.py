@@ -0,0 +1,59 @@
+"""Add leaderboard_entries and created_at indexes for windowed activity
+
+Revision ID: 3afd6bd3d49f
+Revises: 29f2ed56eb93
+Create Date: 2026-10-18 18:05:12.403916
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3afd6bd3d49f'
+down_revision = '29f2ed56eb93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('leaderboard_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('board', sa.String(length=32), nullable=False),
+    sa.Column('period', sa.String(length=8), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('subject_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('board', 'period', 'rank', name='uq_leaderboard_rank')
+    )
+    with op.batch_alter_table('wishlist', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_wishlist_created_at', ['created_at'], unique=False)
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_created_at', ['created_at'], unique=False)
+
+    with op.batch_alter_table('shares', schema=None) as batch_op:
+        batch_op.create_index('ix_shares_created_at', ['created_at'], unique=False)
+
+    with op.batch_alter_table('post_reactions', schema=None) as batch_op:
+        batch_op.create_index('ix_post_reactions_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('post_reactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_reactions_created_at')
+
+    with op.batch_alter_table('shares', schema=None) as batch_op:
+        batch_op.drop_index('ix_shares_created_at')
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_created_at')
+
+    with op.batch_alter_table('wishlist', schema=None) as batch_op:
+        batch_op.drop_index('ix_wishlist_created_at')
+        batch_op.drop_column('created_at')
+
+    op.drop_table('leaderboard_entries')
@@ -0,0 +1,62 @@
+"""Add secondary indexes for hot foreign-key and filter columns
+
+Revision ID: 578bd328c918
+Revises: 00553acf8255
+Create Date: 2026-10-18 09:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '578bd328c918'
+down_revision = '00553acf8255'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # wishlist.student_id and subscriptions.student_id are already the leading
+    # column of uq_student_post / uq_student_category, so they need no extra index.
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_posts_category_id_created_at', ['category_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_posts_student_id_created_at', ['student_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_post_id_parent_id', ['post_id', 'parent_id'], unique=False)
+        batch_op.create_index('ix_comments_parent_id', ['parent_id'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_student_id_is_read', ['student_id', 'is_read'], unique=False)
+        batch_op.create_index('ix_notifications_student_id_created_at', ['student_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('shares', schema=None) as batch_op:
+        batch_op.create_index('ix_shares_shared_with', ['shared_with'], unique=False)
+        batch_op.create_index('ix_shares_post_id', ['post_id'], unique=False)
+
+    with op.batch_alter_table('subscriptions', schema=None) as batch_op:
+        batch_op.create_index('ix_subscriptions_category_id', ['category_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('subscriptions', schema=None) as batch_op:
+        batch_op.drop_index('ix_subscriptions_category_id')
+
+    with op.batch_alter_table('shares', schema=None) as batch_op:
+        batch_op.drop_index('ix_shares_post_id')
+        batch_op.drop_index('ix_shares_shared_with')
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_student_id_created_at')
+        batch_op.drop_index('ix_notifications_student_id_is_read')
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_parent_id')
+        batch_op.drop_index('ix_comments_post_id_parent_id')
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_student_id_created_at')
+        batch_op.drop_index('ix_posts_category_id_created_at')
+        batch_op.drop_index('ix_posts_created_at_id')
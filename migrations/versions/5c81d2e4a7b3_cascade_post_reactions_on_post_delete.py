@@ -0,0 +1,31 @@
+"""Delete post reactions with their post
+
+Revision ID: 5c81d2e4a7b3
+Revises: f3b9c2a71e04
+Create Date: 2026-10-18 21:12:40.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c81d2e4a7b3'
+down_revision = 'f3b9c2a71e04'
+branch_labels = None
+depends_on = None
+
+# Names the FK the way PostgreSQL did, so SQLite's batch copy (which reflects it unnamed) can find it
+naming_convention = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+
+def upgrade():
+    with op.batch_alter_table('post_reactions', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('post_reactions_post_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('post_reactions_post_id_fkey', 'posts', ['post_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    with op.batch_alter_table('post_reactions', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('post_reactions_post_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('post_reactions_post_id_fkey', 'posts', ['post_id'], ['id'])
@@ -0,0 +1,28 @@
+"""Add like/dislike counters to content
+
+Revision ID: 897be90033e5
+Revises: 578bd328c918
+Create Date: 2026-10-18 11:03:27.918355
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '897be90033e5'
+down_revision = '578bd328c918'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('likes', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('dislikes', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.drop_column('dislikes')
+        batch_op.drop_column('likes')
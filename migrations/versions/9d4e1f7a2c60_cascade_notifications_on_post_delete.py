@@ -0,0 +1,31 @@
+"""Delete a post's notifications with the post
+
+Revision ID: 9d4e1f7a2c60
+Revises: 5c81d2e4a7b3
+Create Date: 2026-10-18 21:48:05.112634
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4e1f7a2c60'
+down_revision = '5c81d2e4a7b3'
+branch_labels = None
+depends_on = None
+
+# Names the FK the way PostgreSQL did, so SQLite's batch copy (which reflects it unnamed) can find it
+naming_convention = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+
+def upgrade():
+    with op.batch_alter_table('notifications', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('notifications_post_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('notifications_post_id_fkey', 'posts', ['post_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('notifications_post_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('notifications_post_id_fkey', 'posts', ['post_id'], ['id'])
@@ -0,0 +1,33 @@
+"""One notification per student per post
+
+Revision ID: b7e3a91d5f28
+Revises: 9d4e1f7a2c60
+Create Date: 2026-10-18 22:20:47.905163
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3a91d5f28'
+down_revision = '9d4e1f7a2c60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Drop the duplicates re-run fan-out jobs left behind, keeping the first
+    op.execute(
+        "DELETE FROM notifications WHERE post_id IS NOT NULL AND id NOT IN ("
+        "SELECT MIN(id) FROM notifications WHERE post_id IS NOT NULL GROUP BY student_id, post_id)"
+    )
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('uq_notifications_student_id_post_id', ['student_id', 'post_id'], unique=True,
+                              postgresql_where=sa.text('post_id IS NOT NULL'),
+                              sqlite_where=sa.text('post_id IS NOT NULL'))
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('uq_notifications_student_id_post_id')
@@ -0,0 +1,39 @@
+"""Add post_reactions ledger
+
+Revision ID: cb5d968793ab
+Revises: 897be90033e5
+Create Date: 2026-10-18 13:40:52.617093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cb5d968793ab'
+down_revision = '897be90033e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('post_reactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('reaction', sa.String(length=10), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('student_id', 'post_id', name='uq_student_post_reaction')
+    )
+    with op.batch_alter_table('post_reactions', schema=None) as batch_op:
+        batch_op.create_index('ix_post_reactions_post_id', ['post_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('post_reactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_reactions_post_id')
+
+    op.drop_table('post_reactions')
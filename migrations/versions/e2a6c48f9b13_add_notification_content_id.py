@@ -0,0 +1,33 @@
+"""Link content notifications to their content item
+
+Revision ID: e2a6c48f9b13
+Revises: b7e3a91d5f28
+Create Date: 2026-10-18 23:05:31.627408
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6c48f9b13'
+down_revision = 'b7e3a91d5f28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('notifications_content_id_fkey', 'content', ['content_id'], ['id'],
+                                    ondelete='CASCADE')
+        batch_op.create_index('uq_notifications_student_id_content_id', ['student_id', 'content_id'], unique=True,
+                              postgresql_where=sa.text('content_id IS NOT NULL'),
+                              sqlite_where=sa.text('content_id IS NOT NULL'))
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('uq_notifications_student_id_content_id')
+        batch_op.drop_constraint('notifications_content_id_fkey', type_='foreignkey')
+        batch_op.drop_column('content_id')
@@ -0,0 +1,47 @@
+"""Add digest_runs and content.approved_at for email digests
+
+Revision ID: f3b9c2a71e04
+Revises: 831edce88784
+Create Date: 2026-10-18 20:03:51.617204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9c2a71e04'
+down_revision = '831edce88784'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('digest_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('frequency', sa.String(length=16), nullable=False),
+    sa.Column('period_start', sa.DateTime(), nullable=False),
+    sa.Column('period_end', sa.DateTime(), nullable=False),
+    sa.Column('last_student_id', sa.Integer(), nullable=False),
+    sa.Column('sent', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('digest_runs', schema=None) as batch_op:
+        batch_op.create_index('ix_digest_runs_frequency_period_end', ['frequency', 'period_end'], unique=False)
+
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('approved_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_content_approved_at', ['approved_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('content', schema=None) as batch_op:
+        batch_op.drop_index('ix_content_approved_at')
+        batch_op.drop_column('approved_at')
+
+    with op.batch_alter_table('digest_runs', schema=None) as batch_op:
+        batch_op.drop_index('ix_digest_runs_frequency_period_end')
+
+    op.drop_table('digest_runs')
@@ -65,6 +65,31 @@ class Post(db.Model):
     shares = db.relationship("Share", back_populates="post")
     wishlists_entries = db.relationship("Wishlist", back_populates="post")
 
+    # Match the GET /posts keyset feed: newest first, optionally narrowed by category or author
+    __table_args__ = (
+        db.Index("ix_posts_created_at_id", "created_at", "id"),
+        db.Index("ix_posts_category_id_created_at", "category_id", "created_at"),
+        db.Index("ix_posts_student_id_created_at", "student_id", "created_at"),
+    )
+
+class PostReaction(db.Model):
+    __tablename__ = "post_reactions"
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey("students.id"), nullable=False)
+    # Reactions go with their post when it is deleted
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.id", name="post_reactions_post_id_fkey", ondelete="CASCADE"),
+                        nullable=False)
+    reaction = db.Column(db.String(10), nullable=False)  # "like" or "dislike"
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # One reaction per student per post; the likes/dislikes on Post are its running totals
+    __table_args__ = (
+        UniqueConstraint("student_id", "post_id", name="uq_student_post_reaction"),
+        db.Index("ix_post_reactions_post_id", "post_id"),
+        db.Index("ix_post_reactions_created_at", "created_at"),
+    )
+
 class Comment(db.Model):
     __tablename__ = "comments"
 
@@ -79,6 +104,12 @@ class Comment(db.Model):
         "Comment", backref=db.backref("parent", remote_side=[id]), lazy=True, cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        db.Index("ix_comments_post_id_parent_id", "post_id", "parent_id"),
+        db.Index("ix_comments_parent_id", "parent_id"),
+        db.Index("ix_comments_created_at", "created_at"),
+    )
+
 class Category(db.Model):
     __tablename__ = "categories"
 
@@ -101,23 +132,46 @@ class Content(db.Model):
     # New fields for content type and external link
     content_type = db.Column(db.String(50), nullable=False, default="note")  # Default to 'note'
     content_link = db.Column(db.String(255), nullable=True)  # Make link optional
+    likes = db.Column(db.Integer, default=0)
+    dislikes = db.Column(db.Integer, default=0)
+    approved_at = db.Column(db.DateTime, nullable=True)  # Set when an admin approves it
 
     admin = db.relationship("Admin", back_populates="contents")
     category = db.relationship('Category', backref=db.backref('contents', lazy=True))
 
+    # Digests pick up content approved since the previous run
+    __table_args__ = (db.Index("ix_content_approved_at", "approved_at"),)
+
 class Notification(db.Model):
     __tablename__ = "notifications"
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey("students.id"), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey("categories.id"), nullable=True)
-    post_id = db.Column(db.Integer, db.ForeignKey("posts.id"), nullable=True)
+    # A post's notifications go with it when it is deleted
+    post_id = db.Column(db.Integer, db.ForeignKey("posts.id", name="notifications_post_id_fkey", ondelete="CASCADE"),
+                        nullable=True)
+    # Set on notifications about approved content; they go with it too
+    content_id = db.Column(db.Integer, db.ForeignKey("content.id", name="notifications_content_id_fkey",
+                                                     ondelete="CASCADE"), nullable=True)
     message = db.Column(db.String(255), nullable=False)
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     student = db.relationship("Student", backref=db.backref("notifications", lazy=True))
 
+    __table_args__ = (
+        # Serves the unread count on its own and the unread_only inbox in created_at order
+        db.Index("ix_notifications_student_id_is_read_created_at", "student_id", "is_read", "created_at"),
+        db.Index("ix_notifications_student_id_created_at", "student_id", "created_at"),
+        # One notification per subscriber per post or content item, however often its fan-out runs
+        db.Index("uq_notifications_student_id_post_id", "student_id", "post_id", unique=True,
+                 postgresql_where=db.text("post_id IS NOT NULL"), sqlite_where=db.text("post_id IS NOT NULL")),
+        db.Index("uq_notifications_student_id_content_id", "student_id", "content_id", unique=True,
+                 postgresql_where=db.text("content_id IS NOT NULL"),
+                 sqlite_where=db.text("content_id IS NOT NULL")),
+    )
+
 class Share(db.Model):
     __tablename__ = "shares"
 
@@ -151,6 +205,12 @@ class Share(db.Model):
 
     post = db.relationship("Post", back_populates="shares")
 
+    __table_args__ = (
+        db.Index("ix_shares_shared_with", "shared_with"),
+        db.Index("ix_shares_post_id", "post_id"),
+        db.Index("ix_shares_created_at", "created_at"),
+    )
+
 class UserPreference(db.Model):
     __tablename__ = "user_preferences"
 
@@ -170,7 +230,11 @@ class Subscription(db.Model):
     student_id = db.Column(db.Integer, db.ForeignKey("students.id"), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey("categories.id"), nullable=False)
 
-    __table_args__ = (UniqueConstraint("student_id", "category_id", name="uq_student_category"),)
+    # uq_student_category already serves student_id lookups; category_id needs its own index
+    __table_args__ = (
+        UniqueConstraint("student_id", "category_id", name="uq_student_category"),
+        db.Index("ix_subscriptions_category_id", "category_id"),
+    )
 
     student = db.relationship("Student", back_populates="subscriptions")
     category = db.relationship("Category", backref="subscriptions")
@@ -180,9 +244,12 @@ class Wishlist(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey("students.id"), nullable=False)
     post_id = db.Column(db.Integer, db.ForeignKey("posts.id"), nullable=False)
-    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    __table_args__ = (UniqueConstraint("student_id", "post_id", name="uq_student_post"),)
+    __table_args__ = (
+        UniqueConstraint("student_id", "post_id", name="uq_student_post"),
+        db.Index("ix_wishlist_created_at", "created_at"),
+    )
 
     student = db.relationship("Student", backref="wishlists_entries", overlaps="wishlist,wishlist_student")
     post = db.relationship("Post", back_populates="wishlists_entries")
@@ -195,6 +262,52 @@ class TokenBlocklist(db.Model):
     jti = db.Column(db.String(36), nullable=False, unique=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class LeaderboardEntry(db.Model):
+    __tablename__ = "leaderboard_entries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    board = db.Column(db.String(32), nullable=False)  # "trending", "contributors" or "most-shared"
+    period = db.Column(db.String(8), nullable=False)  # "1h", "24h" or "7d"
+    rank = db.Column(db.Integer, nullable=False)
+    subject_id = db.Column(db.Integer, nullable=False)  # Post id, or student id for contributors
+    score = db.Column(db.Integer, nullable=False)
+    refreshed_at = db.Column(db.DateTime, nullable=False)
+
+    # Materialized top-k per board and window; reads walk this index for the first k ranks
+    __table_args__ = (UniqueConstraint("board", "period", "rank", name="uq_leaderboard_rank"),)
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)  # Registered job, e.g. "fanout.fan_out_post"
+    args = db.Column(db.Text, nullable=False)  # JSON list
+    status = db.Column(db.String(16), nullable=False)  # "queued", "running" or "dead"
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False)
+    run_at = db.Column(db.DateTime, nullable=False)  # Next run, or lease expiry while running
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    # Workers look for the earliest due job among queued and expired running ones
+    __table_args__ = (db.Index("ix_jobs_status_run_at", "status", "run_at"),)
+
+class DigestRun(db.Model):
+    __tablename__ = "digest_runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    frequency = db.Column(db.String(16), nullable=False)  # "daily" or "weekly"
+    period_start = db.Column(db.DateTime, nullable=False)
+    period_end = db.Column(db.DateTime, nullable=False)
+    last_student_id = db.Column(db.Integer, nullable=False, default=0)  # Checkpoint for resuming
+    sent = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    # The next run starts where the latest one for its frequency ended
+    __table_args__ = (db.Index("ix_digest_runs_frequency_period_end", "frequency", "period_end"),)
+
 # Reset Token Methods (Moved Outside Class)
 def get_reset_token(user, secret_key, expires_sec=1800):
     s = Serializer(secret_key, expires_sec)
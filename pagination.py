@@ -0,0 +1,129 @@
+import base64
+import binascii
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Turn a ?limit= query value into a page size clamped to [1, maximum]."""
+    if value in (None, ""):
+        return default
+    limit = int(value)  # Raises ValueError on junk, callers turn it into a 400
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, maximum)
+
+
+def parse_bool(value):
+    """Parse a ?flag= query value, returning None when it was not supplied."""
+    if value in (None, ""):
+        return None
+    lowered = value.lower()
+    if lowered in ("1", "true", "yes"):
+        return True
+    if lowered in ("0", "false", "no"):
+        return False
+    raise ValueError(f"Invalid boolean value: {value}")
+
+
+def parse_int(value, name):
+    """Parse an integer query value such as ?category_id=, returning None when it was not supplied."""
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+
+
+def encode_cursor(created_at, row_id, group=None):
+    """
+    Opaque cursor for the (created_at, id) position of the last row on a page,
+    prefixed with its boolean group for pages ordered by one first.
+    """
+    raw = f"{created_at.isoformat() if created_at else ''}|{row_id}"
+    if group is not None:
+        raw = f"{int(group)}|{raw}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, grouped=False):
+    """
+    Inverse of encode_cursor: (created_at, id), or (group, created_at, id)
+    when grouped. Raises ValueError for tampered or malformed cursors.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        if grouped:
+            group, raw = raw.split("|", 1)
+            if group not in ("0", "1"):
+                raise ValueError(group)
+        created_at, row_id = raw.rsplit("|", 1)
+        position = (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+        return (group == "1", *position) if grouped else position
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _after(created_col, id_col, created_at, row_id, newest_first):
+    """Condition for the rows after (created_at, row_id) in keyset_page's order."""
+    if newest_first:
+        if created_at is None:
+            return and_(created_col.is_(None), id_col < row_id)
+        return or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_col < row_id),
+            created_col.is_(None),
+        )
+    if created_at is None:
+        return or_(
+            and_(created_col.is_(None), id_col > row_id),
+            created_col.isnot(None),
+        )
+    return or_(
+        created_col > created_at,
+        and_(created_col == created_at, id_col > row_id),
+    )
+
+
+def keyset_page(query, created_col, id_col, cursor=None, limit=DEFAULT_PAGE_SIZE, newest_first=True,
+                group_col=None):
+    """
+    Keyset page over (created_at, id), newest first unless newest_first=False.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page. One extra
+    row is fetched to know whether another page exists, so no COUNT(*) is needed.
+    Legacy rows without a timestamp sort after dated rows when newest first and
+    before them when oldest first.
+
+    With a non-null boolean group_col, rows where it is false come first (e.g.
+    unread before read) and the cursor records which group it stopped in.
+    """
+    if cursor:
+        if group_col is None:
+            query = query.filter(_after(created_col, id_col, *decode_cursor(cursor), newest_first))
+        else:
+            group, created_at, row_id = decode_cursor(cursor, grouped=True)
+            after = _after(created_col, id_col, created_at, row_id, newest_first)
+            query = query.filter(group_col.is_(True) & after if group
+                                 else or_(group_col.is_(False) & after, group_col.is_(True)))
+
+    if newest_first:
+        ordering = (created_col.desc().nullslast(), id_col.desc())
+    else:
+        ordering = (created_col.asc().nullsfirst(), id_col.asc())
+    if group_col is not None:
+        ordering = (group_col.asc(), *ordering)
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        group = getattr(last, group_col.key) if group_col is not None else None
+        next_cursor = encode_cursor(last.created_at, last.id, group)
+    return rows, next_cursor
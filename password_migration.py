@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import time
+from sqlalchemy import bindparam, func, not_, or_, select, update
+from models import db
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_CHUNK_SIZE = 1000
+# Placeholder stored for Google sign-ins. It must never be hashed, or
+# "google-auth" would become a working password for those accounts.
+PASSWORD_PLACEHOLDERS = ("google-auth",)
+
+
+def needs_hashing(column):
+    """SQL condition: the stored value is neither a hash we recognize nor a placeholder."""
+    return not_(or_(
+        column.like("pbkdf2:%"),
+        column.like("scrypt:%"),
+        column.like("$argon2%"),
+        column.in_(PASSWORD_PLACEHOLDERS),
+    ))
+
+
+class Checkpoint:
+    """Last id finished per table, kept in a JSON file so a rerun resumes after it."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.positions = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.positions = json.load(f)
+
+    def get(self, table):
+        return self.positions.get(table, 0)
+
+    def save(self, table, last_id):
+        self.positions[table] = last_id
+        if self.path:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.positions, f)
+            os.replace(tmp, self.path)  # Never leave a half-written checkpoint
+
+    def clear(self):
+        self.positions = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class MigrationProgress:
+    """Per-table totals and rate, passed to the progress callback after every chunk."""
+
+    def __init__(self, table, pending):
+        self.table = table
+        self.pending = pending  # Rows needing a hash when the table was started
+        self.done = 0
+        self.last_id = 0
+        self.started = time.perf_counter()
+
+    @property
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.done / elapsed if elapsed else 0.0
+
+    @property
+    def eta(self):
+        """Seconds left at the current rate, or None before the first chunk."""
+        return (self.pending - self.done) / self.rate if self.rate else None
+
+
+def hash_plaintext_passwords(model, pool, checkpoint=None, chunk_size=MIGRATION_CHUNK_SIZE,
+                             dry_run=False, progress=None):
+    """
+    Replace plain-text passwords in model's table with hashes, chunk by chunk.
+
+    Rows are read in id order with keyset pagination, hashed on `pool` (a
+    passwords.HashPool) and written back with one executemany UPDATE and a
+    commit per chunk, after which the checkpoint moves past the chunk. A
+    failure loses at most the chunk in flight, and rerunning resumes from
+    the checkpoint. Each UPDATE only matches rows whose password is still
+    the plain text that was read, so a password changed meanwhile is never
+    overwritten. With dry_run nothing is hashed or written; the return value
+    (and progress) count what would be. Returns the number of rows hashed.
+    """
+    table = model.__table__
+    checkpoint = checkpoint or Checkpoint()
+    last_id = checkpoint.get(table.name)
+    pending = db.session.execute(
+        select(func.count()).select_from(table).where(table.c.id > last_id, needs_hashing(table.c.password))
+    ).scalar()
+    state = MigrationProgress(table.name, pending)
+    state.last_id = last_id
+
+    write = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"), table.c.password == bindparam("plain"))
+        .values(password=bindparam("hashed"))
+    )
+    while True:
+        rows = db.session.execute(
+            select(table.c.id, table.c.password)
+            .where(table.c.id > last_id, needs_hashing(table.c.password))
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        if not dry_run:
+            hashes = pool.hash_many([row.password for row in rows])
+            db.session.execute(write, [
+                {"row_id": row.id, "plain": row.password, "hashed": hashed}
+                for row, hashed in zip(rows, hashes)
+            ])
+            db.session.commit()
+            checkpoint.save(table.name, last_id)
+        state.done += len(rows)
+        state.last_id = last_id
+        if progress:
+            progress(state)
+
+    logger.info(f"{'Would hash' if dry_run else 'Hashed'} {state.done} {table.name} passwords "
+                f"({state.rate:.0f}/s)")
+    return state.done
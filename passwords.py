@@ -0,0 +1,172 @@
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+from models import db
+
+try:
+    from argon2 import PasswordHasher as Argon2PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # argon2-cffi is optional
+    Argon2PasswordHasher = None
+
+logger = logging.getLogger(__name__)
+
+SCHEMES = ("pbkdf2", "scrypt", "argon2")
+
+
+class PasswordHasher:
+    """
+    Hashes and checks passwords with a configurable scheme and cost.
+
+    PBKDF2 and scrypt hashes use werkzeug's format ("pbkdf2:sha256:600000$salt$hash",
+    "scrypt:32768:8:1$salt$hash"), so every hash already stored keeps
+    verifying; argon2 ("$argon2id$...") needs argon2-cffi. needs_rehash()
+    tells whether a stored hash was made with other settings, so logins can
+    upgrade it while the plain password is at hand.
+
+    hashlib releases the GIL while it hashes, so other request threads keep
+    running; at most max_concurrent hashes run at once (default: one per
+    core) so a burst of logins queues here instead of starving every other
+    request of CPU.
+    """
+
+    def __init__(self, scheme="pbkdf2", pbkdf2_iterations=600000, scrypt_n=2 ** 15, scrypt_r=8, scrypt_p=1,
+                 argon2_time_cost=3, argon2_memory_kib=65536, argon2_parallelism=4, max_concurrent=None):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password hash scheme: {scheme}")
+        if scheme == "argon2" and Argon2PasswordHasher is None:
+            raise ValueError("The argon2 password scheme needs argon2-cffi installed")
+        self.scheme = scheme
+        # Enough to rebuild this hasher in another process (see HashPool)
+        self.settings = dict(scheme=scheme, pbkdf2_iterations=pbkdf2_iterations, scrypt_n=scrypt_n,
+                             scrypt_r=scrypt_r, scrypt_p=scrypt_p, argon2_time_cost=argon2_time_cost,
+                             argon2_memory_kib=argon2_memory_kib, argon2_parallelism=argon2_parallelism)
+        if scheme == "pbkdf2":
+            self.method = f"pbkdf2:sha256:{pbkdf2_iterations}"
+        elif scheme == "scrypt":
+            self.method = f"scrypt:{scrypt_n}:{scrypt_r}:{scrypt_p}"
+        else:
+            self.method = "argon2"
+        self._argon2 = None
+        if Argon2PasswordHasher is not None:
+            self._argon2 = Argon2PasswordHasher(time_cost=argon2_time_cost, memory_cost=argon2_memory_kib,
+                                                parallelism=argon2_parallelism)
+        self._slots = threading.BoundedSemaphore(max_concurrent or os.cpu_count() or 1)
+
+    def hash(self, password):
+        with self._slots:
+            if self.scheme == "argon2":
+                return self._argon2.hash(password)
+            return generate_password_hash(password, method=self.method)
+
+    def verify(self, stored, password):
+        if not stored or not password:
+            return False
+        with self._slots:
+            if stored.startswith("$argon2"):
+                if self._argon2 is None:
+                    logger.error("Found an argon2 password hash but argon2-cffi is not installed")
+                    return False
+                try:
+                    return self._argon2.verify(stored, password)
+                except (VerificationError, InvalidHashError):
+                    return False
+            return check_password_hash(stored, password)
+
+    def needs_rehash(self, stored):
+        """Whether `stored` was made with another scheme or cost than this hasher's."""
+        if stored.startswith("$argon2"):
+            return self.scheme != "argon2" or self._argon2.check_needs_rehash(stored)
+        return stored.split("$", 1)[0] != self.method
+
+
+_worker_hasher = None
+
+
+def _init_worker(settings):
+    global _worker_hasher
+    _worker_hasher = PasswordHasher(max_concurrent=1, **settings)
+
+
+def _hash_in_worker(password):
+    return _worker_hasher.hash(password)
+
+
+class HashPool:
+    """
+    Hashes many passwords in worker processes with a hasher's settings, for
+    bulk jobs (imports, migrations) where one core's worth of hashing would
+    be the bottleneck. Use as a context manager, or keep one open and share
+    it between threads. mp_context picks how workers start (e.g. a
+    "forkserver" context, for pools created inside threaded servers).
+    """
+
+    def __init__(self, hasher, workers=None, mp_context=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context,
+                                             initializer=_init_worker, initargs=(hasher.settings,))
+
+    def hash_many(self, passwords):
+        """Hashes in the same order as `passwords`."""
+        passwords = list(passwords)
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._executor.map(_hash_in_worker, passwords, chunksize=chunksize))
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def create_password_hasher(config):
+    return PasswordHasher(
+        scheme=config.get("PASSWORD_HASH_SCHEME", "pbkdf2"),
+        pbkdf2_iterations=config.get("PASSWORD_PBKDF2_ITERATIONS", 600000),
+        scrypt_n=config.get("PASSWORD_SCRYPT_N", 2 ** 15),
+        argon2_time_cost=config.get("PASSWORD_ARGON2_TIME_COST", 3),
+        argon2_memory_kib=config.get("PASSWORD_ARGON2_MEMORY_KIB", 65536),
+        max_concurrent=config.get("PASSWORD_HASH_CONCURRENCY") or None,
+    )
+
+
+_default_hasher = None
+
+
+def get_password_hasher():
+    """The app's hasher; apps (and scripts) that never configured one get the defaults."""
+    global _default_hasher
+    if has_app_context() and "password_hasher" in current_app.extensions:
+        return current_app.extensions["password_hasher"]
+    if _default_hasher is None:
+        _default_hasher = PasswordHasher()
+    return _default_hasher
+
+
+def hash_password(password):
+    return get_password_hasher().hash(password)
+
+
+def check_password(user, password):
+    """
+    Check a login attempt against user.password. On success with a hash
+    made under older settings, store a fresh hash (and commit), so cost
+    upgrades roll out as people log in.
+    """
+    hasher = get_password_hasher()
+    if not hasher.verify(user.password, password):
+        return False
+    if hasher.needs_rehash(user.password):
+        user.password = hasher.hash(password)
+        try:
+            db.session.commit()
+        except Exception as e:  # The login itself succeeded; the upgrade can wait for the next one
+            db.session.rollback()
+            logger.warning(f"Could not upgrade password hash for {user.email}: {e}")
+    return True
@@ -0,0 +1,84 @@
+"""
+Benchmark the digest pipeline: send rate and peak Python memory with a null mailer.
+
+Usage: python scripts/bench_digest.py [--students N] [--categories N] [--chunk-size N] [--database-url URL]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from models import db, Admin, Category, Post, Student, Subscription
+from digest import DIGEST_CHUNK_SIZE, send_digests
+
+
+class NullMailer:
+    """Renders nothing further and keeps nothing, so the numbers are the pipeline's own."""
+
+    def send(self, to, subject, body):
+        return True
+
+
+def seed(students, categories):
+    now = datetime.utcnow()
+    db.session.add(Admin(id=1, email="admin@example.com", username="admin", password="x"))
+    db.session.execute(Category.__table__.insert(), [
+        {"id": c, "name": f"Category {c}", "admin_id": 1} for c in range(1, categories + 1)
+    ])
+    db.session.execute(Post.__table__.insert(), [
+        {"title": f"Post {i}", "content": "Body", "category_id": 1 + i % categories,
+         "created_at": now - timedelta(hours=i % 150), "is_flagged": False}
+        for i in range(categories * 20)
+    ])
+    db.session.execute(Student.__table__.insert(), [
+        {"id": i, "email": f"s{i}@example.com", "username": f"s{i}", "password": "x", "is_active": True}
+        for i in range(1, students + 1)
+    ])
+    rng = random.Random(1)
+    db.session.execute(Subscription.__table__.insert(), [
+        {"student_id": i, "category_id": c}
+        for i in range(1, students + 1)
+        for c in rng.sample(range(1, categories + 1), 3)
+    ])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=DIGEST_CHUNK_SIZE)
+    parser.add_argument("--database-url", default="sqlite:///:memory:")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = args.database_url
+    db.init_app(app)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        print(f"Seeding {args.students} students across {args.categories} categories...")
+        seed(args.students, args.categories)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        run = send_digests(NullMailer(), "weekly", chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{run.sent} digests in {elapsed:.2f} s ({run.sent / elapsed:.0f}/s), "
+              f"peak traced memory {peak / 2**20:.1f} MiB")
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark subscriber fan-out: set-based INSERT ... SELECT vs. one ORM add per subscriber.
+
+Usage: python scripts/bench_fanout.py [--subscribers N] [--database-url URL] [--skip-orm]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from models import db, Admin, Category, Notification, Post, Student, Subscription
+from fanout import fan_out_post
+
+
+def seed(subscribers):
+    db.session.add(Admin(id=1, email="admin@example.com", username="admin", password="x"))
+    db.session.add(Category(id=1, name="Motivation", admin_id=1))
+    db.session.execute(Student.__table__.insert(), [
+        {"id": i, "email": f"s{i}@example.com", "username": f"s{i}", "password": "x", "is_active": True}
+        for i in range(1, subscribers + 1)
+    ])
+    db.session.execute(Subscription.__table__.insert(), [
+        {"student_id": i, "category_id": 1} for i in range(1, subscribers + 1)
+    ])
+    post = Post(title="Benchmark", content="Body", category_id=1)
+    db.session.add(post)
+    db.session.commit()
+    return post.id
+
+
+def orm_fan_out(post_id):
+    """The per-row approach the set-based insert replaces."""
+    post = db.session.get(Post, post_id)
+    for sub in Subscription.query.filter_by(category_id=post.category_id).all():
+        db.session.add(Notification(
+            student_id=sub.student_id, category_id=post.category_id, post_id=post.id,
+            message=f"New post: {post.title}", is_read=False, created_at=datetime.utcnow()
+        ))
+    db.session.commit()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=100_000)
+    parser.add_argument("--database-url", default="sqlite:///:memory:")
+    parser.add_argument("--skip-orm", action="store_true", help="Only time the set-based path")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = args.database_url
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        post_id = seed(args.subscribers)
+
+        set_based = timed(fan_out_post, post_id)
+        print(f"subscribers:        {args.subscribers}")
+        print(f"INSERT ... SELECT:  {set_based:8.2f} s ({args.subscribers / set_based:,.0f} notifications/s)")
+
+        if not args.skip_orm:
+            Notification.query.delete()
+            db.session.commit()
+            per_row = timed(orm_fan_out, post_id)
+            print(f"ORM add per row:    {per_row:8.2f} s ({args.subscribers / per_row:,.0f} notifications/s)")
+            print(f"speed-up:           {per_row / set_based:8.1f}x")
+
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
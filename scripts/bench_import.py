@@ -0,0 +1,95 @@
+"""
+Benchmark bulk student import against one POST /students per student.
+
+Usage: python scripts/bench_import.py [--students N] [--existing N] [--sample N] [--iterations N] [--workers N]
+
+Both paths run against a fresh SQLite file with --existing students in it.
+The per-request path (two uniqueness SELECTs, a hash, an INSERT and a commit
+per student) is timed on --sample students and extrapolated. Hashing uses
+--iterations PBKDF2 rounds so the database side is visible; at the
+production cost hashing dominates both paths and the import's advantage is
+spreading it over --workers processes.
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from models import db, Student
+from passwords import PasswordHasher
+from student_import import import_file
+
+
+def make_app(path, hasher):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    db.init_app(app)
+    app.extensions["password_hasher"] = hasher
+    return app
+
+
+def seed(existing):
+    db.create_all()
+    db.session.execute(Student.__table__.insert(), [
+        {"email": f"old{i}@example.com", "username": f"old{i}", "password": "x"} for i in range(existing)
+    ])
+    db.session.commit()
+
+
+def csv_upload(count):
+    lines = ["email,username,password"]
+    lines += [f"new{i}@example.com,new{i},password{i}" for i in range(count)]
+    return io.BytesIO(("\n".join(lines) + "\n").encode())
+
+
+def per_request(count, hasher):
+    """What POST /students does for each student."""
+    for i in range(count):
+        email, username = f"one{i}@example.com", f"one{i}"
+        if Student.query.filter_by(email=email).first() or Student.query.filter_by(username=username).first():
+            raise AssertionError("unexpected duplicate")
+        db.session.add(Student(email=email, username=username, password=hasher.hash(f"password{i}")))
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=50000, help="students in the upload")
+    parser.add_argument("--existing", type=int, default=20000, help="students already in the database")
+    parser.add_argument("--sample", type=int, default=500, help="students created one request at a time")
+    parser.add_argument("--iterations", type=int, default=1000, help="PBKDF2 rounds per hash")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="hashing processes")
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(pbkdf2_iterations=args.iterations)
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"), hasher)
+        with app.app_context():
+            seed(args.existing)
+
+            start = time.perf_counter()
+            per_request(args.sample, hasher)
+            one_by_one = (time.perf_counter() - start) / args.sample
+
+            upload = csv_upload(args.students)
+            start = time.perf_counter()
+            report = import_file(upload, "csv", hasher, args.workers)
+            bulk = time.perf_counter() - start
+
+    assert report.created == args.students, report.to_dict()
+    print(f"PBKDF2 {args.iterations} rounds, {args.workers} hashing process(es), "
+          f"{args.existing} existing students")
+    print(f"one request per student: {one_by_one * 1000:.2f} ms each, "
+          f"~{one_by_one * args.students:.0f} s for {args.students}")
+    print(f"bulk import:             {bulk / args.students * 1000:.3f} ms each, "
+          f"{bulk:.1f} s for {args.students} ({args.students / bulk:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
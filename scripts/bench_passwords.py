@@ -0,0 +1,66 @@
+"""
+Benchmark password checks: logins per second per core for each scheme and cost.
+
+Usage: python scripts/bench_passwords.py [--seconds S] [--threads N] [--pbkdf2 600000,300000] [--scrypt 32768,16384]
+
+A login is one verify() of the stored hash, the CPU-bound part of POST /login.
+The threaded run shows how far checks scale across cores: hashlib releases the
+GIL while it hashes, so N threads approach N cores' worth of logins.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from passwords import Argon2PasswordHasher, PasswordHasher
+
+
+def logins_per_second(hasher, seconds, threads=1):
+    stored = hasher.hash("correct horse battery staple")
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def worker(i):
+        while time.perf_counter() < deadline:
+            hasher.verify(stored, "correct horse battery staple")
+            counts[i] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time per measurement")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--pbkdf2", default="600000,300000,100000", help="iteration counts to try")
+    parser.add_argument("--scrypt", default="32768,16384", help="scrypt N values to try")
+    args = parser.parse_args()
+
+    cap = dict(max_concurrent=args.threads)
+    configs = [(f"pbkdf2 {n}", PasswordHasher("pbkdf2", pbkdf2_iterations=int(n), **cap))
+               for n in args.pbkdf2.split(",")]
+    configs += [(f"scrypt N={n}", PasswordHasher("scrypt", scrypt_n=int(n), **cap)) for n in args.scrypt.split(",")]
+    if Argon2PasswordHasher is not None:
+        configs.append(("argon2 t=3 m=64MiB", PasswordHasher("argon2", **cap)))
+    else:
+        print("argon2-cffi not installed; skipping argon2")
+
+    print(f"{'scheme':<20} {'logins/s/core':>14} {f'logins/s x{args.threads}':>16}")
+    for name, hasher in configs:
+        single = logins_per_second(hasher, args.seconds)
+        multi = logins_per_second(hasher, args.seconds, args.threads)
+        print(f"{name:<20} {single:14.1f} {multi:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
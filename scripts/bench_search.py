@@ -0,0 +1,61 @@
+"""
+Benchmark the in-memory BM25 search index on a synthetic corpus.
+
+Usage: python scripts/bench_search.py [--docs N] [--queries N]
+
+Documents draw words from a Zipf-like vocabulary so that common terms have
+long posting lists, as they would in real posts.
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from search import BM25Index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = [f"w{i}" for i in range(args.vocabulary)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(args.vocabulary)))
+
+    def text(length):
+        return " ".join(rng.choices(words, cum_weights=cum_weights, k=length))
+
+    index = BM25Index()
+    start = time.perf_counter()
+    for doc_id in range(args.docs):
+        index.add(("post", doc_id), text(6), text(40))
+    build = time.perf_counter() - start
+
+    # Two-word queries mixing a mid-frequency and a rarer term
+    queries = [f"{words[rng.randrange(50, 500)]} {words[rng.randrange(500, 5000)]}" for _ in range(args.queries)]
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=20)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    print(f"documents:    {args.docs:,}")
+    print(f"build:        {build:8.1f} s ({args.docs / build:,.0f} docs/s)")
+    print(f"query p50:    {statistics.median(timings):8.2f} ms")
+    print(f"query p95:    {timings[int(len(timings) * 0.95) - 1]:8.2f} ms")
+    print(f"query max:    {timings[-1]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
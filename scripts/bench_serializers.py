@@ -0,0 +1,100 @@
+"""
+Benchmark the compiled post serializer against hand-built dicts.
+
+Usage: python scripts/bench_serializers.py [--rows N] [--repeat N]
+
+Every case serializes rows that are already loaded, so the numbers cover
+dict building and JSON encoding only, not the query. The "rows" case uses a
+column projection instead of ORM instances, as the streaming list views do.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from models import db, Post
+from serializers import orjson, post_serializer
+
+
+def hand_built(posts):
+    # The dict comprehension the post views used before serializers.py
+    return [
+        {
+            "id": post.id,
+            "title": post.title,
+            "content": post.content,
+            "category_id": post.category_id,
+            "student_id": post.student_id,
+            "created_at": post.created_at.isoformat() if post.created_at else None
+        }
+        for post in posts
+    ]
+
+
+def best_of(repeat, fn):
+    timings = []
+    gc.disable()  # As timeit does; collections would otherwise land on random cases
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        start = datetime(2026, 1, 1)
+        db.session.bulk_insert_mappings(Post, [
+            {"id": i, "title": f"Post {i}", "content": "Keep going, you are doing great. " * 4,
+             "category_id": i % 10, "student_id": i % 500, "created_at": start + timedelta(seconds=i)}
+            for i in range(1, args.rows + 1)
+        ])
+        db.session.commit()
+        posts = Post.query.all()
+        rows = db.session.query(*post_serializer.columns()).all()
+
+        cases = [
+            ("dicts", lambda: hand_built(posts)),
+            ("serializer", lambda: post_serializer.many(posts)),
+            ("serializer (rows)", lambda: list(map(post_serializer.row_encoder(), rows))),
+            ("dicts + json", lambda: json.dumps(hand_built(posts))),
+            ("serializer + json", lambda: json.dumps(post_serializer.many(posts))),
+        ]
+        if orjson is not None:
+            cases.append(("serializer + orjson", lambda: orjson.dumps(post_serializer.many(posts))))
+            cases.append(("rows + orjson", lambda: orjson.dumps(list(map(post_serializer.row_encoder(), rows)))))
+
+        print(f"rows: {len(posts):,} (best of {args.repeat})")
+        baseline = None
+        for name, fn in cases:
+            ms = best_of(args.repeat, fn)
+            if name == "dicts + json":
+                baseline = ms
+            ratio = ""
+            if baseline and "json" in name and name != "dicts + json":
+                ratio = f"  {baseline / ms:4.1f}x vs dicts + json"
+            print(f"{name:20} {ms:8.2f} ms{ratio}")
+
+
+if __name__ == "__main__":
+    main()
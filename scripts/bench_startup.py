@@ -0,0 +1,72 @@
+"""
+Benchmark app startup: import time per module (python -X importtime) and create_app() wall time.
+
+Usage: python scripts/bench_startup.py [--runs N] [--top N] [--blueprints auth,post] [--statement CODE]
+
+Each run is a fresh interpreter, so nothing is warm except the OS file cache.
+Background threads (leaderboards, jobs) are disabled so they do not skew it.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+STARTUP = "import time; t = time.perf_counter(); import app; app.create_app(); print(time.perf_counter() - t)"
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run(statement, blueprints=None, importtime=False):
+    env = dict(
+        os.environ,
+        DATABASE_URL=os.environ.get("DATABASE_URL", "sqlite:///:memory:"),
+        LEADERBOARD_REFRESH_SECONDS="0",
+        JOB_BACKEND="none",
+    )
+    if blueprints:
+        env["BLUEPRINTS"] = blueprints
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", statement]
+    return subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time create_app in")
+    parser.add_argument("--top", type=int, default=15, help="slowest top-level imports to list")
+    parser.add_argument("--blueprints", help="BLUEPRINTS setting, e.g. auth,post (default: all)")
+    parser.add_argument("--statement", default=STARTUP, help="code to time instead of import + create_app")
+    args = parser.parse_args()
+
+    rows = parse_importtime(run(args.statement, args.blueprints, importtime=True).stderr)
+    total = sum(self_us for _, self_us, _, _ in rows)
+    top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+    print(f"{len(rows)} modules imported, {total / 1000:.0f} ms in total")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for module, self_us, cumulative_us, _ in top_level[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:8.1f}  {module}")
+    heavy = [m for m, *_ in rows if m.split(".")[0] in ("firebase_admin", "google", "grpc", "requests")]
+    print(f"Firebase/Google/requests modules loaded at startup: {len(heavy)}")
+
+    if args.statement == STARTUP:
+        timings = [float(run(STARTUP, args.blueprints).stdout.strip().splitlines()[-1]) for _ in range(args.runs)]
+        print(f"import app + create_app(): median {statistics.median(timings) * 1000:.0f} ms "
+              f"over {args.runs} runs (min {min(timings) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
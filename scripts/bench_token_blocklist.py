@@ -0,0 +1,66 @@
+"""
+Benchmark the JWT revocation check: one SELECT per request vs. the in-process cache.
+
+Usage: python scripts/bench_token_blocklist.py [--revoked N] [--lookups N] [--database-url URL]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import timedelta
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from models import db, TokenBlocklist
+from token_blocklist import TokenBlocklistCache
+
+
+def per_call_us(fn, lookups):
+    start = time.perf_counter()
+    for _ in range(lookups):
+        fn()
+    return (time.perf_counter() - start) / lookups * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--revoked", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--database-url", default="sqlite:///:memory:")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = args.database_url
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.bulk_insert_mappings(
+            TokenBlocklist, [{"jti": str(uuid.uuid4())} for _ in range(args.revoked)]
+        )
+        db.session.commit()
+
+        jti = str(uuid.uuid4())  # The common case: a token that was never revoked
+
+        def uncached():
+            return db.session.query(TokenBlocklist.id).filter_by(jti=jti).first() is not None
+
+        cache = TokenBlocklistCache(timedelta(hours=24), poll_interval=5)
+
+        def cached():
+            return cache.is_revoked(jti)
+
+        uncached_us = per_call_us(uncached, args.lookups)
+        cached_us = per_call_us(cached, args.lookups)
+
+        print(f"revoked rows:  {args.revoked}")
+        print(f"SELECT per request: {uncached_us:10.2f} us/check")
+        print(f"in-process cache:   {cached_us:10.2f} us/check")
+        print(f"saving:             {uncached_us - cached_us:10.2f} us/request ({uncached_us / cached_us:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Write every student (id, email, username, created_at) to CSV or NDJSON.
+
+Usage: python scripts/export_students.py [--format csv|ndjson] [-o FILE]
+
+Rows are read from a server-side cursor and written as they arrive, so
+memory stays flat however many students there are. Password hashes are
+never exported.
+"""
+import argparse
+import os
+import sys
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# A one-shot process: no refresher thread or job workers
+os.environ["LEADERBOARD_REFRESH_SECONDS"] = "0"
+os.environ["JOB_BACKEND"] = "none"
+
+from app import create_app
+from models import db, Student
+from serializers import student_serializer
+from streaming import iter_csv, iter_query
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    app = create_app()
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        with app.app_context():
+            students = iter_query(db.session.query(*student_serializer.columns()).order_by(Student.id))
+            encode = student_serializer.row_encoder()
+            if args.format == "csv":
+                for chunk in iter_csv(students, encode, student_serializer.fields):
+                    out.write(chunk)
+            else:
+                for row in students:
+                    out.write(app.json.dumps(encode(row)) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,66 @@
-from werkzeug.security import generate_password_hash
-import sys
+"""
+Hash any plain-text admin and student passwords still in the database.
+
+Usage: python scripts/hash_existing_passwords.py [--chunk-size N] [--workers N] [--checkpoint PATH] [--dry-run] [--restart]
+
+Rows are processed in id order, a chunk at a time: hashed across a process
+pool, written back with one batched UPDATE and committed. The last finished
+id per table is saved to the checkpoint file, so an interrupted run picks up
+where it stopped; --restart ignores it. Hashes use the app's configured
+scheme and cost (PASSWORD_HASH_SCHEME etc.).
+"""
+import argparse
 import os
+import sys
+import time
 
 # Add the project root directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from models import db, Admin, Student
-from werkzeug.security import generate_password_hash
+# A one-shot process: no refresher thread or job workers
+os.environ["LEADERBOARD_REFRESH_SECONDS"] = "0"
+os.environ["JOB_BACKEND"] = "none"
+
 from app import create_app
+from models import Admin, Student
+from passwords import HashPool
+from password_migration import MIGRATION_CHUNK_SIZE, Checkpoint, hash_plaintext_passwords
+
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".hash_passwords.checkpoint.json")
+
+
+def report(state):
+    eta = f", about {state.eta:.0f} s left" if state.eta is not None else ""
+    print(f"  {state.table}: {state.done}/{state.pending} up to id {state.last_id} "
+          f"({state.rate:.0f} rows/s{eta})", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=MIGRATION_CHUNK_SIZE, help="rows per batch and commit")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="hashing processes")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="file recording progress per table")
+    parser.add_argument("--dry-run", action="store_true", help="count plain-text passwords without changing them")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first row")
+    args = parser.parse_args()
+
+    app = create_app()
+    checkpoint = Checkpoint(None if args.dry_run else args.checkpoint)
+    if args.restart:
+        checkpoint.clear()
+
+    start = time.perf_counter()
+    total = 0
+    with app.app_context(), HashPool(app.extensions["password_hasher"], args.workers) as pool:
+        for model in (Admin, Student):
+            total += hash_plaintext_passwords(model, pool, checkpoint, args.chunk_size,
+                                              dry_run=args.dry_run, progress=report)
+    if not args.dry_run:
+        checkpoint.clear()  # Finished; the next run should look at every row again
+
+    verb = "Would hash" if args.dry_run else "Hashed"
+    print(f"{verb} {total} plain-text passwords in {time.perf_counter() - start:.1f} s")
+
 
-app = create_app()
-
-with app.app_context():
-    # Hash passwords for all admins if not already hashed
-    admins = Admin.query.all()
-    for admin in admins:
-        if not admin.password.startswith("pbkdf2:sha256:"):
-            print(f"Hashing password for admin: {admin.email}")
-            admin.password = generate_password_hash(admin.password)
-    
-    # Hash passwords for all students if needed
-    students = Student.query.all()
-    for student in students:
-        if not student.password.startswith("pbkdf2:sha256:"):
-            print(f"Hashing password for student: {student.email}")
-            student.password = generate_password_hash(student.password)
-
-    db.session.commit()
-    print("All plain-text passwords have been hashed successfully!")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Create students in bulk from a CSV or NDJSON file.
+
+Usage: python scripts/import_students.py FILE [--format csv|ndjson] [--batch-size N] [--workers N] [--dry-run] [--errors PATH]
+
+CSV needs a header with email, username and password columns; NDJSON one
+object per line with those keys. Other columns are ignored. Rows whose
+email or username is already taken (or repeated in the file) are rejected
+and reported by row number; the rest are created. Passwords are hashed
+with the app's configured scheme across a process pool.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# A one-shot process: no refresher thread or job workers
+os.environ["LEADERBOARD_REFRESH_SECONDS"] = "0"
+os.environ["JOB_BACKEND"] = "none"
+
+from app import create_app
+from student_import import IMPORT_BATCH_SIZE, IMPORT_FORMATS, detect_format, import_file
+
+SHOWN_ERRORS = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("file", help="CSV or NDJSON file to import")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows per INSERT and commit")
+    parser.add_argument("--workers", type=int, help="hashing processes (default: STUDENT_IMPORT_WORKERS)")
+    parser.add_argument("--dry-run", action="store_true", help="check the rows without creating anyone")
+    parser.add_argument("--errors", help="write every rejected row to this JSON file")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.format, args.file)
+    if fmt is None:
+        parser.error("can't tell the format from the file name; pass --format")
+
+    app = create_app()
+    workers = args.workers or app.config["STUDENT_IMPORT_WORKERS"] or None
+    start = time.perf_counter()
+    with app.app_context(), open(args.file, "rb") as stream:
+        report = import_file(stream, fmt, app.extensions["password_hasher"], workers,
+                             args.batch_size, dry_run=args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    verb = "Would create" if args.dry_run else "Created"
+    print(f"{verb} {report.created} of {report.rows} students in {elapsed:.1f} s "
+          f"({report.rows / elapsed:.0f} rows/s); {len(report.errors)} rejected")
+    for error in report.errors[:SHOWN_ERRORS]:
+        print(f"  row {error['row']}: {error['message']}")
+    if len(report.errors) > SHOWN_ERRORS:
+        print(f"  ... and {len(report.errors) - SHOWN_ERRORS} more")
+    if args.errors:
+        with open(args.errors, "w") as f:
+            json.dump(report.errors, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
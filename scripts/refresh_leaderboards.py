@@ -0,0 +1,37 @@
+"""
+Recompute the trending / contributors / most-shared leaderboards once.
+
+Usage: python scripts/refresh_leaderboards.py
+
+Meant for cron; web workers don't refresh unless LEADERBOARD_REFRESH_SECONDS
+is set.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# This process refreshes once and exits; it must not start its own refresher thread
+os.environ["LEADERBOARD_REFRESH_SECONDS"] = "0"
+
+from app import create_app
+from leaderboard import LEADERBOARD_SIZE, refresh_leaderboards
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=LEADERBOARD_SIZE, help="ranks kept per board and window")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        start = time.perf_counter()
+        written = refresh_leaderboards(size=args.size)
+        print(f"Wrote {written} leaderboard rows in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
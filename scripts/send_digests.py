@@ -0,0 +1,52 @@
+"""
+Email each subscribed student a digest of new posts and content in their categories.
+
+Usage: python scripts/send_digests.py [--frequency daily|weekly] [--chunk-size N] [--dry-run]
+
+Run from cron once a day with --frequency daily and once a week with the
+default. Students choose with the "digest" preference ("daily", "weekly" or
+"off"); those who never chose get the weekly one. An interrupted run picks up
+after the last chunk it committed when started again.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the project root directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# A one-shot process: no refresher thread, and mail goes out from here rather than a job queue
+os.environ["LEADERBOARD_REFRESH_SECONDS"] = "0"
+os.environ["JOB_BACKEND"] = "none"
+
+from app import create_app
+from digest import DEFAULT_FREQUENCY, DIGEST_CHUNK_SIZE, FREQUENCIES, send_digests
+from mailer import BatchMailer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frequency", choices=sorted(FREQUENCIES), default=DEFAULT_FREQUENCY)
+    parser.add_argument("--chunk-size", type=int, default=DIGEST_CHUNK_SIZE, help="students loaded per query")
+    parser.add_argument("--dry-run", action="store_true", help="count recipients without sending or recording")
+    args = parser.parse_args()
+
+    app = create_app()
+    start = time.perf_counter()
+
+    def progress(run):
+        elapsed = time.perf_counter() - start
+        print(f"  up to student {run.last_student_id}: {run.sent} sent, {run.failed} failed "
+              f"({run.sent / elapsed:.0f}/s)", flush=True)
+
+    with app.app_context(), BatchMailer.from_app(app) as mailer:
+        run = send_digests(mailer, args.frequency, chunk_size=args.chunk_size,
+                           dry_run=args.dry_run, progress=progress)
+    verb = "Would send" if args.dry_run else "Sent"
+    print(f"{verb} {run.sent} {args.frequency} digests ({run.failed} failed) "
+          f"in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
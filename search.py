@@ -0,0 +1,254 @@
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from operator import itemgetter
+from flask import current_app
+from sqlalchemy import func, literal, literal_column, select, union_all
+from sqlalchemy.engine import make_url
+from models import db, Post, Content
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for if in into is it no not of on or such "
+    "that the their then there these they this to was will with".split()
+)
+TITLE_WEIGHT = 2  # Title terms count this many times towards a document's term frequency
+
+
+def tokenize(text):
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-memory inverted index ranked with Okapi BM25.
+
+    Documents are keyed by (kind, id), e.g. ("post", 12). Adding an existing key
+    replaces it, so the index can be updated incrementally as rows change. A
+    query only touches the posting lists of its own terms.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(dict)  # term -> {key: term frequency}
+        self._doc_terms = {}  # key -> terms, needed to unlink a document
+        self._doc_len = {}
+        self._titles = {}
+        self._total_len = 0
+        self._lock = threading.RLock()
+
+    def add(self, key, title, text):
+        counts = Counter(tokenize(title) * TITLE_WEIGHT + tokenize(text))
+        with self._lock:
+            self.remove(key)
+            for term, tf in counts.items():
+                self._postings[term][key] = tf
+            length = sum(counts.values())
+            self._doc_terms[key] = tuple(counts)
+            self._doc_len[key] = length
+            self._titles[key] = title
+            self._total_len += length
+
+    def remove(self, key):
+        with self._lock:
+            terms = self._doc_terms.pop(key, None)
+            if terms is None:
+                return
+            for term in terms:
+                postings = self._postings[term]
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+            self._total_len -= self._doc_len.pop(key)
+            del self._titles[key]
+
+    def search(self, query, limit=20, offset=0, kind=None):
+        """Return (total_matches, [(key, title, score), ...]) for one page of results."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._doc_len)
+            if not terms or not n_docs:
+                return 0, []
+            avg_len = self._total_len / n_docs
+            k1, b = self.k1, self.b
+
+            scores = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    if kind is not None and key[0] != kind:
+                        continue
+                    norm = k1 * (1 - b + b * self._doc_len[key] / avg_len)
+                    scores[key] += idf * tf * (k1 + 1) / (tf + norm)
+
+            top = heapq.nlargest(offset + limit, scores.items(), key=itemgetter(1))[offset:]
+            return len(scores), [(key, self._titles[key], score) for key, score in top]
+
+    def __len__(self):
+        return len(self._doc_len)
+
+
+class MemorySearchBackend:
+    """
+    Per-process BM25 index over posts and content, kept current by the write
+    endpoints. start() builds it from the database in a background thread
+    when the app starts; a search that arrives first waits for that load
+    rather than starting its own. Other workers never see this worker's
+    writes, so it is only the default for SQLite (development and tests).
+    """
+
+    def __init__(self, index=None, batch_size=1000):
+        self.index = index or BM25Index()
+        self.batch_size = batch_size
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending = []  # Writes made while loading, replayed over the rows it read
+
+    def start(self, app):
+        """Build the index in the background, off the request path."""
+        def load():
+            with app.app_context():
+                try:
+                    self.ensure_loaded()
+                except Exception as e:
+                    logger.warning(f"Search index preload failed, will retry on first search: {e}")
+
+        threading.Thread(target=load, name="search-index-load", daemon=True).start()
+
+    def ensure_loaded(self):
+        with self._load_lock:
+            if self._loaded:
+                return
+            for row in db.session.query(Post.id, Post.title, Post.content).yield_per(self.batch_size):
+                self.index.add(("post", row.id), row.title, row.content)
+            for row in db.session.query(Content.id, Content.title, Content.description).yield_per(self.batch_size):
+                self.index.add(("content", row.id), row.title, row.description)
+            with self._pending_lock:
+                for apply, args in self._pending:
+                    apply(*args)
+                self._pending = []
+                self._loaded = True
+
+    def _apply(self, apply, *args):
+        with self._pending_lock:
+            if not self._loaded:  # The load may already have read an older copy of the row
+                self._pending.append((apply, args))
+                return
+        apply(*args)
+
+    def index_document(self, kind, doc_id, title, text):
+        self._apply(self.index.add, (kind, doc_id), title, text)
+
+    def remove_document(self, kind, doc_id):
+        self._apply(self.index.remove, (kind, doc_id))
+
+    def search(self, query, limit=20, offset=0, kind=None):
+        self.ensure_loaded()
+        total, hits = self.index.search(query, limit, offset, kind)
+        return total, [
+            {"type": key[0], "id": key[1], "title": title, "score": score}
+            for key, title, score in hits
+        ]
+
+
+# The GIN expression indexes from the search migration are built on exactly
+# these expressions; keep them in sync or Postgres falls back to a scan.
+# Literal columns keep the SQL textually identical to the index definition.
+def _document(title, body):
+    return func.to_tsvector(
+        literal_column("'english'"),
+        func.coalesce(title, literal_column("''"))
+        .op("||")(literal_column("' '"))
+        .op("||")(func.coalesce(body, literal_column("''")))
+    )
+
+
+def _post_document():
+    return _document(Post.title, Post.content)
+
+
+def _content_document():
+    return _document(Content.title, Content.description)
+
+
+class PostgresSearchBackend:
+    """Full-text search with Postgres tsvector/GIN; always in sync, shared by all workers."""
+
+    def index_document(self, kind, doc_id, title, text):
+        pass  # The expression indexes are maintained by Postgres itself
+
+    def remove_document(self, kind, doc_id):
+        pass
+
+    def search(self, query, limit=20, offset=0, kind=None):
+        ts_query = func.plainto_tsquery(literal_column("'english'"), query)
+        selects = []
+        if kind in (None, "post"):
+            document = _post_document()
+            selects.append(
+                select(literal("post").label("type"), Post.id, Post.title,
+                       func.ts_rank(document, ts_query).label("score"))
+                .where(document.op("@@")(ts_query))
+            )
+        if kind in (None, "content"):
+            document = _content_document()
+            selects.append(
+                select(literal("content").label("type"), Content.id, Content.title,
+                       func.ts_rank(document, ts_query).label("score"))
+                .where(document.op("@@")(ts_query))
+            )
+        matches = union_all(*selects).subquery()
+
+        total = db.session.execute(select(func.count()).select_from(matches)).scalar()
+        rows = db.session.execute(
+            select(matches).order_by(matches.c.score.desc(), matches.c.id).limit(limit).offset(offset)
+        ).all()
+        return total, [
+            {"type": row.type, "id": row.id, "title": row.title, "score": float(row.score)}
+            for row in rows
+        ]
+
+
+def create_search_backend(config):
+    """
+    Build the backend selected by SEARCH_BACKEND ("memory" or "postgres").
+    Unset, it is "postgres" on a PostgreSQL database and "memory" otherwise.
+    """
+    backend = config.get("SEARCH_BACKEND")
+    if not backend:
+        uri = config.get("SQLALCHEMY_DATABASE_URI")
+        backend = "postgres" if uri and make_url(uri).get_backend_name() == "postgresql" else "memory"
+    if backend == "memory":
+        return MemorySearchBackend()
+    if backend == "postgres":
+        return PostgresSearchBackend()
+    raise ValueError(f"Unknown SEARCH_BACKEND: {backend}")
+
+
+def get_search_backend():
+    return current_app.extensions.get("search_backend")
+
+
+def index_document(kind, doc_id, title, text):
+    """Add or refresh one post/content document in the app's search backend, if any."""
+    backend = get_search_backend()
+    if backend is not None:
+        backend.index_document(kind, doc_id, title, text)
+
+
+def remove_document(kind, doc_id):
+    backend = get_search_backend()
+    if backend is not None:
+        backend.remove_document(kind, doc_id)
@@ -0,0 +1,146 @@
+from operator import attrgetter, itemgetter
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Date, DateTime
+from models import Admin, Comment, Content, Notification, Post, Student
+
+try:
+    import orjson
+except ImportError:  # A declared dependency, but fall back to the stdlib encoder without it
+    orjson = None
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+class Serializer:
+    """
+    Encoder for one row shape, compiled once per field selection.
+
+    Each encoder fetches all its fields with one attrgetter (or itemgetter)
+    call and zips them into a dict, with isoformat() applied only to the
+    datetime fields. Encoders read attributes, for ORM instances; row
+    encoders read by position, for projected queries selecting exactly those
+    fields in order, which is several times cheaper than attribute access on
+    a Row.
+    """
+
+    def __init__(self, fields, datetime_fields=(), model=None):
+        self.model = model
+        self.fields = tuple(fields)
+        self.datetime_fields = frozenset(datetime_fields)
+        self._encoders = {}
+        self._default = self.only(self.fields)
+
+    def __call__(self, obj):
+        return self._default(obj)
+
+    def only(self, fields, positional=False):
+        """Return the encoder for a subset of fields, compiling it on first use."""
+        fields = tuple(fields)
+        encoder = self._encoders.get((fields, positional))
+        if encoder is None:
+            unknown = [field for field in fields if field not in self.fields]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+            encoder = self._encoders[fields, positional] = self._compile(fields, positional)
+        return encoder
+
+    def columns(self, fields=None):
+        """Model columns to select for row_encoder(fields), in matching order."""
+        return [getattr(self.model, field) for field in (self.fields if fields is None else fields)]
+
+    def row_encoder(self, fields=None):
+        """Encoder for rows of a query selecting fields (default: all), in that order."""
+        return self.only(self.fields if fields is None else fields, positional=True)
+
+    def many(self, objs, fields=None):
+        encode = self._default if fields is None else self.only(fields)
+        return [encode(obj) for obj in objs]
+
+    def parse_fields(self, value):
+        """Parse a comma-separated ?fields= value; None (all fields) when empty."""
+        if not value:
+            return None
+        fields = tuple(field.strip() for field in value.split(',') if field.strip())
+        self.only(fields)  # Validates
+        return fields or None
+
+    def _compile(self, fields, positional):
+        if not fields:
+            return lambda obj: {}
+        getter = itemgetter(*range(len(fields))) if positional else attrgetter(*fields)
+        if len(fields) == 1:  # A single-item getter returns the value, not a tuple
+            single = getter
+            getter = lambda obj: (single(obj),)
+        datetime_fields = [field for field in fields if field in self.datetime_fields]
+
+        if not datetime_fields:
+            return lambda obj: dict(zip(fields, getter(obj)))
+
+        def encode(obj):
+            encoded = dict(zip(fields, getter(obj)))
+            for field in datetime_fields:
+                encoded[field] = _isoformat(encoded[field])
+            return encoded
+        return encode
+
+
+def model_serializer(model, fields):
+    """Serializer for model columns, with datetime handling taken from the column types."""
+    columns = model.__table__.columns
+    return Serializer(fields, [
+        field for field in fields
+        if field in columns and isinstance(columns[field].type, (Date, DateTime))
+    ], model=model)
+
+
+post_serializer = model_serializer(
+    Post, ("id", "title", "content", "category_id", "student_id", "created_at")
+)
+content_serializer = model_serializer(
+    Content, ("id", "title", "description", "category_id", "status", "admin_id",
+              "content_type", "content_link")
+)
+student_serializer = model_serializer(Student, ("id", "email", "username", "created_at"))
+admin_serializer = model_serializer(Admin, ("id", "email", "username", "created_at"))
+comment_serializer = model_serializer(
+    Comment, ("id", "content", "student_id", "created_at", "parent_id")
+)
+notification_serializer = model_serializer(Notification, ("id", "message", "is_read", "created_at"))
+# Rows of the wishlist's Wishlist/Post join, labelled as in views.wishlist
+wishlist_serializer = Serializer(
+    ("wishlist_id", "post_id", "title", "content", "category_id", "admin_id", "student_id",
+     "created_at", "is_approved", "is_flagged", "likes", "dislikes"),
+    datetime_fields=("created_at",)
+)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson.
+
+    Anything orjson does not handle natively, including datetimes, goes
+    through Flask's default hook so the output matches the stdlib provider.
+    """
+
+    option = 0 if orjson is None else (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+    )
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:  # Options such as indent are only understood by the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option), mimetype=self.mimetype
+        )
+
+
+def init_json(app):
+    """Switch the app to orjson when JSON_PROVIDER is "orjson" and it is installed."""
+    if app.config.get("JSON_PROVIDER", "orjson") == "orjson" and orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,80 @@
+import csv
+import io
+from flask import Response, current_app, request, stream_with_context
+
+# Rows fetched per round trip from the server-side cursor
+STREAM_BATCH_SIZE = 1000
+# Encoded rows joined into each chunk written to the socket
+STREAM_CHUNK_ROWS = 500
+
+
+def wants_ndjson():
+    """True when the client asked for newline-delimited JSON (?format=ndjson or the Accept header)."""
+    return (
+        request.args.get("format") == "ndjson"
+        or request.accept_mimetypes.best == "application/x-ndjson"
+    )
+
+
+def iter_query(query, batch_size=STREAM_BATCH_SIZE):
+    """
+    Start executing query now, so connection errors surface inside the view,
+    and fetch its rows batch_size at a time instead of all at once.
+    """
+    return iter(query.yield_per(batch_size))
+
+
+def stream_rows(rows, serialize, ndjson=False):
+    """
+    Response that encodes rows one at a time as a JSON array (or NDJSON),
+    so peak memory is one chunk of rows rather than the whole result.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        chunk = []
+        first = True
+        if not ndjson:
+            yield "["
+        for row in rows:
+            encoded = dumps(serialize(row))
+            if ndjson:
+                chunk.append(encoded + "\n")
+            else:
+                chunk.append(encoded if first else "," + encoded)
+                first = False
+            if len(chunk) >= STREAM_CHUNK_ROWS:
+                yield "".join(chunk)
+                chunk.clear()
+        if chunk:
+            yield "".join(chunk)
+        if not ndjson:
+            yield "]"
+
+    mimetype = "application/x-ndjson" if ndjson else "application/json"
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+
+def iter_csv(rows, serialize, fields):
+    """CSV text for rows (header first), yielded STREAM_CHUNK_ROWS rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        encoded = serialize(row)
+        writer.writerow([encoded[field] for field in fields])
+        count += 1
+        if count % STREAM_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_csv(rows, serialize, fields, filename=None):
+    """Response streaming rows as CSV, optionally as a download named filename."""
+    response = Response(stream_with_context(iter_csv(rows, serialize, fields)), mimetype="text/csv")
+    if filename:
+        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,212 @@
+import atexit
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from flask import current_app
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, Student
+from passwords import HashPool, get_password_hasher
+
+logger = logging.getLogger(__name__)
+
+# Rows hashed, inserted and committed together
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FORMATS = ("csv", "ndjson")
+REQUIRED_FIELDS = ("email", "username", "password")
+
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+_MIMETYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}
+# Column sizes, checked up front so one long value can't fail a whole batch
+_EMAIL_LENGTH = Student.__table__.c.email.type.length
+_USERNAME_LENGTH = Student.__table__.c.username.type.length
+
+
+def detect_format(requested=None, filename=None, mimetype=None):
+    """"csv" or "ndjson" from an explicit choice, the file extension or the content type; else None."""
+    if requested:
+        return requested if requested in IMPORT_FORMATS else None
+    if filename:
+        found = _EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+        if found:
+            return found
+    return _MIMETYPES.get(mimetype)
+
+
+def read_records(stream, fmt):
+    """
+    Yield (row number, record) for each row of a binary CSV or NDJSON
+    stream, reading it incrementally. Row numbers count data rows from 1
+    (the CSV header is not a row). An NDJSON line that is not a JSON object
+    yields None as its record. Raises ValueError for a CSV header lacking
+    a required column.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="" if fmt == "csv" else None)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        missing = [field for field in REQUIRED_FIELDS if field not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"CSV header is missing: {', '.join(missing)}")
+        yield from enumerate(reader, start=1)
+        return
+
+    row = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield row, record if isinstance(record, dict) else None
+
+
+class ImportReport:
+    """Outcome of an import: rows read, students created and an error per rejected row."""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.errors = []
+
+    def reject(self, row, message):
+        self.errors.append({"row": row, "message": message})
+
+    def to_dict(self):
+        return {"rows": self.rows, "created": self.created, "failed": len(self.errors), "errors": self.errors}
+
+
+def _field(record, name):
+    value = record.get(name)
+    return str(value).strip() if value is not None else ""
+
+
+def _check(record, emails, usernames):
+    """The reason record can't be imported, or None. Same rules as POST /students."""
+    if record is None:
+        return "Row is not a JSON object"
+    email, username = _field(record, "email"), _field(record, "username")
+    if not email or not username or not record.get("password"):
+        return "Email, username, and password are required"
+    if len(email) > _EMAIL_LENGTH:
+        return "Email is too long"
+    if len(username) > _USERNAME_LENGTH:
+        return "Username is too long"
+    if email in emails:
+        return "Email already exists"
+    if username in usernames:
+        return "Username already exists"
+    return None
+
+
+def import_students(records, hash_many, batch_size=None, dry_run=False):
+    """
+    Create students from (row number, record) pairs as yielded by read_records.
+
+    Existing emails and usernames are loaded once, in one query, and
+    duplicates (within the upload too) are checked against those sets rather
+    than a SELECT per row. Accepted rows are hashed batch_size at a time
+    with hash_many (e.g. HashPool.hash_many) and inserted with one
+    executemany INSERT and a commit per batch. If a batch is refused (say a
+    signup took an email meanwhile) it is retried row by row so only the
+    offending rows are reported. With dry_run rows are checked but nothing
+    is hashed or written; `created` counts what would be.
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    report = ImportReport()
+    emails, usernames = set(), set()
+    for email, username in db.session.execute(select(Student.email, Student.username)):
+        emails.add(email)
+        usernames.add(username)
+
+    batch = []
+    for row, record in records:
+        report.rows += 1
+        error = _check(record, emails, usernames)
+        if error:
+            report.reject(row, error)
+            continue
+        email, username = _field(record, "email"), _field(record, "username")
+        emails.add(email)
+        usernames.add(username)
+        batch.append((row, {"email": email, "username": username, "password": str(record["password"])}))
+        if len(batch) >= batch_size:
+            _insert(batch, hash_many, report, dry_run)
+            batch = []
+    if batch:
+        _insert(batch, hash_many, report, dry_run)
+
+    logger.info(f"Student import: {report.rows} rows, {report.created} created, {len(report.errors)} rejected")
+    return report
+
+
+def _insert(batch, hash_many, report, dry_run):
+    if dry_run:
+        report.created += len(batch)
+        return
+    hashes = hash_many([values["password"] for _, values in batch])
+    for (_, values), hashed in zip(batch, hashes):
+        values["password"] = hashed
+
+    statement = insert(Student.__table__)
+    try:
+        db.session.execute(statement, [values for _, values in batch])
+        db.session.commit()
+        report.created += len(batch)
+        return
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.warning(f"Student import batch failed ({e}); retrying its rows one at a time")
+
+    for row, values in batch:
+        try:
+            db.session.execute(statement, values)
+            db.session.commit()
+            report.created += 1
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.warning(f"Student import row {row} failed: {e}")
+            report.reject(row, "Could not save this student")
+
+
+def import_file(stream, fmt, hasher, workers=None, batch_size=None, dry_run=False, pool=None):
+    """
+    Import a CSV or NDJSON stream, hashing on `pool` when given (see
+    get_import_pool) or else on a pool of `workers` processes (default: one
+    per core) started for this import alone, as the CLI does.
+    """
+    records = read_records(stream, fmt)
+    if dry_run:
+        return import_students(records, None, batch_size, dry_run=True)
+    if pool is not None:
+        return import_students(records, pool.hash_many, batch_size)
+    with HashPool(hasher, workers) as pool:
+        return import_students(records, pool.hash_many, batch_size)
+
+
+_pool_lock = threading.Lock()
+
+
+def get_import_pool():
+    """
+    The app's HashPool for imports made over HTTP, started on first use and
+    shared by every request, so concurrent uploads queue for the same
+    STUDENT_IMPORT_WORKERS processes instead of each starting their own.
+    Workers come from a forkserver rather than a fork of this threaded
+    server.
+    """
+    pool = current_app.extensions.get("student_import_pool")
+    if pool is None:
+        with _pool_lock:
+            pool = current_app.extensions.get("student_import_pool")
+            if pool is None:
+                pool = HashPool(get_password_hasher(), current_app.config.get("STUDENT_IMPORT_WORKERS") or None,
+                                mp_context=multiprocessing.get_context("forkserver"))
+                atexit.register(pool.close)
+                current_app.extensions["student_import_pool"] = pool
+    return pool
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+import pytest
+from flask import Flask
+from auth_providers import (
+    AuthProvider, AuthProviderUnavailable, FirebaseAdminProvider, create_auth_provider, get_auth_provider,
+)
+from firebase_tokens import FirebaseTokenVerifier
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def run_python(code, **env):
+    """Run code in a fresh interpreter so module imports can be observed."""
+    env = dict(os.environ, DATABASE_URL="sqlite:///:memory:", LEADERBOARD_REFRESH_SECONDS="0",
+               JOB_BACKEND="none", **env)
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+
+
+def test_importing_auth_views_does_not_load_firebase_admin():
+    result = run_python("import sys, views.auth; print('firebase_admin' in sys.modules)")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_create_app_imports_only_enabled_blueprints():
+    result = run_python(
+        "import sys, app; a = app.create_app(); "
+        "print(sorted(a.blueprints), 'views.feed' in sys.modules, 'firebase_admin' in sys.modules)",
+        BLUEPRINTS="auth,post",
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "['auth_bp', 'post'] False False"
+
+
+def test_create_app_starts_key_refresh_only_when_asked():
+    code = ("import threading, app; app.create_app(); "
+            "print(any(t.name == 'firebase-keys' for t in threading.enumerate()))")
+    result = run_python(code, FIREBASE_PROJECT_ID="p")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+    result = run_python(code, FIREBASE_PROJECT_ID="p", AUTH_KEY_PREFETCH="true")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "True"
+
+
+def test_missing_credentials_fail_on_first_use_not_import(tmp_path):
+    provider = FirebaseAdminProvider(str(tmp_path / "missing.json"))
+    with pytest.raises(AuthProviderUnavailable):
+        provider.verify_id_token("token")
+
+
+def test_create_auth_provider_selection():
+    assert isinstance(create_auth_provider({"FIREBASE_PROJECT_ID": "p"}), FirebaseTokenVerifier)
+    assert isinstance(create_auth_provider({"FIREBASE_PROJECT_ID": None}), FirebaseAdminProvider)
+    assert isinstance(create_auth_provider({"AUTH_PROVIDER": "firebase-admin", "FIREBASE_PROJECT_ID": "p"}),
+                      FirebaseAdminProvider)
+    with pytest.raises(ValueError):
+        create_auth_provider({"AUTH_PROVIDER": "ldap"})
+
+
+def test_get_auth_provider_defaults_to_lazy_admin_sdk():
+    app = Flask(__name__)
+    with app.app_context():
+        provider = get_auth_provider()
+        assert isinstance(provider, FirebaseAdminProvider)
+        assert get_auth_provider() is provider
+
+
+def test_providers_must_implement_verify_id_token():
+    with pytest.raises(TypeError):
+        AuthProvider()
@@ -0,0 +1,150 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import event
+from models import db, Post, Student
+from cache import MemoryCache, RedisCache
+from views.post import post_bp
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Minimal stand-in for redis.Redis: get/set(ex)/delete on a dict."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode()
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def app(request):
+    """Create a Flask test app with each cache backend."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(post_bp)
+    if request.param == "memory":
+        app.extensions["response_cache"] = MemoryCache()
+    else:
+        app.extensions["response_cache"] = RedisCache(FakeRedis())
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Student(id=2, email="student@example.com", username="student123", password="hashed_password"))
+        db.session.add(Post(id=1, title="First", content="Body", category_id=1, student_id=2))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(app):
+    with app.app_context():
+        token = create_access_token(identity=2)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count SELECTs issued against the engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        yield statements
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_repeat_get_served_from_cache(client, query_counter):
+    first = client.get("/posts")
+    queries_after_first = len(query_counter)
+    second = client.get("/posts")
+
+    assert second.status_code == 200
+    assert second.json == first.json
+    assert len(query_counter) == queries_after_first
+
+
+def test_if_none_match_returns_304_without_db(client, query_counter):
+    etag = client.get("/post/1").headers["ETag"]
+    query_counter.clear()
+
+    response = client.get("/post/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert query_counter == []
+
+
+def test_ndjson_by_accept_header_skips_the_cached_json(client):
+    cached = client.get("/posts")
+    assert cached.headers["Vary"] == "Accept"
+
+    response = client.get("/posts", headers={"Accept": "application/x-ndjson"})
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["Vary"] == "Accept"
+    assert [line for line in response.get_data(as_text=True).splitlines() if line]
+    assert client.get("/posts").json == cached.json
+
+
+def test_add_post_invalidates_feed(client, headers):
+    client.get("/posts")
+    client.post("/posts", json={"title": "Second", "content": "Body", "category_id": 1}, headers=headers)
+
+    titles = [post["title"] for post in client.get("/posts").json]
+    assert titles == ["Second", "First"]
+
+
+def test_update_post_invalidates_post_and_feed(client, headers):
+    etag = client.get("/post/1").headers["ETag"]
+    client.get("/posts")
+
+    client.put("/post/1", json={"title": "Renamed"}, headers=headers)
+
+    response = client.get("/post/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json["title"] == "Renamed"
+    assert client.get("/posts").json[0]["title"] == "Renamed"
+
+
+def test_memory_cache_lru_and_ttl():
+    clock = FakeClock()
+    cache = MemoryCache(max_entries=2, default_ttl=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # Evicts "b", the least recently used
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+    clock.now = 10
+    assert cache.get("a") is None
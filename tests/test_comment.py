@@ -0,0 +1,129 @@
+import pytest
+from flask import Flask
+from sqlalchemy import event
+from models import db, Comment
+from views.comment import comment_bp
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app and initialize the database."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+
+    db.init_app(app)
+    app.register_blueprint(comment_bp)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count SELECTs issued against the engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if "SELECT" in statement.upper():
+            statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        yield statements
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def add_comment(app, content, parent_id=None, post_id=1):
+    with app.app_context():
+        comment = Comment(content=content, student_id=1, post_id=post_id, parent_id=parent_id)
+        db.session.add(comment)
+        db.session.commit()
+        return comment.id
+
+
+def test_get_comments_returns_full_tree(client, app):
+    """Test that replies are nested at every depth, not just one level."""
+    root = add_comment(app, "root")
+    child = add_comment(app, "child", root)
+    add_comment(app, "grandchild", child)
+    add_comment(app, "other post", post_id=2)
+
+    response = client.get("/posts/1/comments")
+
+    assert response.status_code == 200
+    assert len(response.json) == 1
+    thread = response.json[0]
+    assert thread["content"] == "root"
+    assert thread["replies"][0]["content"] == "child"
+    assert thread["replies"][0]["replies"][0]["content"] == "grandchild"
+
+
+def test_get_comments_max_depth(client, app):
+    """Test that max_depth truncates the tree."""
+    root = add_comment(app, "root")
+    child = add_comment(app, "child", root)
+    add_comment(app, "grandchild", child)
+
+    response = client.get("/posts/1/comments?max_depth=1")
+
+    assert response.json[0]["replies"][0]["replies"] == []
+
+    response = client.get("/posts/1/comments?max_depth=0")
+
+    assert response.json[0]["replies"] == []
+
+
+def test_get_comments_rejects_non_integer_max_depth(client, app):
+    """Test that a malformed max_depth is a 400 rather than the default depth."""
+    add_comment(app, "root")
+
+    response = client.get("/posts/1/comments?max_depth=deep")
+
+    assert response.status_code == 400
+    assert response.json["message"] == "max_depth must be an integer"
+
+
+def test_get_comments_paginates_threads(client, app):
+    """Test paging through top-level threads with the cursor header."""
+    for i in range(3):
+        root = add_comment(app, f"root {i}")
+        add_comment(app, f"reply {i}", root)
+
+    first = client.get("/posts/1/comments?limit=2")
+    assert [t["content"] for t in first.json] == ["root 0", "root 1"]
+
+    second = client.get(f"/posts/1/comments?limit=2&cursor={first.headers['X-Next-Cursor']}")
+    assert [t["content"] for t in second.json] == ["root 2"]
+    assert second.json[0]["replies"][0]["content"] == "reply 2"
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_get_comments_query_count_is_fixed(client, app, query_counter):
+    """Test that a large, deep discussion still renders in two queries."""
+    with app.app_context():
+        for i in range(20):
+            parent = Comment(content=f"root {i}", student_id=1, post_id=1)
+            db.session.add(parent)
+            db.session.flush()
+            for depth in range(5):
+                reply = Comment(content="reply", student_id=1, post_id=1, parent_id=parent.id)
+                db.session.add(reply)
+                db.session.flush()
+                parent = reply
+        db.session.commit()
+
+    query_counter.clear()
+    response = client.get("/posts/1/comments?limit=20")
+
+    assert response.status_code == 200
+    assert len(response.json) == 20
+    assert len(query_counter) == 2
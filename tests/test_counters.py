@@ -0,0 +1,183 @@
+import threading
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import event
+from models import db, Post
+from counters import ReactionBuffer
+from views.post import post_bp
+
+THREADS = 8
+LIKES_PER_THREAD = 25
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Create a Flask test app backed by a file database shared across threads."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'counters.db'}"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(post_bp)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Post(id=1, title="Hot post", content="Body", category_id=1, student_id=1))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def tokens(app):
+    """One token per liking student, so every like is a distinct reaction."""
+    with app.app_context():
+        return [
+            create_access_token(identity={"id": student_id, "role": "student"})
+            for student_id in range(1, THREADS * LIKES_PER_THREAD + 1)
+        ]
+
+
+def hammer(target):
+    """Run target LIKES_PER_THREAD times on each of THREADS threads, all released together."""
+    barrier = threading.Barrier(THREADS)
+
+    def worker():
+        barrier.wait()
+        for _ in range(LIKES_PER_THREAD):
+            target()
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def stored_likes(app):
+    with app.app_context():
+        return db.session.get(Post, 1).likes
+
+
+def test_concurrent_likes_are_not_lost(app, tokens):
+    """Every concurrent like must land with the atomic UPDATE."""
+    remaining = iter(tokens)
+    lock = threading.Lock()
+    statuses = []
+
+    def like():
+        with lock:
+            token = next(remaining)
+        response = app.test_client().post("/post/1/like", headers={"Authorization": f"Bearer {token}"})
+        statuses.append(response.status_code)
+
+    hammer(like)
+
+    assert set(statuses) == {200}
+    assert stored_likes(app) == THREADS * LIKES_PER_THREAD
+
+
+def test_like_missing_post(app, tokens):
+    response = app.test_client().post("/post/999/like", headers={"Authorization": f"Bearer {tokens[0]}"})
+    assert response.status_code == 404
+
+
+def test_buffered_likes_are_not_lost(app):
+    """Buffered reactions are summed in memory and written on flush."""
+    buffer = ReactionBuffer(app, flush_interval_ms=10)
+    buffer.start()
+
+    def like():
+        with app.app_context():
+            buffer.add(Post, 1, "likes")
+
+    hammer(like)
+    buffer.stop()
+
+    assert stored_likes(app) == THREADS * LIKES_PER_THREAD
+
+
+def test_buffered_flush_batches_deltas(app):
+    """A burst of reactions on one post is written as a single summed delta."""
+    buffer = ReactionBuffer(app, flush_interval_ms=1000)
+
+    with app.test_request_context():
+        for _ in range(50):
+            buffer.add(Post, 1, "likes")
+        assert buffer.add(Post, 1, "dislikes") == 1
+
+    buffer.flush()
+
+    with app.app_context():
+        post = db.session.get(Post, 1)
+        assert (post.likes, post.dislikes) == (50, 1)
+
+
+def test_buffered_counts_skip_the_select_between_refreshes(app):
+    """Only the first reaction in each count_ttl window reads the stored count."""
+    clock = {"now": 0.0}
+    buffer = ReactionBuffer(app, flush_interval_ms=1000, count_ttl=5, clock=lambda: clock["now"])
+    selects = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    with app.test_request_context():
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        counts = [buffer.add(Post, 1, "likes") for _ in range(20)]
+        buffer.flush()
+        counts.append(buffer.add(Post, 1, "likes"))
+        assert len(selects) == 1
+
+        clock["now"] = 5
+        counts.append(buffer.add(Post, 1, "likes"))
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    assert counts == list(range(1, 23))
+    assert len(selects) == 2
+    assert buffer.add(Post, 99, "likes") is None
+
+
+def test_refresh_during_a_flush_counts_each_delta_once(app):
+    """A stale count re-read while a flush commits must not also get that flush's deltas added."""
+    clock = {"now": 0.0}
+    buffer = ReactionBuffer(app, flush_interval_ms=1000, count_ttl=5, clock=lambda: clock["now"])
+    committed, resume = threading.Event(), threading.Event()
+    flushed = buffer._flushed
+
+    def paused_after_commit(deltas):
+        committed.set()
+        resume.wait(5)
+        flushed(deltas)
+
+    buffer._flushed = paused_after_commit
+    with app.test_request_context():
+        assert [buffer.add(Post, 1, "likes") for _ in range(3)] == [1, 2, 3]
+    clock["now"] = 5  # The cached count is stale, so the next add re-reads it
+
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    committed.wait(5)
+    counts = []
+
+    def like():
+        with app.test_request_context():
+            counts.append(buffer.add(Post, 1, "likes"))
+            db.session.remove()
+
+    liker = threading.Thread(target=like)
+    liker.start()
+    liker.join(0.2)  # Give the re-read the chance to land between the commit and the cache update
+    resume.set()
+    flusher.join()
+    liker.join()
+
+    assert counts == [4]
+    with app.test_request_context():
+        assert buffer.add(Post, 1, "likes") == 5
+    buffer.flush()
+    assert stored_likes(app) == 5
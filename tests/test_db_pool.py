@@ -0,0 +1,123 @@
+import threading
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from db_pool import InstrumentedQueuePool, PoolMetrics, engine_options
+from models import db
+from views.metrics import metrics_bp
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Create a Flask test app on a one-connection pool."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'pool.db'}"
+    app.config["TESTING"] = True
+    app.config["METRICS_TOKEN"] = "s3cret"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "poolclass": InstrumentedQueuePool, "pool_size": 1, "max_overflow": 0, "pool_timeout": 1,
+    }
+
+    db.init_app(app)
+    app.register_blueprint(metrics_bp)
+    with app.app_context():
+        app.extensions["pool_metrics"] = PoolMetrics().instrument(db.engine)
+        yield app
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def test_engine_options_from_config():
+    config = {"SQLALCHEMY_DATABASE_URI": "postgresql://u:p@db.example.com/app", "DB_POOL_SIZE": 8,
+              "DB_MAX_OVERFLOW": 2, "DB_POOL_TIMEOUT": 5, "DB_POOL_RECYCLE": 600, "DB_POOL_PRE_PING": False,
+              "DB_STATEMENT_TIMEOUT_MS": 15000}
+    assert engine_options(config) == {
+        "pool_pre_ping": False, "poolclass": InstrumentedQueuePool, "pool_size": 8, "max_overflow": 2,
+        "pool_timeout": 5, "pool_recycle": 600,
+        "connect_args": {"options": "-c statement_timeout=15000"},
+    }
+    assert "connect_args" not in engine_options({**config, "DB_STATEMENT_TIMEOUT_MS": 0})
+    # SQLite keeps Flask-SQLAlchemy's pool (StaticPool in memory), which takes no sizing options
+    assert engine_options({"SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"}) == {"pool_pre_ping": True}
+
+
+def test_counts_checkouts_waits_and_churn(app):
+    metrics = app.extensions["pool_metrics"]
+    for _ in range(3):
+        with db.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    snap = metrics.snapshot()
+    assert snap["checkouts"] == 3 and snap["wait_count"] == 3
+    assert snap["opened"] == 1  # Reused, not reopened
+    assert snap["size"] == 1 and snap["checked_out"] == 0 and snap["idle"] == 1
+
+    db.engine.dispose()
+    with db.engine.connect():
+        assert metrics.snapshot()["checked_out"] == 1
+    snap = metrics.snapshot()
+    assert snap["opened"] == 2 and snap["closed"] == 1
+    assert snap["wait_count"] == 4  # The recreated pool still reports
+
+
+def test_exhausted_pool_records_timeout_and_wait(app):
+    metrics = app.extensions["pool_metrics"]
+    held = db.engine.connect()
+    try:
+        with pytest.raises(PoolTimeoutError):
+            db.engine.connect()
+    finally:
+        held.close()
+
+    snap = metrics.snapshot()
+    assert snap["timeouts"] == 1
+    assert snap["wait_max"] >= 1
+
+
+def test_waiters_are_served_when_a_connection_returns(app):
+    metrics = app.extensions["pool_metrics"]
+    engine = db.engine
+    held = engine.connect()
+    got = threading.Event()
+
+    def wait_for_connection():
+        with engine.connect():
+            got.set()
+
+    waiter = threading.Thread(target=wait_for_connection)
+    waiter.start()
+    assert not got.wait(0.1)
+    held.close()
+    waiter.join()
+    assert got.is_set()
+    assert metrics.snapshot()["wait_max"] >= 0.1
+
+
+METRICS_AUTH = {"Authorization": "Bearer s3cret"}
+
+
+def test_metrics_endpoint(app, client):
+    with db.engine.connect():
+        body = client.get("/metrics", headers=METRICS_AUTH).get_data(as_text=True)
+    assert "# TYPE db_pool_checked_out gauge" in body
+    assert "db_pool_checked_out{pid=" in body and "} 1\n" in body
+    assert 'db_pool_checkout_wait_seconds_bucket{pid="' in body
+    assert "db_pool_connections_opened_total" in body
+
+    assert client.get("/metrics?format=json", headers=METRICS_AUTH).json["size"] == 1
+
+
+def test_metrics_token(app, client):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer s\u00e9cret"}).status_code == 401
+    assert client.get("/metrics", headers=METRICS_AUTH).status_code == 200
+
+    app.config["METRICS_TOKEN"] = None
+    assert client.get("/metrics").status_code == 404
@@ -0,0 +1,200 @@
+import pytest
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import event
+from digest import category_sections, send_digests
+from models import db, Admin, Category, Content, DigestRun, Post, Student, Subscription, UserPreference
+
+NOW = datetime(2026, 10, 18, 8, 0)
+
+
+class RecordingMailer:
+    def __init__(self, refuse=()):
+        self.sent = []
+        self.refuse = set(refuse)
+
+    def send(self, to, subject, body):
+        if to in self.refuse:
+            return False
+        self.sent.append((to, subject, body))
+        return True
+
+
+class FailingMailer(RecordingMailer):
+    """Raises (like a dead SMTP server) once `fail_after` messages have gone out."""
+
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+
+    def send(self, to, subject, body):
+        if len(self.sent) >= self.fail_after:
+            raise ConnectionError("SMTP server went away")
+        return super().send(to, subject, body)
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with a small catalogue of new and old items."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Admin(id=1, email="admin@example.com", username="admin", password="x"))
+        db.session.add_all([
+            Category(id=1, name="Motivation", admin_id=1),
+            Category(id=2, name="Study", admin_id=1),
+            Category(id=3, name="Quiet", admin_id=1),
+        ])
+        yesterday = NOW - timedelta(days=1)
+        db.session.add_all([
+            Post(title="Keep going", content="c", category_id=1, created_at=yesterday),
+            Post(title="Costs $5 a month", content="c", category_id=1, created_at=yesterday),
+            Post(title="Flagged", content="c", category_id=1, created_at=yesterday, is_flagged=True),
+            Post(title="Ancient", content="c", category_id=1, created_at=NOW - timedelta(days=30)),
+            Post(title="Pomodoro", content="c", category_id=2, created_at=yesterday),
+            Content(title="Focus podcast", status="approved", category_id=2, admin_id=1,
+                    content_type="podcast", approved_at=yesterday),
+            Content(title="Pending video", status="pending", category_id=2, admin_id=1),
+        ])
+        for i in range(1, 8):
+            db.session.add(Student(id=i, email=f"s{i}@example.com", username=f"student{i}", password="x"))
+        db.session.add_all([
+            Subscription(student_id=1, category_id=1),
+            Subscription(student_id=2, category_id=1),
+            Subscription(student_id=2, category_id=2),
+            Subscription(student_id=3, category_id=3),  # Nothing new there
+            Subscription(student_id=4, category_id=2),
+            Subscription(student_id=5, category_id=1),
+            Subscription(student_id=6, category_id=1),
+            # 7 subscribes to nothing
+            UserPreference(student_id=5, preference_type="digest", preference_value="daily"),
+            UserPreference(student_id=6, preference_type="digest", preference_value="off"),
+        ])
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+def count_queries():
+    statements = []
+    event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_category_sections_keep_new_unflagged_items(app):
+    with app.app_context():
+        sections = category_sections(NOW - timedelta(days=7), NOW)
+    assert set(sections) == {1, 2}
+    assert sections[1][0] == 2
+    assert "Keep going" in sections[1][1] and "Ancient" not in sections[1][1] and "Flagged" not in sections[1][1]
+    assert "Focus podcast (podcast)" in sections[2][1] and "Pending" not in sections[2][1]
+
+
+def test_category_sections_cap_items_per_category(app):
+    with app.app_context():
+        for i in range(15):
+            db.session.add(Post(title=f"extra {i}", content="c", category_id=1, created_at=NOW - timedelta(hours=i + 1)))
+        db.session.commit()
+        sections = category_sections(NOW - timedelta(days=7), NOW, limit=10)
+    assert sections[1][0] == 10
+    assert "extra 0" in sections[1][1] and "extra 14" not in sections[1][1]
+
+
+def test_weekly_digest_goes_to_default_and_weekly_subscribers(app):
+    mailer = RecordingMailer()
+    with app.app_context():
+        run = send_digests(mailer, "weekly", now=NOW)
+    by_recipient = {to: (subject, body) for to, subject, body in mailer.sent}
+
+    assert sorted(by_recipient) == ["s1@example.com", "s2@example.com", "s4@example.com"]
+    subject, body = by_recipient["s2@example.com"]
+    assert subject == "Your weekly digest: 4 new items"
+    assert body.startswith("Hi student2,")
+    assert "Motivation" in body and "Pomodoro" in body and "Costs $5 a month" in body
+    assert "Pomodoro" not in by_recipient["s1@example.com"][1]
+    assert (run.sent, run.failed, run.last_student_id) == (3, 0, 4)
+    assert run.finished_at is not None
+
+
+def test_titles_are_not_expanded_as_placeholders(app):
+    mailer = RecordingMailer()
+    with app.app_context():
+        db.session.add(Post(title="Win $5 now, $username and $$", content="c", category_id=2,
+                            created_at=NOW - timedelta(days=1)))
+        db.session.commit()
+        send_digests(mailer, "weekly", now=NOW)
+    body = {to: body for to, _, body in mailer.sent}["s4@example.com"]
+    assert body.startswith("Hi student4,")
+    assert "  - Win $5 now, $username and $$" in body
+
+
+def test_daily_digest_only_goes_to_students_who_chose_it(app):
+    mailer = RecordingMailer()
+    with app.app_context():
+        send_digests(mailer, "daily", now=NOW)
+    assert [to for to, _, _ in mailer.sent] == ["s5@example.com"]
+
+
+def test_next_run_starts_where_the_last_one_ended(app):
+    with app.app_context():
+        send_digests(RecordingMailer(), "weekly", now=NOW)
+        mailer = RecordingMailer()
+        run = send_digests(mailer, "weekly", now=NOW + timedelta(days=7))
+        assert run.period_start == NOW
+    assert mailer.sent == []
+
+
+def test_refused_recipients_are_counted_as_failed(app):
+    with app.app_context():
+        run = send_digests(RecordingMailer(refuse={"s2@example.com"}), "weekly", now=NOW)
+    assert (run.sent, run.failed) == (2, 1)
+
+
+def test_interrupted_run_resumes_after_last_committed_chunk(app):
+    with app.app_context():
+        with pytest.raises(ConnectionError):
+            send_digests(FailingMailer(fail_after=1), "weekly", now=NOW, chunk_size=1)
+        db.session.rollback()
+        run = DigestRun.query.one()
+        assert (run.last_student_id, run.sent, run.finished_at) == (1, 1, None)
+
+        mailer = RecordingMailer()
+        run = send_digests(mailer, "weekly", now=NOW + timedelta(hours=1), chunk_size=1)
+        assert run.period_end == NOW  # Same period as the interrupted attempt
+        assert DigestRun.query.count() == 1
+    assert [to for to, _, _ in mailer.sent] == ["s2@example.com", "s4@example.com"]
+    assert run.sent == 3
+
+
+def test_dry_run_sends_and_records_nothing(app):
+    mailer = RecordingMailer()
+    with app.app_context():
+        run = send_digests(mailer, "weekly", now=NOW, dry_run=True)
+        assert DigestRun.query.count() == 0
+    assert run.sent == 3
+    assert mailer.sent == []
+
+
+def test_queries_scale_with_chunks_not_students(app):
+    with app.app_context():
+        db.session.execute(Student.__table__.insert(), [
+            {"id": i, "email": f"s{i}@example.com", "username": f"s{i}", "password": "x", "is_active": True}
+            for i in range(100, 2100)
+        ])
+        db.session.execute(Subscription.__table__.insert(), [
+            {"student_id": i, "category_id": 1 + i % 2} for i in range(100, 2100)
+        ])
+        db.session.commit()
+
+        statements = count_queries()
+        mailer = RecordingMailer()
+        send_digests(mailer, "weekly", now=NOW, chunk_size=500)
+
+    assert len(mailer.sent) == 2003
+    # Run bookkeeping and the shared sections, then two reads and a checkpoint per chunk of 500
+    assert len(statements) <= 6 + 5 * 3 + 2
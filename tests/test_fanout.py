@@ -0,0 +1,133 @@
+import pytest
+from flask import Flask
+from sqlalchemy import text
+from flask_jwt_extended import JWTManager, create_access_token
+from models import db, Admin, Category, Content, Notification, Post, Student, Subscription
+from fanout import fan_out_post, fan_out_content
+from jobs import MemoryJobQueue
+from views.post import post_bp
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with two categories and a few subscribers."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(post_bp)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Admin(id=1, email="admin@example.com", username="admin", password="x"))
+        db.session.add(Category(id=1, name="Motivation", admin_id=1))
+        db.session.add(Category(id=2, name="Careers", admin_id=1))
+        for student_id in (1, 2, 3, 4):
+            db.session.add(Student(id=student_id, email=f"s{student_id}@example.com", username=f"s{student_id}", password="x"))
+        # Students 1-3 follow Motivation, student 4 only follows Careers
+        for student_id in (1, 2, 3):
+            db.session.add(Subscription(student_id=student_id, category_id=1))
+        db.session.add(Subscription(student_id=4, category_id=2))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+def recipients(post_id=None):
+    query = Notification.query
+    if post_id is not None:
+        query = query.filter_by(post_id=post_id)
+    return sorted(n.student_id for n in query.all())
+
+
+def test_fan_out_post_notifies_category_subscribers_except_author(app):
+    with app.app_context():
+        post = Post(title="Keep going", content="Body", category_id=1, student_id=1)
+        db.session.add(post)
+        db.session.commit()
+
+        assert fan_out_post(post.id) == 2
+        assert recipients(post.id) == [2, 3]
+        notification = Notification.query.first()
+        assert notification.category_id == 1
+        assert notification.is_read is False
+        assert notification.message == "New post in Motivation: Keep going"
+
+
+def test_fan_out_runs_again_without_duplicates(app):
+    with app.app_context():
+        post = Post(title="Keep going", content="Body", category_id=1, student_id=1)
+        content = Content(title="Podcast", category_id=1, status="approved", admin_id=1)
+        db.session.add_all([post, content])
+        db.session.commit()
+        assert fan_out_post(post.id) == 2
+        assert fan_out_content(content.id) == 3
+
+        # E.g. the job outlived its lease and another worker ran it again
+        assert fan_out_post(post.id) == 0
+        assert fan_out_content(content.id) == 0
+        assert recipients(post.id) == [2, 3]
+        assert len(recipients()) == 5
+
+
+def test_content_with_the_same_title_notifies_again(app):
+    with app.app_context():
+        first = Content(title="Podcast", category_id=1, status="approved", admin_id=1)
+        second = Content(title="Podcast", category_id=1, status="approved", admin_id=1)
+        db.session.add_all([first, second])
+        db.session.commit()
+        assert fan_out_content(first.id) == 3
+        assert fan_out_content(second.id) == 3
+        assert fan_out_content(second.id) == 0
+        assert len(recipients()) == 6
+
+
+def test_fan_out_content(app):
+    with app.app_context():
+        content = Content(title="Podcast", category_id=2, status="approved", admin_id=1)
+        db.session.add(content)
+        db.session.commit()
+
+        assert fan_out_content(content.id) == 1
+        assert recipients() == [4]
+
+
+def test_add_post_fans_out_off_request_thread(app):
+    queue = MemoryJobQueue(app, workers=1)
+    app.extensions["job_queue"] = queue
+    with app.app_context():
+        token = create_access_token(identity=4)
+
+    response = app.test_client().post(
+        "/posts", json={"title": "Hired!", "content": "Body", "category_id": 2},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    queue.stop(wait=True)
+
+    assert response.status_code == 201
+    with app.app_context():
+        # Student 4 wrote it and is the only Careers subscriber
+        assert recipients(response.json["post_id"]) == []
+        post = Post(title="Another", content="Body", category_id=2, student_id=1)
+        db.session.add(post)
+        db.session.commit()
+        fan_out_post(post.id)
+        assert recipients(post.id) == [4]
+
+
+def test_author_deletes_a_post_after_fan_out(app):
+    with app.app_context():
+        post = Post(title="Keep going", content="Body", category_id=1, student_id=1)
+        db.session.add(post)
+        db.session.commit()
+        fan_out_post(post.id)
+        token = create_access_token(identity=1)
+
+        db.session.execute(text("PRAGMA foreign_keys=ON"))  # As Postgres always enforces them
+        response = app.test_client().delete(f"/post/{post.id}", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert recipients() == []
+        db.session.execute(text("PRAGMA foreign_keys=OFF"))
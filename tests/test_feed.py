@@ -0,0 +1,225 @@
+import random
+import time
+import pytest
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import event, insert
+from feed import FeedIndex
+from models import db, Category, Comment, Content, Post, Share, Student, Subscription, UserPreference
+from views.feed import feed_bp
+from views.post import post_bp
+from views.subscription import subscription_bp
+
+NOW = datetime.utcnow()
+
+# p95 for one /feed request with pools warm and the student's profile cold
+FEED_LATENCY_BUDGET_MS = 50
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(feed_bp)
+    app.register_blueprint(post_bp)
+    app.register_blueprint(subscription_bp)
+    app.extensions["feed_index"] = FeedIndex(pool_size=50)
+    return app
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with two categories of posts and one approved content item."""
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Category(id=1, name="exams", admin_id=1),
+            Category(id=2, name="sleep", admin_id=1),
+            Category(id=3, name="sports", admin_id=1),
+            Student(id=1, email="reader@example.com", username="reader", password="x"),
+            Student(id=2, email="author@example.com", username="author", password="x"),
+            Subscription(student_id=1, category_id=1),
+            UserPreference(student_id=1, preference_type="content_type", preference_value="podcast"),
+            # Same age and engagement; only the category differs
+            Post(id=1, title="subscribed", content="c", category_id=1, student_id=2,
+                 created_at=NOW - timedelta(hours=1)),
+            Post(id=2, title="other", content="c", category_id=2, student_id=2,
+                 created_at=NOW - timedelta(hours=1)),
+            # Popular but a week old
+            Post(id=3, title="old", content="c", category_id=1, student_id=2, likes=20,
+                 created_at=NOW - timedelta(days=7)),
+            # Same age as post 2, but commented and shared
+            Post(id=4, title="engaging", content="c", category_id=2, student_id=2,
+                 created_at=NOW - timedelta(hours=1)),
+            # The reader's own post never shows up in their feed
+            Post(id=5, title="mine", content="c", category_id=1, student_id=1, created_at=NOW),
+            Content(id=1, title="podcast", description="d", status="approved", category_id=2,
+                    admin_id=1, content_type="podcast"),
+            Content(id=2, title="pending", description="d", status="pending", category_id=1,
+                    admin_id=1, content_type="video"),
+        ])
+        db.session.add_all([Comment(content="nice", student_id=1, post_id=4) for _ in range(3)])
+        db.session.add(Share(post_id=4, student_id=1, shared_with=2))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def auth(app, student_id=1):
+    with app.app_context():
+        token = create_access_token(identity=student_id)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def feed_ids(client, headers, **params):
+    response = client.get("/feed", query_string=params, headers=headers)
+    assert response.status_code == 200
+    return [(item["type"], item["id"]) for item in response.json]
+
+
+def position(ids, key):
+    return ids.index(key)
+
+
+def scores(client, headers):
+    return {(item["type"], item["id"]): item["score"] for item in client.get("/feed", headers=headers).json}
+
+
+def test_feed_ranks_by_subscription_engagement_and_recency(client, app):
+    ids = feed_ids(client, auth(app))
+
+    assert ("post", 5) not in ids
+    assert ("content", 2) not in ids
+    assert position(ids, ("post", 1)) < position(ids, ("post", 2))  # Subscription
+    assert position(ids, ("post", 4)) < position(ids, ("post", 2))  # Engagement
+    assert position(ids, ("post", 1)) < position(ids, ("post", 3))  # Recency beats old likes
+
+
+def test_content_type_preference_boosts_content(client, app):
+    # Only student 1 prefers podcasts
+    assert scores(client, auth(app))["content", 1] > scores(client, auth(app, 2))["content", 1]
+
+
+def test_new_posts_enter_loaded_pools_without_reload(client, app):
+    feed_ids(client, auth(app))  # Loads the pools
+
+    client.post("/posts", json={"title": "fresh", "content": "c", "category_id": 1}, headers=auth(app, 2))
+
+    assert feed_ids(client, auth(app))[0] == ("post", 6)
+
+
+def test_subscribing_refreshes_the_profile(client, app):
+    before = scores(client, auth(app))
+    client.post("/subscriptions", json={"category_id": 2}, headers=auth(app))
+
+    after = scores(client, auth(app))
+    assert after["post", 2] > before["post", 2]
+    assert after["post", 1] == before["post", 1]
+
+
+def test_warm_feed_issues_no_queries(client, app):
+    headers = auth(app)
+    feed_ids(client, headers)
+
+    statements = []
+    with app.app_context():
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            feed_ids(client, headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+    assert statements == []
+
+
+def test_profiles_are_bounded_and_expire(app):
+    clock = {"now": 0.0}
+    index = FeedIndex(profile_ttl=300, max_profiles=1, clock=lambda: clock["now"])
+    loads = []
+    index._load_profile = lambda student_id: loads.append(student_id) or ({}, {})
+
+    index.profile(1)
+    index.profile(1)
+    index.profile(2)  # Evicts student 1
+    index.profile(1)
+    assert loads == [1, 2, 1]
+
+    clock["now"] = 300
+    index.profile(1)
+    assert loads == [1, 2, 1, 1]
+
+
+def test_feed_pagination_and_admins(client, app):
+    first = feed_ids(client, auth(app), limit=2)
+    second = feed_ids(client, auth(app), limit=2, offset=2)
+
+    assert len(first) == 2 and not set(first) & set(second)
+
+    with app.app_context():
+        admin_token = create_access_token(identity={"id": 1, "role": "admin"})
+    assert client.get("/feed", headers={"Authorization": f"Bearer {admin_token}"}).status_code == 403
+
+
+def test_feed_latency_budget_at_100k_posts_and_10k_students():
+    n_posts, n_students, n_categories = 100_000, 10_000, 50
+    rng = random.Random(3)
+    app = make_app()
+    app.extensions["feed_index"] = FeedIndex()
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Category), [
+            {"id": c, "name": f"category {c}", "admin_id": 1} for c in range(1, n_categories + 1)
+        ])
+        db.session.execute(insert(Student), [
+            {"id": s, "email": f"s{s}@example.com", "username": f"s{s}", "password": "x"}
+            for s in range(1, n_students + 1)
+        ])
+        db.session.execute(insert(Subscription), [
+            {"student_id": s, "category_id": c}
+            for s in range(1, n_students + 1)
+            for c in rng.sample(range(1, n_categories + 1), 3)
+        ])
+        db.session.execute(insert(UserPreference), [
+            {"student_id": s, "preference_type": "category", "preference_value": f"category {rng.randint(1, n_categories)}"}
+            for s in range(1, n_students + 1, 2)
+        ])
+        db.session.execute(insert(Post), [
+            {"id": p, "title": f"post {p}", "content": "c", "category_id": rng.randint(1, n_categories),
+             "student_id": rng.randint(1, n_students), "likes": rng.randint(0, 50),
+             "created_at": NOW - timedelta(minutes=rng.randint(0, 60 * 24 * 90))}
+            for p in range(1, n_posts + 1)
+        ])
+        db.session.commit()
+
+    client = app.test_client()
+    # One request per category warms every pool, as steady traffic would
+    for s in range(1, n_categories * 2):
+        client.get("/feed", headers=auth(app, s))
+
+    timings = []
+    for s in rng.sample(range(n_categories * 2, n_students + 1), 200):
+        headers = auth(app, s)
+        start = time.perf_counter()
+        response = client.get("/feed", headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200 and len(response.json) == 20
+
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    assert p95 < FEED_LATENCY_BUDGET_MS, f"p95 {p95:.1f} ms over budget"
+
+    with app.app_context():
+        db.drop_all()
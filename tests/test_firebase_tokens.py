@@ -0,0 +1,165 @@
+import time
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from firebase_tokens import FirebaseTokenVerifier, InvalidIdToken, LocalKeySet, PublicKeyCache
+from models import db, Student
+from views.auth import auth_bp
+
+PROJECT = "test-project"
+
+
+@pytest.fixture(scope="module")
+def key_set():
+    return LocalKeySet()
+
+
+@pytest.fixture
+def verifier(key_set):
+    return FirebaseTokenVerifier(PROJECT, PublicKeyCache(key_set.fetch))
+
+
+@pytest.fixture
+def app(verifier):
+    """Create a Flask test app whose Firebase tokens are checked against the local key set."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(auth_bp)
+    app.extensions["auth_provider"] = verifier
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Student(id=1, email="ann@example.com", username="ann", password="x"))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+def test_verify_returns_claims_with_uid(verifier, key_set):
+    claims = verifier.verify(key_set.sign(PROJECT, "ann@example.com", uid="abc"))
+    assert claims["email"] == "ann@example.com"
+    assert claims["uid"] == "abc"
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "other-project"},
+    {"iss": "https://securetoken.google.com/other-project"},
+    {"exp": int(time.time()) - 10},
+    {"auth_time": int(time.time()) + 600},
+    {"sub": ""},
+])
+def test_verify_rejects_bad_claims(verifier, key_set, overrides):
+    with pytest.raises(InvalidIdToken):
+        verifier.verify(key_set.sign(PROJECT, "ann@example.com", **overrides))
+    assert len(verifier) == 0  # Failures are never cached
+
+
+def test_verify_rejects_tokens_from_unknown_keys(verifier, key_set):
+    forged = LocalKeySet(kid="attacker")
+    with pytest.raises(InvalidIdToken):
+        verifier.verify(forged.sign(PROJECT, "ann@example.com"))
+    with pytest.raises(InvalidIdToken):
+        verifier.verify("not-a-jwt")
+
+
+def test_verified_token_is_cached_until_exp(key_set):
+    now = [time.time()]
+    keys = PublicKeyCache(key_set.fetch)
+    lookups = []
+    get = keys.get
+    keys.get = lambda kid: lookups.append(kid) or get(kid)
+    verifier = FirebaseTokenVerifier(PROJECT, keys, clock=lambda: now[0])
+    token = key_set.sign(PROJECT, "ann@example.com", ttl=60)
+
+    first = verifier.verify(token)
+    assert verifier.verify(token) is first
+    assert len(lookups) == 1
+
+    now[0] += 61  # Past exp by our clock: checked again (and PyJWT, on the real clock, still accepts it)
+    verifier.verify(token)
+    assert len(lookups) == 2
+
+
+def test_cache_is_bounded(verifier, key_set):
+    verifier.max_entries = 3
+    for i in range(5):
+        verifier.verify(key_set.sign(PROJECT, f"s{i}@example.com", uid=f"u{i}"))
+    assert len(verifier) == 3
+
+
+def test_key_cache_refetches_on_expiry_and_rate_limits_unknown_kids(key_set):
+    now = [1000.0]
+    fetches = []
+
+    def fetch():
+        fetches.append(now[0])
+        return key_set.fetch()[0], 300
+
+    keys = PublicKeyCache(fetch, clock=lambda: now[0])
+    assert keys.get(key_set.kid) is not None
+    assert keys.get(key_set.kid) is not None
+    assert keys.get("unknown") is None  # Fetched just now, so no refetch
+    assert len(fetches) == 1
+
+    now[0] += 301
+    keys.get(key_set.kid)
+    assert len(fetches) == 2
+
+
+def test_key_cache_prewarms_in_background(key_set):
+    keys = PublicKeyCache(key_set.fetch)
+    fetches = key_set.fetches
+    keys.start()
+    deadline = time.monotonic() + 5
+    while key_set.fetches == fetches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    keys.stop()
+    assert keys.seconds_until_expiry() > 0
+
+
+def test_profile_uses_cached_verification(app, key_set):
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {key_set.sign(PROJECT, 'ann@example.com')}"}
+
+    response = client.get("/profile", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["data"]["username"] == "ann"
+    assert len(app.extensions["auth_provider"]) == 1
+
+    assert client.get("/profile", headers={"Authorization": "Bearer garbage"}).status_code == 401
+
+
+def test_google_login_rejects_invalid_token(app):
+    response = app.test_client().post("/google_login", json={"idToken": "garbage"})
+    assert response.status_code == 401
+
+
+def test_google_login_is_unavailable_when_keys_cannot_be_fetched(app, key_set):
+    def unreachable():
+        raise ConnectionError("googleapis.com unreachable")
+
+    app.extensions["auth_provider"] = FirebaseTokenVerifier(PROJECT, PublicKeyCache(unreachable))
+    response = app.test_client().post("/google_login", json={"idToken": key_set.sign(PROJECT, "ann@example.com")})
+    assert response.status_code == 503
+
+
+def test_cached_verification_costs_microseconds(verifier, key_set):
+    token = key_set.sign(PROJECT, "ann@example.com")
+    start = time.perf_counter()
+    verifier.verify(token)
+    first = time.perf_counter() - start
+
+    runs = 10000
+    start = time.perf_counter()
+    for _ in range(runs):
+        verifier.verify(token)
+    cached = (time.perf_counter() - start) / runs
+
+    print(f"\nfirst verification {first * 1e6:.0f} us, cached {cached * 1e6:.2f} us")
+    assert cached < 20e-6
+    assert cached * 10 < first
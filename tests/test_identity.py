@@ -0,0 +1,174 @@
+import pytest
+from flask import Flask, g
+from flask_jwt_extended import JWTManager, create_access_token, verify_jwt_in_request
+from sqlalchemy import event
+from cache import MemoryCache
+from identity import Principal, get_current_user, get_student_id
+from models import db, Admin, Category, Content, Post, Student
+from views.admin import admin_bp
+from views.category import category_bp
+from views.content import content_bp
+from views.post import post_bp
+from views.profile import profile_bp
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def app(clock):
+    """Create a Flask test app with a cross-request user cache."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(category_bp)
+    app.register_blueprint(content_bp)
+    app.register_blueprint(post_bp)
+    app.register_blueprint(profile_bp, url_prefix="/profile")
+    app.extensions["user_cache"] = MemoryCache(max_entries=100, default_ttl=30, clock=clock)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Admin(id=1, email="admin@example.com", username="admin", password="x"))
+        db.session.add(Category(id=1, name="Motivation", admin_id=1))
+        db.session.add(Student(id=2, email="ann@example.com", username="ann", password="x"))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def auth(identity):
+    return {"Authorization": f"Bearer {create_access_token(identity=identity)}"}
+
+
+@pytest.fixture
+def user_lookups(app):
+    """SELECTs against the students and admins tables."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT") and ("FROM students" in statement
+                                                                 or "FROM admins" in statement):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_add_post_reuses_cached_principal(client, user_lookups):
+    headers = auth({"id": 2, "role": "student"})
+    body = {"title": "Keep going", "content": "Body", "category_id": 1}
+
+    assert client.post("/posts", json=body, headers=headers).status_code == 201
+    assert len(user_lookups) == 1
+    assert client.post("/posts", json=body, headers=headers).status_code == 201
+    assert len(user_lookups) == 1  # Served from the user cache
+    assert [p.student_id for p in Post.query] == [2, 2]
+
+
+def test_add_post_rejects_admins_and_missing_students(client):
+    body = {"title": "t", "content": "c", "category_id": 1}
+    assert client.post("/posts", json=body, headers=auth({"id": 1, "role": "admin"})).status_code == 403
+    assert client.post("/posts", json=body, headers=auth(99)).status_code == 403
+
+
+def test_admin_adds_content_as_themselves(client):
+    body = {"title": "Grit", "category_id": 1, "content_type": "note", "description": "Keep at it"}
+
+    response = client.post("/content", json=body, headers=auth({"id": 1, "role": "admin"}))
+    assert response.status_code == 201
+    content = db.session.get(Content, response.json["content_id"])
+    assert content.admin_id == 1 and content.status == "pending"
+
+    assert client.post("/content", json=body, headers=auth({"id": 2, "role": "student"})).status_code == 403
+    assert client.post("/content", json=body, headers=auth(2)).status_code == 403
+
+
+def test_profile_reads_without_loading_the_model(client, user_lookups):
+    headers = auth({"id": 1, "role": "admin"})
+    response = client.get("/profile/profile", headers=headers)
+    assert response.json["data"] == {"id": 1, "username": "admin", "email": "admin@example.com",
+                                     "role": "admin", "profile_pic": "default.png"}
+    client.get("/profile/profile", headers=headers)
+    assert len(user_lookups) == 1
+
+
+def test_profile_update_skips_the_select_and_refreshes_the_cache(client, user_lookups):
+    headers = auth({"id": 2, "role": "student"})
+    client.get("/profile/profile", headers=headers)
+
+    response = client.put("/profile/profile", json={"username": "annie"}, headers=headers)
+    assert response.status_code == 200
+    assert len(user_lookups) == 1  # The UPDATE goes by id; no SELECT before it
+
+    assert client.get("/profile/profile", headers=headers).json["data"]["username"] == "annie"
+    assert db.session.get(Student, 2).username == "annie"
+
+
+def test_admin_changes_invalidate_the_cache(client):
+    student = auth({"id": 2, "role": "student"})
+    assert client.get("/profile/profile", headers=student).status_code == 200
+    response = client.patch("/users/2/deactivate", headers=auth({"id": 1, "role": "admin"}))
+    assert response.status_code == 200
+    with client.application.test_request_context(headers=student):
+        verify_jwt_in_request()
+        assert get_current_user().is_active is False
+
+
+def test_loaded_once_per_request_without_a_cache(app, user_lookups):
+    app.extensions["user_cache"] = None
+    with app.test_request_context(headers=auth(2)):
+        verify_jwt_in_request()
+        first = get_current_user()
+        assert get_current_user() is first and g.current_user[1] is first
+        assert first.is_student and first.id == get_student_id() == 2
+    assert len(user_lookups) == 1
+
+
+def test_cache_entries_expire(app, clock, client, user_lookups):
+    headers = auth({"id": 2, "role": "student"})
+    client.get("/profile/profile", headers=headers)
+    clock.now += 31
+    client.get("/profile/profile", headers=headers)
+    assert len(user_lookups) == 2
+
+
+def test_category_writes_accept_either_identity_format(client):
+    student = auth(2)  # Bare-id token, as students are issued
+    assert client.post("/categories", json={"name": "Study"}, headers=student).status_code == 403
+    assert client.put("/categories/1", json={"name": "Study"}, headers=student).status_code == 403
+
+    admin = auth({"id": 1, "role": "admin"})
+    response = client.post("/categories", json={"name": "Study"}, headers=admin)
+    assert response.status_code == 201
+    assert client.put(f"/categories/{response.json['category_id']}", json={"name": "Focus"},
+                      headers=admin).status_code == 200
+
+
+def test_principal_is_slotted():
+    principal = Principal(1, "admin", "a@example.com", "a", None, True)
+    assert principal.is_admin and not principal.is_student
+    with pytest.raises(AttributeError):
+        principal.password = "x"
@@ -0,0 +1,59 @@
+import os
+import pytest
+from flask import Flask
+from flask_migrate import Migrate, upgrade
+from sqlalchemy import text
+from models import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+# The filters the views actually issue, one per hot index.
+HOT_QUERIES = {
+    "posts feed": "SELECT id FROM posts ORDER BY created_at DESC, id DESC LIMIT 20",
+    "posts by category": "SELECT id FROM posts WHERE category_id = 1 ORDER BY created_at DESC LIMIT 20",
+    "posts by student": "SELECT id FROM posts WHERE student_id = 1 ORDER BY created_at DESC LIMIT 20",
+    "top-level comments": "SELECT id FROM comments WHERE post_id = 1 AND parent_id IS NULL",
+    "comment replies": "SELECT id FROM comments WHERE parent_id = 1",
+    "unread notifications": "SELECT id FROM notifications WHERE student_id = 1 AND is_read = 0",
+    "notification inbox": "SELECT id FROM notifications WHERE student_id = 1 ORDER BY created_at DESC",
+    "unread inbox": "SELECT id FROM notifications WHERE student_id = 1 AND is_read = 0 ORDER BY created_at DESC",
+    "unread count": "SELECT count(id) FROM notifications WHERE student_id = 1 AND is_read = 0",
+    "wishlist": "SELECT id FROM wishlist WHERE student_id = 1",
+    "subscriptions by student": "SELECT id FROM subscriptions WHERE student_id = 1",
+    "subscribers of category": "SELECT student_id FROM subscriptions WHERE category_id = 1",
+    "shares received": "SELECT id FROM shares WHERE shared_with = 1",
+    "comments in window": "SELECT post_id FROM comments WHERE created_at >= '2026-01-01'",
+    "shares in window": "SELECT post_id FROM shares WHERE created_at >= '2026-01-01'",
+    "likes in window": "SELECT post_id FROM post_reactions WHERE created_at >= '2026-01-01'",
+    "wishlist adds in window": "SELECT post_id FROM wishlist WHERE created_at >= '2026-01-01'",
+    "posts in window": "SELECT student_id FROM posts WHERE created_at >= '2026-01-01'",
+    "due jobs": "SELECT id FROM jobs WHERE status IN ('queued', 'running') AND run_at <= '2026-01-01' ORDER BY run_at, id LIMIT 1",
+    "leaderboard read": "SELECT subject_id FROM leaderboard_entries WHERE board = 'trending' AND period = '24h' ORDER BY rank LIMIT 10",
+}
+
+
+@pytest.fixture
+def migrated_app(tmp_path):
+    """Create an app whose SQLite schema is built by running the Alembic migrations."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'indexes.db'}"
+    app.config["TESTING"] = True
+
+    db.init_app(app)
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+        yield app
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(migrated_app, name):
+    """Every hot query should be answered from an index, not a full table scan."""
+    plan = db.session.execute(text(f"EXPLAIN QUERY PLAN {HOT_QUERIES[name]}")).fetchall()
+    details = [row[-1] for row in plan]
+
+    assert any("INDEX" in detail for detail in details), f"{name}: {details}"
+    assert not any(
+        detail.startswith("SCAN") and "INDEX" not in detail for detail in details
+    ), f"{name}: {details}"
@@ -0,0 +1,187 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+import jobs
+from jobs import DatabaseJobQueue, MemoryJobQueue, enqueue, job, job_name
+from models import db, Category, Job, Student
+from views.post import post_bp
+
+calls = []
+failures_left = {}
+
+
+@job
+def record(value):
+    calls.append(value)
+
+
+@job
+def flaky(key):
+    """Fails until failures_left[key] reaches zero."""
+    if failures_left.get(key, 0) > 0:
+        failures_left[key] -= 1
+        raise RuntimeError(f"{key} not yet")
+    calls.append(key)
+
+
+@job
+def slow_fan_out(post_id):
+    time.sleep(0.5)
+
+
+@pytest.fixture(autouse=True)
+def reset_state(monkeypatch):
+    calls.clear()
+    failures_left.clear()
+    monkeypatch.setattr(jobs, "backoff_delay", lambda attempt, base=2.0, cap=600.0: 0.01)
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Create a Flask test app on a file database so worker threads share it."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'jobs.db'}"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(post_bp)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Student(id=1, email="s1@example.com", username="s1", password="x"))
+        db.session.add(Category(id=1, name="Motivation", admin_id=1))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_enqueue_without_queue_runs_inline(app):
+    with app.app_context():
+        enqueue(record, 1)
+    assert calls == [1]
+
+
+def test_enqueue_rejects_unregistered_functions(app):
+    with app.app_context(), pytest.raises(ValueError):
+        enqueue(print, "hi")
+
+
+def test_memory_queue_retries_then_succeeds(app):
+    queue = MemoryJobQueue(app, workers=2, max_attempts=3)
+    app.extensions["job_queue"] = queue
+    failures_left["a"] = 2
+
+    with app.app_context():
+        enqueue(flaky, "a")
+    assert wait_for(lambda: calls == ["a"])
+    queue.stop()
+
+
+def test_memory_queue_dead_letters_after_max_attempts(app):
+    queue = MemoryJobQueue(app, workers=1, max_attempts=2)
+    app.extensions["job_queue"] = queue
+    failures_left["b"] = 5
+
+    with app.app_context():
+        enqueue(flaky, "b")
+    assert wait_for(lambda: len(queue.dead_letters) == 1)
+    assert queue.dead_letters[0][:2] == (job_name(flaky), ("b",))
+    assert failures_left["b"] == 3
+    queue.stop()
+
+
+def test_database_queue_runs_and_deletes_jobs(app):
+    queue = DatabaseJobQueue(app, workers=2, poll_interval=0.05)
+    app.extensions["job_queue"] = queue
+    with app.app_context():
+        for i in range(10):
+            enqueue(record, i)
+        assert Job.query.count() == 10
+
+    queue.start()
+    assert wait_for(lambda: sorted(calls) == list(range(10)))
+    queue.stop()
+    with app.app_context():
+        assert Job.query.count() == 0
+
+
+def test_database_queue_retries_with_backoff_and_dead_letters(app):
+    queue = DatabaseJobQueue(app, max_attempts=3)
+    app.extensions["job_queue"] = queue
+    failures_left["c"] = 10
+    with app.app_context():
+        job_id = enqueue(flaky, "c")
+
+    assert queue.run_once()
+    with app.app_context():
+        row = db.session.get(Job, job_id)
+        assert (row.status, row.attempts) == ("queued", 1)
+        assert row.run_at > datetime.utcnow() - timedelta(seconds=1)
+        assert "c not yet" in row.last_error
+
+    for _ in range(2):
+        assert wait_for(queue.run_once)
+    with app.app_context():
+        row = db.session.get(Job, job_id)
+        assert (row.status, row.attempts) == ("dead", 3)
+    assert not queue.run_once()  # Dead jobs are never claimed again
+
+
+def test_database_queue_reclaims_expired_leases(app):
+    queue = DatabaseJobQueue(app, lease=300)
+    with app.app_context():
+        db.session.add(Job(name=job_name(record), args="[7]", status="running", attempts=1,
+                           max_attempts=5, run_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.add(Job(name=job_name(record), args="[8]", status="running", attempts=1,
+                           max_attempts=5, run_at=datetime.utcnow() + timedelta(seconds=300)))
+        db.session.commit()
+
+    assert queue.run_once()
+    assert not queue.run_once()
+    assert calls == [7]
+
+
+def test_concurrent_workers_run_each_job_once(app):
+    queues = [DatabaseJobQueue(app, workers=4, poll_interval=0.01) for _ in range(2)]
+    app.extensions["job_queue"] = queues[0]
+    with app.app_context():
+        for i in range(50):
+            enqueue(record, i)
+
+    for queue in queues:
+        queue.start()
+    assert wait_for(lambda: len(calls) >= 50)
+    for queue in queues:
+        queue.stop()
+    assert sorted(calls) == list(range(50))
+
+
+def test_add_post_returns_before_slow_fan_out(app, monkeypatch):
+    import views.post
+    monkeypatch.setattr(views.post, "fan_out_post", slow_fan_out)
+    queue = MemoryJobQueue(app, workers=1)
+    app.extensions["job_queue"] = queue
+    with app.app_context():
+        token = create_access_token(identity=1)
+
+    start = time.perf_counter()
+    response = app.test_client().post("/posts", json={"title": "t", "content": "c", "category_id": 1},
+                                      headers={"Authorization": f"Bearer {token}"})
+    elapsed = time.perf_counter() - start
+    queue.stop()
+
+    assert response.status_code == 201
+    assert elapsed < 0.25
@@ -0,0 +1,106 @@
+import pytest
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import event
+from leaderboard import refresh_leaderboards
+from models import db, Comment, LeaderboardEntry, Post, PostReaction, Share, Student, Wishlist
+from views.leaderboard import leaderboard_bp
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with activity spread over the last week."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+
+    db.init_app(app)
+    app.register_blueprint(leaderboard_bp)
+
+    minutes = lambda n: NOW - timedelta(minutes=n)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Student(id=i, email=f"s{i}@example.com", username=f"s{i}", password="x")
+                            for i in range(1, 6)])
+        db.session.add_all([
+            Post(id=1, title="hot now", content="c", category_id=1, student_id=1, created_at=minutes(30)),
+            Post(id=2, title="hot yesterday", content="c", category_id=1, student_id=2, created_at=minutes(600)),
+            Post(id=3, title="flagged", content="c", category_id=1, student_id=3, is_flagged=True,
+                 created_at=minutes(10)),
+            Post(id=4, title="last week", content="c", category_id=1, student_id=2,
+                 created_at=NOW - timedelta(days=5)),
+        ])
+        # Post 1: two likes and a comment in the last hour
+        db.session.add_all([
+            PostReaction(post_id=1, student_id=4, reaction="like", created_at=minutes(20)),
+            PostReaction(post_id=1, student_id=5, reaction="like", created_at=minutes(5)),
+            Comment(content="!", student_id=4, post_id=1, created_at=minutes(15)),
+        ])
+        # Post 2: lots of activity ten hours ago
+        db.session.add_all([Share(post_id=2, student_id=s, shared_with=1, created_at=minutes(590)) for s in (3, 4, 5)])
+        db.session.add(Wishlist(post_id=2, student_id=4, created_at=minutes(580)))
+        # Post 3 is flagged; its shares never count
+        db.session.add_all([Share(post_id=3, student_id=s, shared_with=1, created_at=minutes(5)) for s in (1, 2, 4, 5)])
+        # Post 4: shared heavily five days ago
+        db.session.add_all([Share(post_id=4, student_id=s, shared_with=2, created_at=NOW - timedelta(days=5))
+                            for s in (1, 3, 4, 5)])
+        db.session.commit()
+        refresh_leaderboards(now=NOW)
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def board(client, name, window):
+    response = client.get(f"/leaderboards/{name}?window={window}")
+    assert response.status_code == 200
+    return response
+
+
+def test_trending_depends_on_window(client):
+    assert [p["post_id"] for p in board(client, "trending", "1h").json] == [1]
+    assert [p["post_id"] for p in board(client, "trending", "24h").json] == [2, 1]
+    assert [(p["post_id"], p["score"]) for p in board(client, "trending", "7d").json] == [(4, 12), (2, 11), (1, 4)]
+
+
+def test_most_shared_skips_flagged_posts(client):
+    assert board(client, "most-shared", "1h").json == []
+    assert [(p["post_id"], p["score"]) for p in board(client, "most-shared", "7d").json] == [(4, 4), (2, 3)]
+
+
+def test_top_contributors(client):
+    # s2 wrote two posts this week; s1 wrote one that got two likes
+    top = board(client, "contributors", "7d").json
+    assert [(c["username"], c["score"]) for c in top[:2]] == [("s2", 6), ("s1", 5)]
+
+
+def test_read_is_one_bounded_query(client, app):
+    statements = []
+    with app.app_context():
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            response = board(client, "trending", "7d")
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 1 and "LIMIT" in statements[0]
+    assert response.headers["Last-Modified"]
+
+
+def test_refresh_replaces_previous_results(app):
+    with app.app_context():
+        refresh_leaderboards(now=NOW + timedelta(days=30))
+        assert LeaderboardEntry.query.count() == 0
+
+
+def test_unknown_board_and_window(client):
+    assert client.get("/leaderboards/popular").status_code == 404
+    assert client.get("/leaderboards/trending?window=30d").status_code == 400
@@ -0,0 +1,199 @@
+import socketserver
+import threading
+import time
+import pytest
+from email import message_from_bytes
+from flask import Flask
+from mailer import BatchMailer, BatchTemplate, RateLimiter, send_batch
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Just enough of RFC 5321 (plus AUTH PLAIN) for smtplib, in the spirit of aiosmtpd's Debugging handler."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 stub ESMTP")
+        on_connection = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-stub")
+                self.reply("250 AUTH PLAIN")
+            elif verb == "HELO":
+                self.reply("250 stub")
+            elif verb == "AUTH":
+                with server.lock:
+                    server.logins += 1
+                self.reply("235 Authentication successful")
+            elif verb == "MAIL":
+                if server.drop_after and on_connection >= server.drop_after:
+                    return  # Hang up like a server enforcing a per-session limit
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                if "refused@" in command:
+                    self.reply("550 No such user")
+                else:
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data += chunk
+                with server.lock:
+                    server.messages.append(message_from_bytes(data))
+                on_connection += 1
+                self.reply("250 Queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, drop_after=0):
+        super().__init__(("127.0.0.1", 0), SMTPStubHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self.drop_after = drop_after
+
+
+@pytest.fixture
+def smtp_server():
+    server = SMTPStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def mailer_for(server, **options):
+    return BatchMailer("127.0.0.1", server.server_address[1], "noreply@example.com",
+                       username="user", password="secret", **options)
+
+
+def recipients(n):
+    return [{"email": f"s{i}@example.com", "username": f"student{i}"} for i in range(n)]
+
+
+def test_batch_template_substitutes_batch_context_once_and_recipient_fields_per_message():
+    template = BatchTemplate("$category digest for $username", "Hi $username, $count new posts in $category.",
+                             {"category": "Motivation", "count": 3})
+    assert template.render({"username": "ann"}) == (
+        "Motivation digest for ann", "Hi ann, 3 new posts in Motivation."
+    )
+    assert "$username" in template.body.template  # Only per-recipient placeholders remain
+
+
+def test_batch_context_values_and_escapes_are_not_expanded_per_recipient():
+    template = BatchTemplate("$title", "Costs $$5, $$username stays. $title", {"title": "Win $5, $username and $$"})
+    assert template.render({"username": "bob"}) == (
+        "Win $5, $username and $$", "Costs $5, $username stays. Win $5, $username and $$"
+    )
+
+
+def test_batch_reuses_one_authenticated_connection(smtp_server):
+    template = BatchTemplate("Hello $username", "Body for $username")
+    with mailer_for(smtp_server) as mailer:
+        assert mailer.send_batch(template, recipients(50)) == 50
+
+    assert smtp_server.connections == 1
+    assert smtp_server.logins == 1
+    assert len(smtp_server.messages) == 50
+    assert smtp_server.messages[7]["To"] == "s7@example.com"
+    assert smtp_server.messages[7]["Subject"] == "Hello student7"
+
+
+def test_connection_is_recycled_after_max_per_connection(smtp_server):
+    with mailer_for(smtp_server, max_per_connection=10) as mailer:
+        mailer.send_batch(BatchTemplate("s", "b"), recipients(25))
+    assert smtp_server.connections == 3
+    assert len(smtp_server.messages) == 25
+
+
+def test_reconnects_when_server_drops_the_session(smtp_server):
+    smtp_server.drop_after = 4
+    with mailer_for(smtp_server) as mailer:
+        assert mailer.send_batch(BatchTemplate("s", "b"), recipients(10)) == 10
+    assert smtp_server.connections == 3
+    assert len(smtp_server.messages) == 10
+
+
+def test_refused_recipient_is_reported_without_aborting_batch(smtp_server):
+    batch = recipients(3)
+    batch[1]["email"] = "refused@example.com"
+    with mailer_for(smtp_server) as mailer:
+        assert mailer.send_batch(BatchTemplate("s", "b"), batch) == 2
+    assert [email for email, _ in mailer.failed] == ["refused@example.com"]
+    assert len(smtp_server.messages) == 2
+    assert smtp_server.connections == 1
+
+
+def test_rate_limiter_spaces_out_sends_after_burst():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(10, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(5):
+        limiter.acquire()
+    assert slept == pytest.approx([0.1, 0.1, 0.1])
+    assert now[0] == pytest.approx(0.3)
+
+
+def test_send_batch_job_uses_app_mail_config(smtp_server):
+    app = Flask(__name__)
+    app.config.update(MAIL_SERVER="127.0.0.1", MAIL_PORT=smtp_server.server_address[1],
+                      MAIL_DEFAULT_SENDER="noreply@example.com")
+    with app.app_context():
+        assert send_batch("Digest", "Hi $username, see $link", recipients(5), {"link": "https://x"}) == 5
+    assert smtp_server.connections == 1
+    assert smtp_server.messages[2].get_payload().strip() == "Hi student2, see https://x"
+
+
+def send_one_connection_per_message(server, batch):
+    """What Flask-Mail does for each Message: connect, authenticate, send, quit."""
+    for recipient in batch:
+        with mailer_for(server) as mailer:
+            mailer.send(recipient["email"], "s", "b")
+
+
+def test_batch_throughput_beats_connection_per_message(smtp_server):
+    batch = recipients(300)
+
+    start = time.perf_counter()
+    send_one_connection_per_message(smtp_server, batch[:30])
+    naive_rate = 30 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with mailer_for(smtp_server, max_per_connection=1000) as mailer:
+        mailer.send_batch(BatchTemplate("s", "b"), batch)
+    batch_rate = len(batch) / (time.perf_counter() - start)
+
+    print(f"\nconnection per message: {naive_rate:.0f} msg/s, batched: {batch_rate:.0f} msg/s")
+    assert smtp_server.connections == 30 + 1
+    # Loopback without TLS understates the gap; against Gmail the handshake is ~200 ms
+    assert batch_rate > naive_rate
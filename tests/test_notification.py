@@ -0,0 +1,123 @@
+import pytest
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from models import db, Notification
+from views.notification import notification_bp
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with 25 notifications for student 1, oldest first."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(notification_bp)
+
+    with app.app_context():
+        db.create_all()
+        start = datetime(2026, 1, 1)
+        for i in range(25):
+            db.session.add(Notification(
+                id=i + 1, student_id=1, message=f"n{i + 1}",
+                is_read=i % 5 == 0, created_at=start + timedelta(minutes=i)
+            ))
+        db.session.add(Notification(student_id=2, message="someone else", created_at=start))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(app):
+    with app.app_context():
+        token = create_access_token(identity={"id": 1, "role": "student"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def unread(client, headers):
+    return client.get("/notifications/unread-count", headers=headers).json["unread"]
+
+
+def test_inbox_is_paginated_newest_first(client, headers):
+    first = client.get("/notifications/1?limit=10", headers=headers)
+
+    assert first.status_code == 200
+    assert [n["id"] for n in first.json] == list(range(25, 15, -1))
+
+    ids = [n["id"] for n in first.json]
+    cursor = first.headers["X-Next-Cursor"]
+    while cursor:
+        page = client.get(f"/notifications/1?limit=10&cursor={cursor}", headers=headers)
+        ids.extend(n["id"] for n in page.json)
+        cursor = page.headers.get("X-Next-Cursor")
+    assert ids == list(range(25, 0, -1))
+
+
+def test_unread_first_inbox(client, headers):
+    ids, cursor = [], None
+    while True:
+        url = "/notifications/1?limit=7&unread_first=true" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url, headers=headers)
+        ids.extend(n["id"] for n in page.json)
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    # n1, n6, n11, n16 and n21 are read
+    read = [21, 16, 11, 6, 1]
+    assert ids == [i for i in range(25, 0, -1) if i not in read] + read
+
+
+def test_inbox_is_only_for_its_owner(client, headers):
+    assert client.get("/notifications/2", headers=headers).status_code == 403
+
+
+def test_unread_only_filter(client, headers):
+    response = client.get("/notifications/1?unread_only=true&limit=100", headers=headers)
+
+    assert len(response.json) == 20
+    assert not any(n["is_read"] for n in response.json)
+
+
+def test_unread_count(client, headers):
+    assert unread(client, headers) == 20
+
+
+def test_bulk_mark_read_by_ids(client, headers):
+    response = client.put("/notifications/read", json={"ids": [2, 3, 26]}, headers=headers)
+
+    assert response.json["updated"] == 2  # 26 belongs to student 2
+    assert unread(client, headers) == 18
+
+
+def test_bulk_mark_read_before_cursor(client, headers):
+    page = client.get("/notifications/1?limit=10", headers=headers)
+
+    response = client.put("/notifications/read", json={"before": page.headers["X-Next-Cursor"]}, headers=headers)
+
+    # The cursor points at n16; n1-n16 hold 12 unread, n17-n25 still have 8
+    assert response.json["updated"] == 12
+    assert unread(client, headers) == 8
+
+
+def test_clear_all(client, headers):
+    response = client.put("/notifications/read", json={"all": True}, headers=headers)
+
+    assert response.json["updated"] == 20
+    assert unread(client, headers) == 0
+
+
+def test_bulk_mark_read_requires_a_selector(client, headers):
+    response = client.put("/notifications/read", json={}, headers=headers)
+    assert response.status_code == 400
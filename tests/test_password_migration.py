@@ -0,0 +1,102 @@
+import json
+import pytest
+from flask import Flask
+from models import db, Admin, Student
+from passwords import HashPool, PasswordHasher
+from password_migration import Checkpoint, hash_plaintext_passwords
+
+HASHER = PasswordHasher(pbkdf2_iterations=1000)  # Keep the suite quick
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with a mix of plain-text and hashed passwords."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Student(id=i, email=f"s{i}@example.com", username=f"s{i}", password=f"plain{i}")
+            for i in range(1, 24)
+        ])
+        db.session.add(Student(id=30, email="g@example.com", username="g", password="google-auth"))
+        db.session.add(Student(id=31, email="h@example.com", username="h", password=HASHER.hash("kept")))
+        db.session.add(Admin(id=1, email="a@example.com", username="a", password="adminpw"))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with HashPool(HASHER, workers=2) as pool:
+        yield pool
+
+
+def passwords():
+    return dict(db.session.query(Student.id, Student.password))
+
+
+def test_hash_many_keeps_order(pool):
+    hashes = pool.hash_many(["a", "b", "c"])
+    assert [HASHER.verify(h, p) for h, p in zip(hashes, "abc")] == [True] * 3
+    assert not HASHER.verify(hashes[0], "b")
+
+
+def test_hashes_plain_passwords_in_chunks(app, pool, tmp_path):
+    kept = passwords()[31]
+    seen = []
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+
+    done = hash_plaintext_passwords(Student, pool, checkpoint, chunk_size=10,
+                                    progress=lambda state: seen.append((state.done, state.pending, state.last_id)))
+    assert done == 23
+    assert seen == [(10, 23, 10), (20, 23, 20), (23, 23, 23)]
+    assert json.loads((tmp_path / "checkpoint.json").read_text()) == {"students": 23}
+
+    stored = passwords()
+    assert all(HASHER.verify(stored[i], f"plain{i}") for i in range(1, 24))
+    assert stored[30] == "google-auth"  # Placeholder must never become a real password
+    assert stored[31] == kept
+    assert hash_plaintext_passwords(Admin, pool) == 1
+    assert HASHER.verify(db.session.get(Admin, 1).password, "adminpw")
+
+
+def test_resumes_after_checkpoint(app, pool, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    Checkpoint(path).save("students", 20)  # An earlier run finished ids up to 20
+
+    assert hash_plaintext_passwords(Student, pool, Checkpoint(path), chunk_size=10) == 3
+    stored = passwords()
+    assert stored[20] == "plain20"
+    assert HASHER.verify(stored[21], "plain21")
+
+
+def test_rerun_finds_nothing_left(app, pool):
+    hash_plaintext_passwords(Student, pool, chunk_size=10)
+    before = passwords()
+    assert hash_plaintext_passwords(Student, pool, chunk_size=10) == 0
+    assert passwords() == before
+
+
+def test_dry_run_changes_nothing(app, pool, tmp_path):
+    path = tmp_path / "checkpoint.json"
+    before = passwords()
+    assert hash_plaintext_passwords(Student, pool, Checkpoint(str(path)), chunk_size=10, dry_run=True) == 23
+    assert passwords() == before
+    assert not path.exists()
+
+
+def test_password_changed_meanwhile_is_not_overwritten(app, pool, monkeypatch):
+    def change_then_hash(passwords):
+        Student.query.filter_by(id=2).update({"password": "changed"}, synchronize_session=False)
+        return HashPool.hash_many(pool, passwords)
+
+    monkeypatch.setattr(pool, "hash_many", change_then_hash)
+    hash_plaintext_passwords(Student, pool, chunk_size=5)
+    stored = passwords()
+    assert HASHER.verify(stored[1], "plain1")
+    assert stored[2] == "changed"
@@ -0,0 +1,153 @@
+import threading
+import time
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from werkzeug.security import generate_password_hash
+from models import db, Student
+from passwords import PasswordHasher, check_password, hash_password
+from views.auth import auth_bp
+from views.student import student_bp
+
+FAST = dict(pbkdf2_iterations=1000, scrypt_n=2 ** 10)  # Keep the suite quick
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with a cheap hasher configured."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(student_bp)
+    app.extensions["password_hasher"] = PasswordHasher(**FAST)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.mark.parametrize("scheme", ["pbkdf2", "scrypt"])
+def test_hash_and_verify(scheme):
+    hasher = PasswordHasher(scheme, **FAST)
+    stored = hasher.hash("s3cret")
+    assert stored.startswith(hasher.method + "$")
+    assert hasher.verify(stored, "s3cret")
+    assert not hasher.verify(stored, "wrong")
+    assert not hasher.needs_rehash(stored)
+
+
+def test_argon2_when_installed():
+    pytest.importorskip("argon2")
+    hasher = PasswordHasher("argon2", argon2_time_cost=1, argon2_memory_kib=1024, argon2_parallelism=1)
+    stored = hasher.hash("s3cret")
+    assert stored.startswith("$argon2")
+    assert hasher.verify(stored, "s3cret") and not hasher.verify(stored, "wrong")
+    assert PasswordHasher(**FAST).needs_rehash(stored)
+
+
+def test_unknown_or_unavailable_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        PasswordHasher("md5")
+
+
+def test_existing_werkzeug_hashes_still_verify():
+    stored = generate_password_hash("legacy")  # What signup stored before
+    hasher = PasswordHasher(**FAST)
+    assert hasher.verify(stored, "legacy")
+    assert hasher.needs_rehash(stored)  # Different iteration count
+    assert not PasswordHasher().needs_rehash(stored)
+
+
+def test_placeholder_passwords_never_verify():
+    hasher = PasswordHasher(**FAST)
+    assert not hasher.verify("google-auth", "google-auth")
+    assert not hasher.verify("", "")
+
+
+def test_login_rehashes_outdated_hash(app):
+    old = PasswordHasher(pbkdf2_iterations=500).hash("s3cret")
+    db.session.add(Student(id=1, email="ann@example.com", username="ann", password=old))
+    db.session.commit()
+
+    client = app.test_client()
+    response = client.post("/login", json={"email": "ann@example.com", "password": "s3cret", "role": "student"})
+    assert response.status_code == 200
+    upgraded = db.session.get(Student, 1).password
+    assert upgraded != old and upgraded.startswith("pbkdf2:sha256:1000$")
+
+    response = client.post("/login", json={"email": "ann@example.com", "password": "s3cret", "role": "student"})
+    assert response.status_code == 200
+    assert db.session.get(Student, 1).password == upgraded  # Current hashes are left alone
+
+
+def test_failed_login_does_not_rehash(app):
+    old = PasswordHasher(pbkdf2_iterations=500).hash("s3cret")
+    student = Student(id=1, email="ann@example.com", username="ann", password=old)
+    db.session.add(student)
+    db.session.commit()
+    assert not check_password(student, "wrong")
+    assert db.session.get(Student, 1).password == old
+
+
+def test_create_student_uses_configured_hasher(app):
+    response = app.test_client().post("/students", json={"email": "bo@example.com", "username": "bo",
+                                                          "password": "pw"})
+    assert response.status_code == 201
+    assert Student.query.one().password.startswith("pbkdf2:sha256:1000$")
+
+
+def test_hash_password_without_app_uses_defaults():
+    assert hash_password("x").startswith("pbkdf2:sha256:600000$")
+
+
+def test_concurrent_hashes_are_capped(monkeypatch):
+    import passwords
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_hash(password, method):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return f"{method}$salt$hash"
+
+    monkeypatch.setattr(passwords, "generate_password_hash", slow_hash)
+    hasher = PasswordHasher(max_concurrent=2)
+    threads = [threading.Thread(target=hasher.hash, args=("x",)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+
+
+def test_hashing_releases_the_gil():
+    """Another thread keeps running while a slow hash is computed."""
+    hasher = PasswordHasher(pbkdf2_iterations=300000)
+    ticks = [0]
+    done = threading.Event()
+
+    def count():
+        while not done.is_set():
+            ticks[0] += 1
+
+    counter = threading.Thread(target=count)
+    counter.start()
+    try:
+        start = time.perf_counter()
+        hasher.hash("x")
+        elapsed = time.perf_counter() - start
+    finally:
+        done.set()
+        counter.join()
+    # A GIL-holding hash would leave the counter one switch interval (5 ms) at most
+    assert elapsed > 0.02 and ticks[0] > 10000
@@ -2,7 +2,7 @@ import pytest
 from flask import Flask
 from flask_jwt_extended import JWTManager, create_access_token
 from models import db, Admin, Student, Post
-from app import post_bp  # Ensure correct import
+from views.post import post_bp
 
 
 @pytest.fixture
@@ -170,3 +170,54 @@ def test_dislike_post(client, student_token, sample_post, app):
 
     assert response.status_code == 200
     assert "dislikes" in response.json
+
+
+def test_get_posts_keyset_pagination(client, app):
+    """Test walking the feed page by page with the opaque cursor."""
+    with app.app_context():
+        for i in range(5):
+            db.session.add(Post(title=f"Post {i}", content="Body", category_id=1 + i % 2, student_id=2))
+        db.session.commit()
+
+    seen = []
+    response = client.get("/posts?limit=2")
+    while True:
+        assert response.status_code == 200
+        assert len(response.json) <= 2
+        seen.extend(post["id"] for post in response.json)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = client.get(f"/posts?limit=2&cursor={cursor}")
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_get_posts_filters(client, app):
+    """Test category_id and is_approved filters on the feed."""
+    with app.app_context():
+        db.session.add(Post(title="A", content="Body", category_id=1, student_id=2, is_approved=True))
+        db.session.add(Post(title="B", content="Body", category_id=2, student_id=2, is_approved=False))
+        db.session.commit()
+
+    response = client.get("/posts?category_id=2")
+    assert [post["title"] for post in response.json] == ["B"]
+
+    response = client.get("/posts?is_approved=true")
+    assert [post["title"] for post in response.json] == ["A"]
+
+
+def test_get_posts_invalid_cursor(client):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/posts?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_get_posts_invalid_filters(client):
+    """Test that non-integer id filters are rejected instead of ignored."""
+    response = client.get("/posts?category_id=abc")
+    assert response.status_code == 400
+    assert response.json["message"] == "category_id must be an integer"
+
+    assert client.get("/posts?student_id=1.5").status_code == 400
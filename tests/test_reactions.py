@@ -0,0 +1,121 @@
+import pytest
+from sqlalchemy import text
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from models import db, Post, PostReaction
+from views.post import post_bp
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app and initialize the database."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(post_bp)
+
+    with app.app_context():
+        db.create_all()
+        for post_id in (1, 2, 3):
+            db.session.add(Post(id=post_id, title=f"Post {post_id}", content="Body", category_id=1))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def auth(app, student_id=1, role="student"):
+    with app.app_context():
+        token = create_access_token(identity={"id": student_id, "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def counts(app, post_id=1):
+    with app.app_context():
+        post = db.session.get(Post, post_id)
+        return post.likes, post.dislikes
+
+
+def test_repeated_like_counts_once(client, app):
+    """Retried likes from the same student must not inflate the counter."""
+    headers = auth(app)
+    for _ in range(3):
+        response = client.post("/post/1/like", headers=headers)
+        assert response.status_code == 200
+
+    assert response.json["likes"] == 1
+    assert response.json["reaction"] == "like"
+    assert counts(app) == (1, 0)
+
+
+def test_switching_reaction_moves_counters(client, app):
+    """Turning a like into a dislike updates both counters together."""
+    headers = auth(app)
+    client.post("/post/1/like", headers=headers)
+    response = client.post("/post/1/dislike", headers=headers)
+
+    assert (response.json["likes"], response.json["dislikes"]) == (0, 1)
+    assert counts(app) == (0, 1)
+    with app.app_context():
+        assert PostReaction.query.count() == 1
+
+
+def test_clear_reaction(client, app):
+    """Removing a reaction deletes the ledger row and decrements its counter."""
+    headers = auth(app)
+    client.post("/post/1/like", headers=headers)
+    client.post("/post/1/like", headers=auth(app, student_id=2))
+
+    response = client.delete("/post/1/reaction", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json["reaction"] is None
+    assert counts(app) == (1, 0)
+
+
+def test_admins_cannot_react(client, app):
+    response = client.post("/post/1/like", headers=auth(app, role="admin"))
+    assert response.status_code == 403
+
+
+def test_batched_reaction_state(client, app):
+    """The caller's reactions for a page of posts come back in one response."""
+    headers = auth(app)
+    client.post("/post/1/like", headers=headers)
+    client.post("/post/3/dislike", headers=headers)
+    client.post("/post/2/like", headers=auth(app, student_id=2))
+
+    response = client.get("/posts/reactions?post_ids=1,2,3", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json == {"1": "like", "2": None, "3": "dislike"}
+
+
+def test_batched_reaction_state_rejects_bad_ids(client, app):
+    response = client.get("/posts/reactions?post_ids=1,abc", headers=auth(app))
+    assert response.status_code == 400
+
+
+def test_deleting_a_reacted_post_removes_its_reactions(client, app):
+    """The owner can still delete a post once others have reacted to it."""
+    with app.app_context():
+        db.session.add(Post(id=4, title="Mine", content="Body", category_id=1, student_id=1))
+        db.session.commit()
+    client.post("/post/4/like", headers=auth(app, student_id=2))
+    client.post("/post/4/dislike", headers=auth(app, student_id=3))
+
+    with app.app_context():
+        db.session.execute(text("PRAGMA foreign_keys=ON"))  # As Postgres always enforces them
+        response = client.delete("/post/4", headers=auth(app, student_id=1))
+        assert response.status_code == 200
+        assert PostReaction.query.filter_by(post_id=4).count() == 0
+        db.session.execute(text("PRAGMA foreign_keys=OFF"))
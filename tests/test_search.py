@@ -0,0 +1,116 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from models import db, Content, Post, Student
+from search import BM25Index, MemorySearchBackend, PostgresSearchBackend, create_search_backend
+from views.post import post_bp
+from views.search import search_bp
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with the in-memory search backend."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(post_bp)
+    app.register_blueprint(search_bp)
+    app.extensions["search_backend"] = MemorySearchBackend()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Student(id=2, email="student@example.com", username="student123", password="x"))
+        db.session.add(Post(id=1, title="Beating exam stress", content="Sleep well and plan revision", category_id=1, student_id=2))
+        db.session.add(Post(id=2, title="Morning routine", content="A short note on exam day breakfast", category_id=1, student_id=2))
+        db.session.add(Content(id=1, title="Stress podcast", description="Dealing with stress", status="approved",
+                               category_id=1, admin_id=1, content_type="podcast"))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def test_bm25_ranks_title_and_frequency():
+    index = BM25Index()
+    index.add(("post", 1), "Exam stress", "how to handle exam stress")
+    index.add(("post", 2), "Gardening", "stress free tomatoes")
+    index.add(("post", 3), "Cooking", "pasta recipes")
+
+    total, hits = index.search("exam stress")
+
+    assert total == 2
+    assert [key for key, _, _ in hits] == [("post", 1), ("post", 2)]
+
+
+def test_bm25_remove_and_replace():
+    index = BM25Index()
+    index.add(("post", 1), "Exam stress", "")
+    index.add(("post", 1), "Gardening", "")
+
+    assert index.search("exam")[0] == 0
+    index.remove(("post", 1))
+    assert len(index) == 0
+    assert index.search("gardening")[0] == 0
+
+
+def test_search_endpoint_ranks_posts_and_content(client):
+    response = client.get("/search?q=stress")
+
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == "2"
+    assert {(r["type"], r["id"]) for r in response.json} == {("post", 1), ("content", 1)}
+
+
+def test_search_type_filter_and_pagination(client):
+    response = client.get("/search?q=exam&type=post&limit=1")
+    assert response.headers["X-Total-Count"] == "2"
+    assert len(response.json) == 1
+
+    second = client.get("/search?q=exam&type=post&limit=1&offset=1")
+    assert second.json[0]["id"] != response.json[0]["id"]
+
+
+def test_search_sees_new_posts_incrementally(client, app):
+    client.get("/search?q=warmup")  # Builds the index from the database
+    with app.app_context():
+        token = create_access_token(identity=2)
+
+    client.post("/posts", json={"title": "Gratitude journal", "content": "Write three things", "category_id": 1},
+                headers={"Authorization": f"Bearer {token}"})
+
+    response = client.get("/search?q=gratitude")
+    assert [r["title"] for r in response.json] == ["Gratitude journal"]
+
+
+def test_search_requires_query(client):
+    assert client.get("/search").status_code == 400
+    assert client.get("/search?q=x&type=user").status_code == 400
+
+
+def test_writes_during_the_load_are_replayed_over_it(app):
+    backend = MemorySearchBackend()
+    backend.remove_document("post", 1)  # Deleted after the load read it
+    backend.index_document("post", 2, "Evening routine", "")  # Renamed after the load read it
+
+    backend.ensure_loaded()
+
+    assert [(r["type"], r["id"]) for r in backend.search("stress")[1]] == [("content", 1)]
+    assert [r["id"] for r in backend.search("evening")[1]] == [2]
+    assert backend.search("breakfast")[0] == 0
+
+
+def test_backend_defaults_to_postgres_on_postgres():
+    assert isinstance(create_search_backend({"SQLALCHEMY_DATABASE_URI": "postgresql://u:p@db/app"}),
+                      PostgresSearchBackend)
+    assert isinstance(create_search_backend({"SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"}), MemorySearchBackend)
+    assert isinstance(create_search_backend({"SQLALCHEMY_DATABASE_URI": "postgresql://u:p@db/app",
+                                             "SEARCH_BACKEND": "memory"}), MemorySearchBackend)
@@ -0,0 +1,88 @@
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from models import db, Post
+from serializers import OrjsonProvider, Serializer, init_json, orjson, post_serializer
+from views.post import post_bp
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app using the orjson provider."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+
+    db.init_app(app)
+    init_json(app)
+    app.register_blueprint(post_bp)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Post(id=1, title="First", content="c", category_id=1, student_id=2,
+                            created_at=datetime(2026, 1, 1, 9, 30)))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def test_post_serializer_matches_hand_built_dict(app):
+    with app.app_context():
+        post = Post.query.get(1)
+        assert post_serializer(post) == {
+            "id": 1, "title": "First", "content": "c", "category_id": 1,
+            "student_id": 2, "created_at": "2026-01-01T09:30:00",
+        }
+
+
+def test_field_selection_is_compiled_once_and_validated():
+    serializer = Serializer(("id", "created_at"), datetime_fields=("created_at",))
+
+    assert serializer.only(("created_at",)) is serializer.only(["created_at"])
+    assert serializer.parse_fields("created_at") == ("created_at",)
+    assert serializer.parse_fields("") is None
+    with pytest.raises(ValueError):
+        serializer.parse_fields("id,password")
+
+
+def test_null_datetimes_stay_null():
+    class Row:
+        id = 3
+        created_at = None
+
+    serializer = Serializer(("id", "created_at"), datetime_fields=("created_at",))
+    assert serializer(Row()) == {"id": 3, "created_at": None}
+    assert serializer.only(("created_at",))(Row()) == {"created_at": None}
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson not installed")
+def test_orjson_provider_matches_default_provider(app):
+    payload = {"b": [1, 2.5, None, True], "a": "é", "when": datetime(2026, 1, 1), "price": Decimal("1.5")}
+
+    assert isinstance(app.json, OrjsonProvider)
+    assert json.loads(app.json.dumps(payload)) == json.loads(DefaultJSONProvider(app).dumps(payload))
+
+
+def test_get_posts_field_selection(client):
+    response = client.get("/posts?fields=id,title")
+
+    assert response.json == [{"id": 1, "title": "First"}]
+    assert client.get("/posts?fields=password").status_code == 400
+
+
+def test_row_encoder_reads_projected_columns_by_position(app):
+    with app.app_context():
+        row = db.session.query(*post_serializer.columns(("id", "created_at"))).one()
+        encode = post_serializer.row_encoder(("id", "created_at"))
+        assert encode(row) == {"id": 1, "created_at": "2026-01-01T09:30:00"}
+        assert post_serializer.row_encoder()(db.session.query(*post_serializer.columns()).one()) == \
+            post_serializer(Post.query.get(1))
@@ -0,0 +1,115 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from cache import MemoryCache
+from models import db, Admin, Content, Post, Student
+import streaming
+from views.admin import admin_bp
+from views.content import content_bp
+from views.post import post_bp
+from views.student import student_bp
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Create a Flask test app with enough rows to span several streamed chunks."""
+    monkeypatch.setattr(streaming, "STREAM_CHUNK_ROWS", 7)
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    for blueprint in (admin_bp, content_bp, post_bp, student_bp):
+        app.register_blueprint(blueprint)
+    app.extensions["response_cache"] = MemoryCache()
+
+    with app.app_context():
+        db.create_all()
+        start = datetime(2026, 1, 1)
+        for i in range(1, 31):
+            db.session.add(Student(id=i, email=f"s{i}@example.com", username=f"s{i}", password="x"))
+            db.session.add(Post(id=i, title=f"p{i}", content="c", category_id=i % 3, student_id=i,
+                                created_at=start + timedelta(minutes=i)))
+            db.session.add(Content(id=i, title=f"c{i}", description="d", status="approved",
+                                   category_id=1, admin_id=1, content_type="video"))
+        db.session.add(Admin(id=1, email="admin@example.com", username="admin", password="x"))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(app):
+    with app.app_context():
+        token = create_access_token(identity=1)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def ndjson_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_students_stream_as_json_array(client, headers):
+    response = client.get("/students", headers=headers)
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert [s["id"] for s in response.json] == list(range(1, 31))
+    assert set(response.json[0]) == {"id", "email", "username", "created_at"}
+
+
+def test_students_ndjson(client, headers):
+    response = client.get("/students?format=ndjson", headers=headers)
+
+    assert response.mimetype == "application/x-ndjson"
+    assert [s["username"] for s in ndjson_lines(response)] == [f"s{i}" for i in range(1, 31)]
+
+
+def test_admins_ndjson_via_accept_header(client, headers):
+    response = client.get("/admins", headers={**headers, "Accept": "application/x-ndjson"})
+
+    admins = ndjson_lines(response)
+    assert response.mimetype == "application/x-ndjson"
+    assert [(a["id"], a["username"]) for a in admins] == [(1, "admin")]
+
+
+def test_empty_stream_is_valid_json(client, headers, app):
+    with app.app_context():
+        Admin.query.delete()
+        db.session.commit()
+
+    assert client.get("/admins", headers=headers).json == []
+    assert client.get("/admins?format=ndjson", headers=headers).get_data() == b""
+
+
+def test_posts_ndjson_export_ignores_paging_and_keeps_filters(client):
+    response = client.get("/posts?format=ndjson&category_id=1&limit=2")
+
+    posts = ndjson_lines(response)
+    assert [p["id"] for p in posts] == [i for i in range(30, 0, -1) if i % 3 == 1]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_content_default_is_cached_and_ndjson_is_not(client, app):
+    assert len(client.get("/content").json) == 30
+    assert len(ndjson_lines(client.get("/content?format=ndjson"))) == 30
+
+    with app.app_context():
+        db.session.add(Content(title="new", description="d", status="approved",
+                               category_id=1, admin_id=1, content_type="video"))
+        db.session.commit()
+
+    # The buffered list is served from the cache; the export always reads the table
+    assert len(client.get("/content").json) == 30
+    assert len(ndjson_lines(client.get("/content?format=ndjson"))) == 31
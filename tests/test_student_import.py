@@ -0,0 +1,190 @@
+import io
+import json
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import event
+from models import db, Student
+from passwords import PasswordHasher
+from student_import import detect_format, import_students, read_records
+from views.student import student_bp
+
+HASHER = PasswordHasher(pbkdf2_iterations=1000)  # Keep the suite quick
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app with one existing student."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+    app.config["STUDENT_IMPORT_WORKERS"] = 2
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(student_bp)
+    app.extensions["password_hasher"] = HASHER
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Student(id=1, email="taken@example.com", username="taken", password="x"))
+        db.session.commit()
+        yield app
+        db.drop_all()
+    pool = app.extensions.get("student_import_pool")
+    if pool is not None:
+        pool.close()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+def auth(role):
+    return {"Authorization": f"Bearer {create_access_token(identity={'id': 1, 'role': role})}"}
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count SELECTs issued against the engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+CSV = (
+    "email,username,password,cohort\n"
+    "ann@example.com,ann,pw-ann,2026\n"
+    "taken@example.com,someone,pw,2026\n"
+    "bo@example.com,taken,pw,2026\n"
+    "cy@example.com,cy,,2026\n"
+    "ann@example.com,ann2,pw,2026\n"
+    "di@example.com,di,pw-di,2026\n"
+)
+
+
+def test_csv_upload_creates_valid_rows_and_reports_the_rest(client, query_counter):
+    response = client.post("/students/import", headers=auth("admin"),
+                           data={"file": (io.BytesIO(CSV.encode()), "cohort.csv")})
+
+    assert response.status_code == 200
+    assert response.json == {"rows": 6, "created": 2, "failed": 4, "errors": [
+        {"row": 2, "message": "Email already exists"},
+        {"row": 3, "message": "Username already exists"},
+        {"row": 4, "message": "Email, username, and password are required"},
+        {"row": 5, "message": "Email already exists"},
+    ]}
+    # Uniqueness comes from one preloaded SELECT, not one per row
+    assert len(query_counter) == 1
+    ann = Student.query.filter_by(email="ann@example.com").one()
+    assert ann.username == "ann" and HASHER.verify(ann.password, "pw-ann")
+    assert ann.created_at is not None and ann.is_active
+
+
+def test_ndjson_body_in_several_batches(app, client, monkeypatch):
+    import student_import
+    monkeypatch.setattr(student_import, "IMPORT_BATCH_SIZE", 3)
+    lines = [json.dumps({"email": f"s{i}@example.com", "username": f"s{i}", "password": f"pw{i}"})
+             for i in range(10)]
+    lines[4] = "not json"
+    body = "\n".join(lines) + "\n\n"
+    inserts = []
+
+    def count_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO students"):
+            inserts.append(len(parameters) if executemany else 1)
+
+    event.listen(db.engine, "before_cursor_execute", count_insert)
+
+    response = client.post("/students/import", headers=auth("admin"), data=body,
+                           content_type="application/x-ndjson")
+
+    assert response.status_code == 200
+    assert response.json["created"] == 9
+    event.remove(db.engine, "before_cursor_execute", count_insert)
+    assert inserts == [3, 3, 3]  # One executemany per batch of accepted rows
+    assert response.json["errors"] == [{"row": 5, "message": "Row is not a JSON object"}]
+    assert HASHER.verify(Student.query.filter_by(username="s9").one().password, "pw9")
+
+
+def test_uploads_share_one_hashing_pool(app, client):
+    client.post("/students/import", headers=auth("admin"), data=CSV, content_type="text/csv")
+    pool = app.extensions["student_import_pool"]
+    assert pool.workers == 2
+
+    body = "email,username,password\nev@example.com,ev,pw-ev\n"
+    response = client.post("/students/import", headers=auth("admin"), data=body, content_type="text/csv")
+    assert response.json["created"] == 1
+    assert app.extensions["student_import_pool"] is pool
+
+
+def test_dry_run_writes_nothing(client):
+    response = client.post("/students/import?format=csv&dry_run=1", headers=auth("admin"), data=CSV,
+                           content_type="text/plain")
+
+    assert response.json["created"] == 2 and response.json["failed"] == 4
+    assert Student.query.count() == 1
+
+
+def test_bad_uploads_are_rejected(client):
+    response = client.post("/students/import", headers=auth("admin"), data="email,name\n", content_type="text/csv")
+    assert response.status_code == 400
+    assert response.json["message"] == "CSV header is missing: username, password"
+
+    response = client.post("/students/import", headers=auth("admin"), data="x", content_type="text/plain")
+    assert response.status_code == 400
+
+
+def test_only_admins_can_import_or_export(client):
+    assert client.post("/students/import", headers=auth("student"), data=CSV,
+                       content_type="text/csv").status_code == 403
+    assert client.get("/students/export", headers=auth("student")).status_code == 403
+    assert Student.query.count() == 1
+
+
+def test_conflicting_batch_is_retried_row_by_row(app):
+    def hash_and_race(passwords):
+        # Someone signs up with one of the imported emails mid-import
+        db.session.add(Student(email="b@example.com", username="racer", password="x"))
+        db.session.commit()
+        return [HASHER.hash(password) for password in passwords]
+
+    records = read_records(io.BytesIO(b"email,username,password\na@example.com,a,1\n"
+                                      b"b@example.com,b,2\nc@example.com,c,3\n"), "csv")
+    report = import_students(records, hash_and_race)
+
+    assert report.created == 2
+    assert report.errors == [{"row": 2, "message": "Could not save this student"}]
+    assert sorted(s.username for s in Student.query) == ["a", "c", "racer", "taken"]
+
+
+def test_export_streams_csv_and_ndjson(client):
+    client.post("/students/import", headers=auth("admin"), data=CSV, content_type="text/csv")
+
+    response = client.get("/students/export", headers=auth("admin"))
+    assert response.mimetype == "text/csv"
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == "id,email,username,created_at"
+    assert [line.split(",")[2] for line in lines[1:]] == ["taken", "ann", "di"]
+    assert "password" not in response.get_data(as_text=True)
+
+    response = client.get("/students/export?format=ndjson", headers=auth("admin"))
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["email"] for row in rows] == ["taken@example.com", "ann@example.com", "di@example.com"]
+
+
+def test_detect_format():
+    assert detect_format(filename="cohort.CSV") == "csv"
+    assert detect_format(filename="cohort.jsonl") == "ndjson"
+    assert detect_format(mimetype="application/x-ndjson") == "ndjson"
+    assert detect_format("csv", filename="cohort.ndjson") == "csv"
+    assert detect_format("xml") is None and detect_format(mimetype="text/plain") is None
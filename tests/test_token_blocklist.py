@@ -0,0 +1,126 @@
+import pytest
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import event
+from models import db, TokenBlocklist
+from token_blocklist import TokenBlocklistCache
+from views.auth import auth_bp
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app and initialize the database."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    jwt = JWTManager(app)
+    app.register_blueprint(auth_bp)
+    blocklist = TokenBlocklistCache(timedelta(hours=1), poll_interval=60, clock=FakeClock())
+    app.extensions["token_blocklist"] = blocklist
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(_jwt_header, jwt_payload):
+        return blocklist.is_revoked(jwt_payload["jti"])
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count SELECTs issued against the engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_not_revoked_lookups_skip_db_between_polls(app, query_counter):
+    """Only the periodic poll touches the database."""
+    clock = FakeClock()
+    cache = TokenBlocklistCache(timedelta(hours=1), poll_interval=5, clock=clock)
+
+    for _ in range(100):
+        assert cache.is_revoked("unknown-jti") is False
+
+    assert len(query_counter) == 1
+
+
+def test_picks_up_rows_written_elsewhere_after_poll(app):
+    """Revocations written by another worker show up on the next poll."""
+    clock = FakeClock()
+    cache = TokenBlocklistCache(timedelta(hours=1), poll_interval=5, clock=clock)
+    assert cache.is_revoked("jti-1") is False
+
+    db.session.add(TokenBlocklist(jti="jti-1"))
+    db.session.commit()
+    assert cache.is_revoked("jti-1") is False  # Still within the poll interval
+
+    clock.now = 5
+    assert cache.is_revoked("jti-1") is True
+
+
+def test_picks_up_rows_that_commit_out_of_id_order(app):
+    """A row with a lower id than one already seen (a late commit) is still loaded."""
+    clock = FakeClock()
+    cache = TokenBlocklistCache(timedelta(hours=1), poll_interval=5, clock=clock)
+    db.session.add(TokenBlocklist(id=10, jti="jti-10"))
+    db.session.commit()
+    assert cache.is_revoked("jti-10") is True
+
+    db.session.add(TokenBlocklist(id=5, jti="jti-5"))
+    db.session.commit()
+    clock.now = 5
+    assert cache.is_revoked("jti-5") is True
+
+
+def test_revoke_is_visible_immediately(app):
+    """A revocation made through the cache needs no poll to take effect."""
+    cache = TokenBlocklistCache(timedelta(hours=1), poll_interval=60, clock=FakeClock())
+    cache.is_revoked("warm-up")
+
+    cache.revoke("jti-2")
+
+    assert cache.is_revoked("jti-2") is True
+    assert TokenBlocklist.query.filter_by(jti="jti-2").count() == 1
+
+
+def test_expired_entries_are_pruned(app):
+    """Rows older than the access-token lifetime are neither loaded nor kept."""
+    db.session.add(TokenBlocklist(jti="old", created_at=datetime.utcnow() - timedelta(hours=2)))
+    db.session.add(TokenBlocklist(jti="fresh", created_at=datetime.utcnow()))
+    db.session.commit()
+
+    cache = TokenBlocklistCache(timedelta(hours=1), poll_interval=5, clock=FakeClock())
+
+    assert cache.is_revoked("fresh") is True
+    assert cache.is_revoked("old") is False
+    assert len(cache) == 1
+
+
+def test_logout_revokes_the_token(app):
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=1)}"}
+
+    assert client.post("/logout", headers=headers).status_code == 200
+    assert client.post("/logout", headers=headers).status_code == 401
+    assert TokenBlocklist.query.count() == 1
@@ -0,0 +1,103 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import event
+from models import db, Post, Wishlist
+from views.wishlist import wishlist_bp
+
+
+@pytest.fixture
+def app():
+    """Create a Flask test app and initialize the database."""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["JWT_SECRET_KEY"] = "test_secret_key"
+
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(wishlist_bp)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create a test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(app):
+    """Auth headers for student 1."""
+    with app.app_context():
+        token = create_access_token(identity={"id": 1, "role": "student"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def saved_posts(app):
+    """Save ten posts to student 1's wishlist and one to student 2's."""
+    with app.app_context():
+        for i in range(11):
+            post = Post(title=f"Post {i}", content="A long body " * 50, category_id=1, student_id=3)
+            db.session.add(post)
+            db.session.flush()
+            db.session.add(Wishlist(student_id=1 if i < 10 else 2, post_id=post.id))
+        db.session.commit()
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count SELECTs issued against the engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        yield statements
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_get_wishlist_single_query(client, headers, saved_posts, query_counter):
+    """Test that the whole page is served by one joined SELECT."""
+    response = client.get("/wishlist", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json) == 10
+    assert response.json[0]["title"] == "Post 9"
+    assert "content" in response.json[0]
+    assert len(query_counter) == 1
+
+
+def test_get_wishlist_fields_projection(client, headers, saved_posts, query_counter):
+    """Test that fields= limits both the payload and the selected columns."""
+    response = client.get("/wishlist?fields=title,likes", headers=headers)
+
+    assert response.status_code == 200
+    assert set(response.json[0]) == {"wishlist_id", "post_id", "title", "likes"}
+    assert "posts.content" not in query_counter[0]
+
+
+def test_get_wishlist_unknown_field(client, headers):
+    """Test that unknown fields are rejected."""
+    response = client.get("/wishlist?fields=password", headers=headers)
+    assert response.status_code == 400
+
+
+def test_get_wishlist_pagination(client, headers, saved_posts):
+    """Test paging through saved posts with the cursor header."""
+    first = client.get("/wishlist?limit=6&fields=title", headers=headers)
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/wishlist?limit=6&fields=title&cursor={cursor}", headers=headers)
+
+    titles = [item["title"] for item in first.json + second.json]
+    assert len(titles) == 10
+    assert len(set(titles)) == 10
+    assert "X-Next-Cursor" not in second.headers
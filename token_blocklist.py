@@ -0,0 +1,62 @@
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from models import db, TokenBlocklist
+
+
+class TokenBlocklistCache:
+    """
+    In-process mirror of the token_blocklist table for the JWT revocation check.
+
+    Revoked JTIs are kept in a dict (jti -> revoked_at). At most once every
+    poll_interval seconds the dict is rebuilt from every row younger than the
+    access-token lifetime, so the common not-revoked lookup is a dict probe with
+    no DB round-trip. Reloading the whole window rather than polling for new ids
+    means a revocation whose transaction committed after a later one's (serial
+    ids are not commit-ordered) is still picked up. Older rows are left out:
+    such tokens have expired and are rejected before the blocklist is read.
+    """
+
+    def __init__(self, token_ttl, poll_interval=5.0, clock=time.monotonic):
+        self.token_ttl = token_ttl
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._revoked = {}
+        self._next_poll = float("-inf")  # Load on first use
+
+    def is_revoked(self, jti):
+        if self._clock() >= self._next_poll:
+            self.refresh()
+        return jti in self._revoked
+
+    def refresh(self, force=False):
+        """Reload the unexpired blocklist rows."""
+        with self._lock:
+            if not force and self._clock() < self._next_poll:
+                return  # Another thread refreshed while we waited for the lock
+
+            cutoff = datetime.utcnow() - self.token_ttl
+            rows = (
+                db.session.query(TokenBlocklist.jti, TokenBlocklist.created_at)
+                .filter(or_(TokenBlocklist.created_at >= cutoff, TokenBlocklist.created_at.is_(None)))
+                .all()
+            )
+            self._revoked = {jti: created_at or datetime.utcnow() for jti, created_at in rows}
+            self._next_poll = self._clock() + self.poll_interval
+
+    def revoke(self, jti):
+        """Persist a revocation and make it visible to this worker immediately. Revoking twice is a no-op."""
+        revoked_at = datetime.utcnow()
+        db.session.add(TokenBlocklist(jti=jti, created_at=revoked_at))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # Already revoked
+        with self._lock:
+            self._revoked[jti] = revoked_at
+
+    def __len__(self):
+        return len(self._revoked)
@@ -1,9 +1,13 @@
 import os
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, create_access_token, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_jwt_extended import jwt_required, create_access_token
+from passwords import hash_password
 from models import Admin, Student, Category, db  # Ensure all required models are imported
 from flask_cors import cross_origin
+from cache import invalidate
+from streaming import wants_ndjson, iter_query, stream_rows
+from serializers import admin_serializer
+from identity import forget_user
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -44,7 +48,7 @@ def create_admin():
     if Admin.query.filter_by(username=username).first():
         return jsonify({"message": "Username already exists"}), 400
 
-    hashed_password = generate_password_hash(password)
+    hashed_password = hash_password(password)
     new_admin = Admin(email=email, username=username, password=hashed_password)
     db.session.add(new_admin)
     db.session.commit()
@@ -52,20 +56,16 @@ def create_admin():
     return jsonify({"message": "Admin created successfully", "admin_id": new_admin.id}), 201
 
 # -------------------------
-# Get All Admins
+# Get All Admins (streamed; ?format=ndjson for one object per line)
 # -------------------------
 @admin_bp.route('/admins', methods=['GET'])
 @cross_origin(origins="*", supports_credentials=True) 
 @jwt_required()
 def get_admins():
-    admins = Admin.query.all()
-    admins_data = [{
-        "id": admin.id,
-        "email": admin.email,
-        "username": admin.username,
-        "created_at": admin.created_at.isoformat()
-    } for admin in admins]
-    return jsonify(admins_data), 200
+    admins = iter_query(
+        db.session.query(*admin_serializer.columns()).order_by(Admin.id)
+    )
+    return stream_rows(admins, admin_serializer.row_encoder(), ndjson=wants_ndjson()), 200
 
 # -------------------------
 # Get a Specific Admin by ID
@@ -75,13 +75,7 @@ def get_admins():
 @jwt_required()
 def get_admin(admin_id):
     admin = Admin.query.get_or_404(admin_id)
-    admin_data = {
-        "id": admin.id,
-        "email": admin.email,
-        "username": admin.username,
-        "created_at": admin.created_at.isoformat()
-    }
-    return jsonify(admin_data), 200
+    return jsonify(admin_serializer(admin)), 200
 
 # -------------------------
 # Update an Admin
@@ -107,9 +101,10 @@ def update_admin(admin_id):
 
     if 'password' in data:
         new_password = data['password']
-        admin.password = generate_password_hash(new_password)
+        admin.password = hash_password(new_password)
 
     db.session.commit()
+    forget_user("admin", admin_id)
     return jsonify({"message": "Admin updated successfully"}), 200
 
 # -------------------------
@@ -122,6 +117,7 @@ def delete_admin(admin_id):
     admin = Admin.query.get_or_404(admin_id)
     db.session.delete(admin)
     db.session.commit()
+    forget_user("admin", admin_id)
     return jsonify({"message": "Admin deleted successfully"}), 200
 
 # -------------------------
@@ -144,7 +140,8 @@ def deactivate_user(user_id):
 
         user.is_active = False  # Update status
         db.session.commit()
-        
+        forget_user("student" if isinstance(user, Student) else "admin", user_id)
+
         return jsonify({"message": "User deactivated successfully"}), 200
 
     except Exception as e:
@@ -163,4 +160,5 @@ def delete_category(category_id):
     category = Category.query.get_or_404(category_id)
     db.session.delete(category)
     db.session.commit()
+    invalidate("categories")
     return jsonify({"message": "Category deleted successfully"}), 200
\ No newline at end of file
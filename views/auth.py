@@ -1,28 +1,13 @@
-import os
 import logging
-import firebase_admin
-from firebase_admin import auth as firebase_auth, credentials
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_cors import cross_origin
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, get_jwt, jwt_required
 from models import db, Admin, Student
-from werkzeug.security import generate_password_hash
-from werkzeug.security import check_password_hash  
+from passwords import check_password, hash_password
 from sqlalchemy.exc import IntegrityError
+from auth_providers import AuthProviderUnavailable, InvalidIdToken, get_auth_provider
 
-# Get the absolute path to the Firebase service account JSON file
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Fixed typo: _file -> _file_
-FIREBASE_CREDENTIALS_PATH = os.path.join(BASE_DIR, "../firebase-service-account.json")
-
-# Initialize Firebase Admin SDK only if not already initialized
-if not firebase_admin._apps:
-    if not os.path.exists(FIREBASE_CREDENTIALS_PATH):
-        raise FileNotFoundError(
-            f"Firebase service account JSON file not found at {FIREBASE_CREDENTIALS_PATH}"
-        )
-    cred = credentials.Certificate(FIREBASE_CREDENTIALS_PATH)
-    firebase_admin.initialize_app(cred)
-
+# Firebase is set up by the app's auth provider on first use, not at import
 auth_bp = Blueprint("auth_bp", __name__)  # Fixed typo: _name -> _name_
 
 # ---------------------------------------------------
@@ -43,7 +28,7 @@ def google_login():
         if not id_token:
             return jsonify({"success": False, "error": "No ID token provided"}), 400
 
-        decoded_token = firebase_auth.verify_id_token(id_token)
+        decoded_token = get_auth_provider().verify_id_token(id_token)
         email = decoded_token.get("email")
         name = decoded_token.get("name") or email.split('@')[0]
 
@@ -71,6 +56,10 @@ def google_login():
             "access_token": access_token
         }), 200
 
+    except InvalidIdToken as e:
+        return jsonify({"success": False, "error": str(e)}), 401
+    except AuthProviderUnavailable as e:
+        return jsonify({"success": False, "error": str(e)}), 503
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -103,13 +92,13 @@ def signup():
             user = Admin(
                 email=email,
                 username=f"{firstName} {lastName}",
-                password=generate_password_hash(password)
+                password=hash_password(password)
             )
         else:
             user = Student(
                 email=email,
                 username=f"{firstName} {lastName}",
-                password=generate_password_hash(password)
+                password=hash_password(password)
             )
 
         db.session.add(user)
@@ -152,7 +141,7 @@ def profile():
             return jsonify({"success": False, "error": "Missing or invalid token"}), 401
 
         token = auth_header.split(" ")[1]
-        decoded_token = firebase_auth.verify_id_token(token)
+        decoded_token = get_auth_provider().verify_id_token(token)
 
         email = decoded_token.get("email")
         role = "student"
@@ -175,6 +164,10 @@ def profile():
             }
         }), 200
 
+    except InvalidIdToken as e:
+        return jsonify({"success": False, "error": str(e)}), 401
+    except AuthProviderUnavailable as e:
+        return jsonify({"success": False, "error": str(e)}), 503
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -208,7 +201,7 @@ def login():
                 return jsonify({"error": "Invalid login credentials"}), 401
 
             # ✅ Password check for student
-            if not check_password_hash(student.password, password):
+            if not check_password(student, password):
                 print("Incorrect password for student")  # Debug print
                 return jsonify({"error": "Invalid login credentials"}), 401
 
@@ -225,7 +218,7 @@ def login():
                 return jsonify({"error": "Invalid login credentials"}), 401
 
             # ✅ Password check for admin
-            if not check_password_hash(admin.password, password):
+            if not check_password(admin, password):
                 print("Incorrect password for admin")  # Debug print
                 return jsonify({"error": "Invalid login credentials"}), 401
 
@@ -238,3 +231,12 @@ def login():
     except Exception as e:
         print("Login error:", str(e))  # Debugging
         return jsonify({"error": str(e)}), 500  # Show real error
+
+
+# Logout: revoke the presented access token for its remaining lifetime
+@auth_bp.route('/logout', methods=['POST'])
+@cross_origin(origins="*", supports_credentials=True)
+@jwt_required()
+def logout():
+    current_app.extensions["token_blocklist"].revoke(get_jwt()["jti"])
+    return jsonify({"message": "Logged out successfully"}), 200
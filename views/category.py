@@ -1,7 +1,9 @@
 from flask import request, jsonify, Blueprint
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from models import Category, db
 from flask_cors import cross_origin
+from cache import cached_response, invalidate
+from identity import get_admin_id, is_admin
 
 category_bp = Blueprint('category', __name__)
 
@@ -17,8 +19,7 @@ def add_category():
     data = request.get_json()
     name = data.get('name')
     
-    current_user = get_jwt_identity()
-    if current_user.get("role") != "admin":
+    if not is_admin():
         return jsonify({"message": "Only admins can add categories"}), 403
 
     if not name:
@@ -27,9 +28,10 @@ def add_category():
     if Category.query.filter_by(name=name).first():
         return jsonify({"message": "Category already exists"}), 400
 
-    new_category = Category(name=name, admin_id=current_user.get("id"))
+    new_category = Category(name=name, admin_id=get_admin_id())
     db.session.add(new_category)
     db.session.commit()
+    invalidate("categories")
 
     return jsonify({"message": "Category added successfully", "category_id": new_category.id}), 201
 
@@ -37,6 +39,7 @@ def add_category():
 @category_bp.route('/categories', methods=['GET'])
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
+@cached_response("categories")
 def get_categories():
     categories = Category.query.all()
     return jsonify([{ "id": c.id, "name": c.name, "admin_id": c.admin_id } for c in categories]), 200
@@ -49,16 +52,15 @@ def update_category(category_id):
     data = request.get_json()
     new_name = data.get('name')
     
-    current_user = get_jwt_identity()
     category = get_category_by_id(category_id)
     
     if not category:
         return jsonify({"message": "Category not found"}), 404
     
-    if current_user.get("role") != "admin":
+    if not is_admin():
         return jsonify({"message": "Only admins can update categories"}), 403
 
-    if category.admin_id != current_user.get("id"):
+    if category.admin_id != get_admin_id():
         return jsonify({"message": "Unauthorized: You can only update categories you created"}), 403
 
     if not new_name:
@@ -69,6 +71,7 @@ def update_category(category_id):
 
     category.name = new_name
     db.session.commit()
+    invalidate("categories")
     return jsonify({"message": "Category updated successfully", "category_id": category.id}), 200
 
 # Delete a category
@@ -76,24 +79,23 @@ def update_category(category_id):
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def delete_category(category_id):
-    current_user = get_jwt_identity()
     category = get_category_by_id(category_id)
 
-    print(f"🔍 Current User: {current_user}")  # Debugging
     print(f"🔍 Category: {category}")  # Debugging
 
     if not category:
         return jsonify({"message": "Category not found"}), 404
     
-    if current_user.get("role") != "admin":
+    if not is_admin():
         return jsonify({"message": "Only admins can delete categories"}), 403
 
-    if category.admin_id != current_user.get("id"):
+    if category.admin_id != get_admin_id():
         return jsonify({"message": "Unauthorized: You can only delete categories you created"}), 403
 
     try:
         db.session.delete(category)
         db.session.commit()
+        invalidate("categories")
         return jsonify({"message": "Category deleted successfully"}), 200
     except Exception as e:
         print(f"🔥 ERROR: {e}")  # Log the exact error
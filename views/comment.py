@@ -1,16 +1,63 @@
 from datetime import datetime
 from flask import request, jsonify, Blueprint
+from sqlalchemy import literal
 from sqlalchemy.exc import IntegrityError
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from models import db, Comment
 from flask_cors import cross_origin
+from pagination import parse_int, parse_limit, keyset_page
+from serializers import comment_serializer
+from identity import get_student_id
 
 comment_bp = Blueprint('comment', __name__)
 
+# Deepest reply level returned; also guards the recursive query against runaway depth
+MAX_COMMENT_DEPTH = 50
+
 # Helper function to get comment by ID
 def get_comment_by_id(comment_id):
     return Comment.query.get_or_404(comment_id)
 
+def serialize_comment(comment):
+    data = comment_serializer(comment)
+    data["replies"] = []
+    return data
+
+# Load one page of top-level threads with their replies in two queries:
+# the page of roots, then every descendant down to max_depth via a recursive CTE.
+def load_comment_threads(post_id, cursor=None, limit=20, max_depth=MAX_COMMENT_DEPTH):
+    roots, next_cursor = keyset_page(
+        Comment.query.filter_by(post_id=post_id, parent_id=None),
+        Comment.created_at, Comment.id, cursor, limit, newest_first=False
+    )
+    threads = [serialize_comment(root) for root in roots]
+    if not roots or max_depth < 1:
+        return threads, next_cursor
+
+    tree = (
+        db.session.query(Comment.id, literal(1).label("depth"))
+        .filter(Comment.parent_id.in_([root.id for root in roots]))
+        .cte("comment_tree", recursive=True)
+    )
+    tree = tree.union_all(
+        db.session.query(Comment.id, (tree.c.depth + 1).label("depth"))
+        .join(tree, Comment.parent_id == tree.c.id)
+        .filter(tree.c.depth < max_depth)
+    )
+    replies = (
+        Comment.query.join(tree, Comment.id == tree.c.id)
+        .order_by(Comment.created_at, Comment.id)
+        .all()
+    )
+
+    # Index every node first so linking doesn't depend on row order
+    nodes = {node["id"]: node for node in threads}
+    nodes.update((reply.id, serialize_comment(reply)) for reply in replies)
+    for reply in replies:
+        nodes[reply.parent_id]["replies"].append(nodes[reply.id])
+
+    return threads, next_cursor
+
 # Add a new comment
 @comment_bp.route('/comments', methods=['POST'])
 @cross_origin(origins="*", supports_credentials=True)
@@ -19,7 +66,7 @@ def add_comment():
     data = request.get_json()
     content, post_id = data.get('content'), data.get('post_id')
     parent_id = data.get('parent_id', None)
-    student_id = get_jwt_identity().get("id")
+    student_id = get_student_id()
     
     if not content or not post_id:
         return jsonify({"message": "Content and post ID are required"}), 400
@@ -44,7 +91,7 @@ def add_comment():
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def delete_comment(comment_id):
-    student_id = get_jwt_identity().get("id")
+    student_id = get_student_id()
     comment = get_comment_by_id(comment_id)
 
     if comment.student_id != student_id:
@@ -58,38 +105,36 @@ def delete_comment(comment_id):
         db.session.rollback()
         return jsonify({"message": str(e)}), 500
 
-# Get comments for a post
+# Get comment threads for a post, oldest first
+# Query params: limit (top-level threads per page), cursor, max_depth (reply levels, 0 = none).
+# The next page's cursor is returned in the X-Next-Cursor header (absent on the last page).
 @comment_bp.route('/posts/<int:post_id>/comments', methods=['GET'])
-@cross_origin(origins="*", supports_credentials=True)
+@cross_origin(origins="*", supports_credentials=True, expose_headers=["X-Next-Cursor"])
 def get_comments(post_id):
-    comments = Comment.query.filter_by(post_id=post_id, parent_id=None).all()
-    
-    comments_data = [
-        {
-            "id": comment.id,
-            "content": comment.content,
-            "student_id": comment.student_id,
-            "created_at": comment.created_at.isoformat(),
-            "replies": [
-                {
-                    "id": reply.id,
-                    "content": reply.content,
-                    "student_id": reply.student_id,
-                    "created_at": reply.created_at.isoformat(),
-                    "parent_id": reply.parent_id
-                } for reply in comment.replies
-            ]
-        } for comment in comments
-    ]
-    
-    return jsonify(comments_data), 200
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        max_depth = parse_int(request.args.get('max_depth'), "max_depth")
+        if max_depth is None:
+            max_depth = MAX_COMMENT_DEPTH
+        elif max_depth < 0:
+            raise ValueError("max_depth must not be negative")
+        comments_data, next_cursor = load_comment_threads(
+            post_id, request.args.get('cursor'), limit, min(max_depth, MAX_COMMENT_DEPTH)
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    response = jsonify(comments_data)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, 200
 
 # Update a comment
 @comment_bp.route('/comments/<int:comment_id>', methods=['PUT'])
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def update_comment(comment_id):
-    student_id = get_jwt_identity().get("id")
+    student_id = get_student_id()
     comment = get_comment_by_id(comment_id)
 
     if comment.student_id != student_id:
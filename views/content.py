@@ -1,8 +1,18 @@
 import os
+from datetime import datetime
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from models import Content, Category, db
 from flask_cors import cross_origin
+from counters import record_reaction
+from cache import cached_response, invalidate
+from jobs import enqueue
+from fanout import fan_out_content
+from search import index_document, remove_document
+from feed import feed_add_content, feed_remove
+from streaming import wants_ndjson, iter_query, stream_rows
+from serializers import content_serializer
+from identity import get_admin_id
 
 # Define Blueprint
 content_bp = Blueprint('content', __name__)
@@ -24,8 +34,8 @@ def add_content():
     category_id, content_type = data.get('category_id'), data.get('content_type')
     content_link = data.get('content_link')
     
-    current_user = get_jwt_identity()
-    if not current_user or current_user.get("role") != "admin":
+    admin_id = get_admin_id()
+    if admin_id is None:
         return jsonify({"message": "Only admins can add content"}), 403
 
     if not title or not category_id or not content_type:
@@ -43,22 +53,25 @@ def add_content():
 
     new_content = Content(
         title=title, description=description, category_id=category_id,
-        status='pending', admin_id=current_user.get("id"),
+        status='pending', admin_id=admin_id,
         content_type=content_type, content_link=content_link
     )
     db.session.add(new_content)
     db.session.commit()
+    invalidate("content")
+    index_document("content", new_content.id, new_content.title, new_content.description)
 
     return jsonify({"message": "Content added successfully", "content_id": new_content.id}), 201
 
-# Route to get all content
+# Route to get all content (?format=ndjson streams it uncached, one object per line, for exports)
 @content_bp.route('/content', methods=['GET'])
 @cross_origin(origins="*", supports_credentials=True)
+@cached_response("content", bypass=wants_ndjson)
 def get_all_content():
+    if wants_ndjson():
+        return stream_rows(iter_query(Content.query.order_by(Content.id)), content_serializer, ndjson=True)
     content_list = Content.query.all()
-    return jsonify([{ "id": c.id, "title": c.title, "description": c.description,
-                      "category_id": c.category_id, "status": c.status, "admin_id": c.admin_id,
-                      "content_type": c.content_type, "content_link": c.content_link} for c in content_list]), 200
+    return jsonify(content_serializer.many(content_list)), 200
 
 # Route to get specific content by ID
 @content_bp.route('/content/<int:content_id>', methods=['GET'])
@@ -68,29 +81,22 @@ def get_content(content_id):
     content = get_content_by_id(content_id)
     if not content:
         return jsonify({"message": "Content not found"}), 404
-    return jsonify({ "id": content.id, "title": content.title, "description": content.description,
-                     "category_id": content.category_id, "status": content.status,
-                     "admin_id": content.admin_id, "content_type": content.content_type,
-                     "content_link": content.content_link }), 200
+    return jsonify(content_serializer(content)), 200
 
 # Route to like/dislike content
 @content_bp.route('/content/<int:content_id>/<action>', methods=['POST'])
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def react_to_content(content_id, action):
-    content = get_content_by_id(content_id)
-    if not content:
-        return jsonify({"message": "Content not found"}), 404
-    
-    if action == "like":
-        content.likes = getattr(content, 'likes', 0) + 1
-    elif action == "dislike":
-        content.dislikes = getattr(content, 'dislikes', 0) + 1
-    else:
+    if action not in ("like", "dislike"):
         return jsonify({"message": "Invalid action"}), 400
-    
-    db.session.commit()
-    return jsonify({"message": f"Content {action}d successfully"}), 200
+
+    column = f"{action}s"
+    count = record_reaction(Content, content_id, column)
+    if count is None:
+        return jsonify({"message": "Content not found"}), 404
+
+    return jsonify({"message": f"Content {action}d successfully", column: count}), 200
 
 # Route to flag content
 @content_bp.route('/content/<int:content_id>/flag', methods=['POST'])
@@ -113,9 +119,16 @@ def approve_content(content_id):
     content = get_content_by_id(content_id)
     if not content:
         return jsonify({"message": "Content not found"}), 404
-    
-    content.is_approved = True
+
+    newly_approved = content.status != "approved"
+    content.status = "approved"
+    if newly_approved:
+        content.approved_at = datetime.utcnow()
     db.session.commit()
+    invalidate("content")
+    if newly_approved:
+        feed_add_content(content)
+        enqueue(fan_out_content, content.id)
     return jsonify({"message": "Content approved successfully"}), 200
 
 # Route to delete content
@@ -129,6 +142,9 @@ def delete_content(content_id):
     
     db.session.delete(content)
     db.session.commit()
+    invalidate("content")
+    remove_document("content", content_id)
+    feed_remove("content", content_id)
     return jsonify({"message": "Content removed successfully"}), 200
 
 # Route to edit content
@@ -145,5 +161,10 @@ def edit_content(content_id):
         if field in data:
             setattr(content, field, data[field])
     db.session.commit()
+    invalidate("content")
+    index_document("content", content.id, content.title, content.description)
+    if content.status == "approved":
+        feed_remove("content", content.id)  # Its category may have changed
+        feed_add_content(content)
     
     return jsonify({"message": "Content updated successfully"}), 200
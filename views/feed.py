@@ -0,0 +1,40 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from flask_cors import cross_origin
+from pagination import parse_limit
+from identity import get_student_id
+from feed import get_feed_index, feed_item_serializer
+
+feed_bp = Blueprint('feed', __name__)
+
+# Deepest page we rank; candidate pools rarely hold more than this anyway
+MAX_FEED_OFFSET = 500
+
+# ✅ Personalized "For You" feed of posts and content, best first
+# Query params: limit, offset.
+@feed_bp.route('/feed', methods=['GET'])
+@cross_origin(origins="*", supports_credentials=True)
+@jwt_required()
+def get_feed():
+    student_id = get_student_id()
+    if student_id is None:
+        return jsonify({"message": "Only students have a feed"}), 403
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        offset = int(request.args.get('offset', 0))
+        if not 0 <= offset <= MAX_FEED_OFFSET:
+            raise ValueError(f"offset must be between 0 and {MAX_FEED_OFFSET}")
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    index = get_feed_index()
+    if index is None:
+        return jsonify({"message": "Feed is not configured"}), 503
+
+    results = []
+    for score, item in index.rank(student_id, limit, offset):
+        data = feed_item_serializer(item)
+        data["score"] = round(score, 4)
+        results.append(data)
+    return jsonify(results), 200
@@ -0,0 +1,39 @@
+from flask import Blueprint, request, jsonify
+from flask_cors import cross_origin
+from pagination import parse_limit
+from leaderboard import BOARDS, WINDOWS, LEADERBOARD_SIZE, get_leaderboard
+
+leaderboard_bp = Blueprint('leaderboard', __name__)
+
+# ✅ Top-k of a precomputed leaderboard: trending, contributors or most-shared
+# Query params: window (1h | 24h | 7d, default 24h), limit.
+@leaderboard_bp.route('/leaderboards/<board>', methods=['GET'])
+@cross_origin(origins="*", supports_credentials=True)
+def leaderboard(board):
+    if board not in BOARDS:
+        return jsonify({"message": f"Unknown leaderboard: {board}"}), 404
+
+    period = request.args.get('window', '24h')
+    if period not in WINDOWS:
+        return jsonify({"message": f"window must be one of {', '.join(WINDOWS)}"}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'), default=10, maximum=LEADERBOARD_SIZE)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    rows = get_leaderboard(board, period, limit)
+    results = []
+    for row in rows:
+        item = {"rank": row.rank, "score": row.score}
+        if board == "contributors":
+            item.update(student_id=row.subject_id, username=row.username)
+        else:
+            item.update(post_id=row.subject_id, title=row.title,
+                        category_id=row.category_id, student_id=row.student_id)
+        results.append(item)
+
+    response = jsonify(results)
+    if rows:
+        response.last_modified = rows[0].refreshed_at
+    return response, 200
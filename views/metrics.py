@@ -0,0 +1,25 @@
+import hmac
+from flask import Blueprint, Response, current_app, request, jsonify
+
+metrics_bp = Blueprint('metrics', __name__)
+
+# ✅ Database pool metrics for this worker, in the Prometheus text format
+# (or JSON with ?format=json). Served only when METRICS_TOKEN is set, to
+# callers sending "Authorization: Bearer <token>"; each worker process
+# reports its own pool.
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    token = current_app.config.get("METRICS_TOKEN")
+    if not token:
+        return jsonify({"message": "Metrics are not enabled"}), 404
+    # Compared as bytes: compare_digest raises TypeError on a non-ASCII str
+    if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()):
+        return jsonify({"message": "Unauthorized"}), 401
+
+    pool_metrics = current_app.extensions.get("pool_metrics")
+    if pool_metrics is None:
+        return jsonify({"message": "Pool metrics are not enabled"}), 404
+
+    if request.args.get("format") == "json":
+        return jsonify(pool_metrics.snapshot()), 200
+    return Response(pool_metrics.render_prometheus(), mimetype="text/plain; version=0.0.4"), 200
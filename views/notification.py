@@ -1,35 +1,72 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 def get_models():
     from models import Notification, db, Student
     return Notification, db, Student
 from flask_cors import cross_origin
+from sqlalchemy import and_, or_
+from identity import get_student_id
+from pagination import parse_limit, parse_bool, keyset_page, decode_cursor
+from serializers import notification_serializer
 
 
 
 notification_bp = Blueprint('notification', __name__)
 
 
+# The caller's own inbox, newest first, one keyset page at a time
+# Query params: limit, cursor, unread_only, unread_first (all unread, newest
+# first, then all read; its cursors only work with unread_first).
+# The next page's cursor is returned in the X-Next-Cursor header (absent on the last page).
 @notification_bp.route("/notifications/<int:user_id>", methods=["GET"])
 
-@cross_origin(origins="*", supports_credentials=True)
+@cross_origin(origins="*", supports_credentials=True, expose_headers=["X-Next-Cursor"])
 @jwt_required()
 def get_notifications(user_id):
+    Notification, _, _ = get_models()
+    if user_id != get_student_id():
+        return jsonify({"message": "You can only read your own notifications"}), 403
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        unread_only = parse_bool(request.args.get('unread_only'))
+        unread_first = parse_bool(request.args.get('unread_first'))
+        cursor = request.args.get('cursor')
+
+        query = Notification.query.filter(Notification.student_id == user_id)
+        if unread_only:
+            query = query.filter(Notification.is_read == False)
+        # (student_id, is_read, created_at) serves this order straight from the index
+        notifications, next_cursor = keyset_page(
+            query, Notification.created_at, Notification.id, cursor, limit,
+            group_col=Notification.is_read if unread_first and not unread_only else None,
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
-    notifications = Notification.query.filter_by(student_id=user_id).all()
-    if not notifications:
+    if not notifications and not cursor:
         return jsonify({"message": "No notifications found"}), 404
-    
-    notifications_data = [
-        {
-            "id": n.id,
-            "message": n.message,
-            "is_read": n.is_read,
-            "created_at": n.created_at.isoformat(),
-        }
-        for n in notifications
-    ]
-    return jsonify(notifications_data), 200
+
+    response = jsonify(notification_serializer.many(notifications))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, 200
+
+
+# Unread badge count for the caller; an index-only count over (student_id, is_read, ...)
+@notification_bp.route('/notifications/unread-count', methods=['GET'])
+@cross_origin(origins="*", supports_credentials=True)
+@jwt_required()
+def get_unread_count():
+    Notification, db, _ = get_models()
+    student_id = get_student_id()
+
+    unread = (
+        db.session.query(db.func.count(Notification.id))
+        .filter(Notification.student_id == student_id, Notification.is_read == False)
+        .scalar()
+    )
+    return jsonify({"unread": unread}), 200
 
 
 # Mark a notification as read
@@ -38,12 +75,13 @@ def get_notifications(user_id):
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def mark_notification_read(notification_id):
-    student_id = get_jwt_identity()
-    
+    Notification, db, _ = get_models()
+    student_id = get_student_id()
+
     notification = Notification.query.filter_by(id=notification_id, student_id=student_id).first()
 
     if not notification:
-        return jsonify({"message": "Notification not found"}), 404  
+        return jsonify({"message": "Notification not found"}), 404
 
     if notification.is_read:
         return jsonify({"message": "Notification already marked as read"}), 200
@@ -51,3 +89,45 @@ def mark_notification_read(notification_id):
     notification.is_read = True
     db.session.commit()
     return jsonify({"message": "Notification marked as read"}), 200
+
+
+# Bulk mark-read in a single UPDATE. JSON body, one of:
+#   {"ids": [1, 2, 3]}      those notifications
+#   {"before": "<cursor>"}  the row a page cursor from GET /notifications/<id> points at, and everything older
+#   {"all": true}           the whole inbox ("clear all")
+@notification_bp.route('/notifications/read', methods=['PUT'])
+@cross_origin(origins="*", supports_credentials=True)
+@jwt_required()
+def mark_notifications_read():
+    Notification, db, _ = get_models()
+    student_id = get_student_id()
+    data = request.get_json() or {}
+
+    query = Notification.query.filter(
+        Notification.student_id == student_id, Notification.is_read == False
+    )
+    if data.get("ids"):
+        try:
+            ids = [int(i) for i in data["ids"]]
+        except (TypeError, ValueError):
+            return jsonify({"message": "ids must be a list of integers"}), 400
+        query = query.filter(Notification.id.in_(ids))
+    elif data.get("before"):
+        try:
+            created_at, row_id = decode_cursor(data["before"])
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+        if created_at is None:
+            query = query.filter(Notification.created_at.is_(None), Notification.id <= row_id)
+        else:
+            query = query.filter(or_(
+                Notification.created_at < created_at,
+                and_(Notification.created_at == created_at, Notification.id <= row_id),
+                Notification.created_at.is_(None),
+            ))
+    elif data.get("all") is not True:
+        return jsonify({"message": "Provide ids, before, or all"}), 400
+
+    updated = query.update({Notification.is_read: True}, synchronize_session=False)
+    db.session.commit()
+    return jsonify({"message": "Notifications marked as read", "updated": updated}), 200
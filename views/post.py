@@ -1,7 +1,17 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import Post, db, Student
+from flask import Blueprint, request, jsonify, abort
+from flask_jwt_extended import jwt_required
+from models import Post, db
 from flask_cors import cross_origin
+from pagination import parse_int, parse_limit, parse_bool, keyset_page, MAX_PAGE_SIZE
+from counters import set_post_reaction, get_post_reactions
+from cache import cached_response, invalidate
+from jobs import enqueue
+from fanout import fan_out_post
+from identity import get_current_user, get_student_id
+from search import index_document, remove_document
+from streaming import wants_ndjson, iter_query, stream_rows
+from serializers import post_serializer
+from feed import feed_add_post, feed_remove
 
 post_bp = Blueprint('post', __name__)
 
@@ -18,58 +28,79 @@ def add_post():
     if not title or not content or not category_id:
         return jsonify({"message": "Title, content, and category ID are required"}), 400
 
-    user_id = get_jwt_identity()  # JWT returns user ID
-    student = Student.query.get(user_id)
+    student = get_current_user()
 
-    if not student:
+    if not student or not student.is_student:
         return jsonify({"message": "Unauthorized user"}), 403
 
     new_post = Post(
         title=title,
         content=content,
         category_id=int(category_id),  # Ensure it's an integer
-        student_id=user_id,
+        student_id=student.id,
     )
 
     db.session.add(new_post)
     db.session.commit()
+    invalidate("posts")
+    index_document("post", new_post.id, new_post.title, new_post.content)
+    feed_add_post(new_post)
+    enqueue(fan_out_post, new_post.id)
 
     return jsonify({"message": "Post added successfully", "post_id": new_post.id}), 201
 
 
-# ✅ Get all posts
+# ✅ Get posts, newest first, one keyset page at a time
+# Query params: limit, cursor, category_id, is_approved, student_id, fields (comma-separated).
+# The next page's cursor is returned in the X-Next-Cursor header (absent on the last page).
+# With ?format=ndjson every matching post is streamed instead, one JSON object per line.
 @post_bp.route('/posts', methods=['GET'])
-@cross_origin(origin="*", supports_credentials=True)
+@cross_origin(origin="*", supports_credentials=True, expose_headers=["X-Next-Cursor"])
+@cached_response("posts", bypass=wants_ndjson)
 def get_posts():
-    posts = Post.query.all()
-    posts_data = [
-        {
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "category_id": post.category_id,
-            "student_id": post.student_id,
-            "created_at": post.created_at.isoformat() if post.created_at else None
-        }
-        for post in posts
-    ]
-    return jsonify(posts_data), 200
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        category_id = parse_int(request.args.get('category_id'), "category_id")
+        student_id = parse_int(request.args.get('student_id'), "student_id")
+        is_approved = parse_bool(request.args.get('is_approved'))
+        encode = post_serializer.only(
+            post_serializer.parse_fields(request.args.get('fields')) or post_serializer.fields
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    query = Post.query
+    if category_id is not None:
+        query = query.filter(Post.category_id == category_id)
+    if student_id is not None:
+        query = query.filter(Post.student_id == student_id)
+    if is_approved is not None:
+        query = query.filter(Post.is_approved == is_approved)
+
+    if wants_ndjson():
+        query = query.order_by(Post.created_at.desc().nullslast(), Post.id.desc())
+        return stream_rows(iter_query(query), encode, ndjson=True)
+
+    try:
+        posts, next_cursor = keyset_page(
+            query, Post.created_at, Post.id, request.args.get('cursor'), limit
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    response = jsonify([encode(post) for post in posts])
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, 200
 
 
 # ✅ Get a specific post by ID
 @post_bp.route('/post/<int:post_id>', methods=['GET'])
 @cross_origin(origin="*", supports_credentials=True)
+@cached_response("post:{post_id}")
 def get_post(post_id):
     post = Post.query.get_or_404(post_id)
-    post_data = {
-        "id": post.id,
-        "title": post.title,
-        "content": post.content,
-        "category_id": post.category_id,
-        "student_id": post.student_id,
-        "created_at": post.created_at.isoformat() if post.created_at else None
-    }
-    return jsonify(post_data), 200
+    return jsonify(post_serializer(post)), 200
 
 
 # ✅ Update a post (only if the student is the owner)
@@ -78,9 +109,7 @@ def get_post(post_id):
 @jwt_required()
 def update_post(post_id):
     post = Post.query.get_or_404(post_id)
-    user_id = get_jwt_identity()
-
-    if post.student_id != user_id:
+    if post.student_id != get_student_id():
         return jsonify({"message": "Unauthorized: You can only update your own posts"}), 403
 
     data = request.get_json()
@@ -97,6 +126,11 @@ def update_post(post_id):
         post.is_flagged = bool(data['is_flagged'])
 
     db.session.commit()
+    invalidate("posts", f"post:{post_id}")
+    index_document("post", post.id, post.title, post.content)
+    feed_remove("post", post.id)  # Its category may have changed
+    if not post.is_flagged:
+        feed_add_post(post)
     return jsonify({"message": "Post updated successfully", "post_id": post.id}), 200
 
 
@@ -106,41 +140,68 @@ def update_post(post_id):
 @jwt_required()
 def delete_post(post_id):
     post = Post.query.get_or_404(post_id)
-    user_id = get_jwt_identity()
-
-    if post.student_id != user_id:
+    if post.student_id != get_student_id():
         return jsonify({"message": "Unauthorized: You can only delete your own posts"}), 403
 
     db.session.delete(post)
     db.session.commit()
+    invalidate("posts", f"post:{post_id}")
+    remove_document("post", post_id)
+    feed_remove("post", post_id)
     return jsonify({"message": "Post deleted successfully"}), 200
 
 
-# ✅ Like a post
+# Shared body of the reaction endpoints: one reaction per student per post
+def react(post_id, reaction, message):
+    student_id = get_student_id()
+    if student_id is None:
+        return jsonify({"message": "Only students can react to posts"}), 403
+
+    result = set_post_reaction(post_id, student_id, reaction)
+    if result is None:
+        abort(404)
+    return jsonify(dict(result, message=message)), 200
+
+
+# ✅ Like a post (repeating it is a no-op)
 @post_bp.route('/post/<int:post_id>/like', methods=['POST'])
 @cross_origin(origin="*", supports_credentials=True)
 @jwt_required()
 def like_post(post_id):
-    post = Post.query.get_or_404(post_id)
-
-    if post.likes is None:
-        post.likes = 0
-
-    post.likes += 1
-    db.session.commit()
-    return jsonify({"message": "Post liked successfully", "likes": post.likes}), 200
+    return react(post_id, "like", "Post liked successfully")
 
 
-# ✅ Dislike a post
+# ✅ Dislike a post (repeating it is a no-op)
 @post_bp.route('/post/<int:post_id>/dislike', methods=['POST'])
 @cross_origin(origin="*", supports_credentials=True)
 @jwt_required()
 def dislike_post(post_id):
-    post = Post.query.get_or_404(post_id)
+    return react(post_id, "dislike", "Post disliked successfully")
 
-    if post.dislikes is None:
-        post.dislikes = 0
 
-    post.dislikes += 1
-    db.session.commit()
-    return jsonify({"message": "Post disliked successfully", "dislikes": post.dislikes}), 200
+# ✅ Remove the caller's like or dislike
+@post_bp.route('/post/<int:post_id>/reaction', methods=['DELETE'])
+@cross_origin(origin="*", supports_credentials=True)
+@jwt_required()
+def clear_reaction(post_id):
+    return react(post_id, None, "Reaction removed successfully")
+
+
+# ✅ The caller's reactions for a page of posts: ?post_ids=1,2,3 -> {"1": "like", "2": null, ...}
+@post_bp.route('/posts/reactions', methods=['GET'])
+@cross_origin(origin="*", supports_credentials=True)
+@jwt_required()
+def get_reactions():
+    student_id = get_student_id()
+    if student_id is None:
+        return jsonify({"message": "Only students can react to posts"}), 403
+
+    try:
+        post_ids = [int(i) for i in request.args.get('post_ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify({"message": "post_ids must be a comma-separated list of integers"}), 400
+    if len(post_ids) > MAX_PAGE_SIZE:
+        return jsonify({"message": f"At most {MAX_PAGE_SIZE} post ids per request"}), 400
+
+    reactions = get_post_reactions(student_id, post_ids) if post_ids else {}
+    return jsonify({str(post_id): reaction for post_id, reaction in reactions.items()}), 200
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from models import UserPreference, db
 from flask_cors import cross_origin
+from identity import get_student_id
+from feed import feed_profile_changed
 
 
 preference_bp = Blueprint('preference', __name__)
@@ -12,7 +14,7 @@ preference_bp = Blueprint('preference', __name__)
 @jwt_required()
 
 def add_preference():
-    student_id = get_jwt_identity()
+    student_id = get_student_id()
     data = request.get_json()
     pref_type = data.get('preference_type')
     pref_value = data.get('preference_value')
@@ -39,6 +41,7 @@ def add_preference():
     )
     db.session.add(preference)
     db.session.commit()
+    feed_profile_changed(student_id)
 
     return jsonify({"message": "Preference added successfully", "preference_id": preference.id}), 201
     
@@ -47,7 +50,7 @@ def add_preference():
 @jwt_required()
 
 def get_preferences():
-    student_id = get_jwt_identity()
+    student_id = get_student_id()
     preferences = UserPreference.query.filter_by(student_id=student_id).all()
     
     return jsonify([{
@@ -1,9 +1,10 @@
 import os
 from flask import Blueprint, request, jsonify, current_app, send_from_directory
-from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
-from werkzeug.security import generate_password_hash
+from flask_jwt_extended import jwt_required
+from passwords import hash_password
 from werkzeug.utils import secure_filename
-from models import db, Admin, Student
+from models import db
+from identity import ROLES, forget_user, get_current_user
 from flask_cors import CORS
 
 profile_bp = Blueprint("profile_bp", __name__)
@@ -26,21 +27,7 @@ def handle_profile():
     PUT  /profile  -> updates the user's username, email, or password
     """
     try:
-        # Verify the JWT token and get the current user's identity.
-        verify_jwt_in_request()
-        current_user_data = get_jwt_identity()
-        role = current_user_data.get("role")
-        user_id = current_user_data.get("id")
-
-        if not role or not user_id:
-            return jsonify({"success": False, "error": "Invalid token: missing role or ID"}), 401
-
-        # Retrieve user from DB based on role.
-        if role == "admin":
-            user = Admin.query.get(user_id)
-        else:
-            user = Student.query.get(user_id)
-
+        user = get_current_user()
         if not user:
             return jsonify({"success": False, "error": "User not found"}), 404
 
@@ -51,7 +38,7 @@ def handle_profile():
                     "id": user.id,
                     "username": user.username,
                     "email": user.email,
-                    "role": role,
+                    "role": user.role,
                     "profile_pic": user.profile_pic  # Include profile picture info.
                 }
             }), 200
@@ -62,14 +49,19 @@ def handle_profile():
             new_email = data.get("email")
             new_password = data.get("password")  # Optional
 
+            changes = {}
             if new_username:
-                user.username = new_username
+                changes["username"] = new_username
             if new_email:
-                user.email = new_email
+                changes["email"] = new_email
             if new_password:
-                user.password = generate_password_hash(new_password)
+                changes["password"] = hash_password(new_password)
 
-            db.session.commit()
+            if changes:
+                # Update by id: the caller's row never needs loading
+                ROLES[user.role].query.filter_by(id=user.id).update(changes)
+                db.session.commit()
+                forget_user(user.role, user.id)
 
             return jsonify({
                 "success": True,
@@ -89,15 +81,7 @@ def update_profile_picture():
     Expects a multipart/form-data request with a file input named 'file'.
     """
     try:
-        current_user_data = get_jwt_identity()
-        role = current_user_data.get("role")
-        user_id = current_user_data.get("id")
-
-        if role == "admin":
-            user = Admin.query.get(user_id)
-        else:
-            user = Student.query.get(user_id)
-
+        user = get_current_user()
         if not user:
             return jsonify({"success": False, "error": "User not found"}), 404
 
@@ -117,8 +101,9 @@ def update_profile_picture():
             file.save(file_path)
 
             # Update the user's profile picture.
-            user.profile_pic = filename
+            ROLES[user.role].query.filter_by(id=user.id).update({"profile_pic": filename})
             db.session.commit()
+            forget_user(user.role, user.id)
 
             return jsonify({
                 "success": True,
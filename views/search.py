@@ -0,0 +1,43 @@
+from flask import Blueprint, request, jsonify
+from flask_cors import cross_origin
+from pagination import parse_limit
+from search import get_search_backend
+
+search_bp = Blueprint('search', __name__)
+
+# Deepest page we rank for; BM25 has to score every match up to offset + limit
+MAX_SEARCH_OFFSET = 1000
+
+# ✅ Ranked full-text search over posts and content
+# Query params: q, type (post | content), limit, offset.
+# The total number of matches is returned in the X-Total-Count header.
+@search_bp.route('/search', methods=['GET'])
+@cross_origin(origins="*", supports_credentials=True, expose_headers=["X-Total-Count"])
+def search():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"message": "Search query is required"}), 400
+
+    kind = request.args.get('type')
+    if kind not in (None, 'post', 'content'):
+        return jsonify({"message": "type must be 'post' or 'content'"}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        offset = int(request.args.get('offset', 0))
+        if not 0 <= offset <= MAX_SEARCH_OFFSET:
+            raise ValueError(f"offset must be between 0 and {MAX_SEARCH_OFFSET}")
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    backend = get_search_backend()
+    if backend is None:
+        return jsonify({"message": "Search is not configured"}), 503
+
+    total, results = backend.search(query, limit, offset, kind)
+    for result in results:
+        result["score"] = round(result["score"], 4)
+
+    response = jsonify(results)
+    response.headers["X-Total-Count"] = str(total)
+    return response, 200
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from flask_cors import cross_origin
+from identity import get_student_id
 
 share_bp = Blueprint('share', __name__)
 
@@ -16,7 +17,7 @@ def get_models():
 def share_post():
     Share, Post, Student, db = get_models()  # Import models inside function
 
-    student_id = get_jwt_identity()  # The logged-in student
+    student_id = get_student_id()  # The logged-in student
     data = request.get_json()
     post_id = data.get('post_id')
     shared_with = data.get('shared_with_id')  # Ensure naming matches the Share model
@@ -1,8 +1,13 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, create_access_token, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_jwt_extended import jwt_required, create_access_token
+from passwords import get_password_hasher, hash_password
 from models import Student, db
 from flask_cors import cross_origin
+from sqlalchemy.exc import SQLAlchemyError
+from streaming import wants_ndjson, iter_query, stream_csv, stream_rows
+from serializers import student_serializer
+from student_import import detect_format, get_import_pool, import_file
+from identity import forget_user, is_admin
 import logging
 
 # Configure logging
@@ -49,7 +54,7 @@ def create_student():
         if Student.query.filter_by(username=username).first():
             return jsonify({"message": "Username already exists"}), 400
 
-        hashed_password = generate_password_hash(password)
+        hashed_password = hash_password(password)
 
         new_student = Student(email=email, username=username, password=hashed_password)
         db.session.add(new_student)
@@ -63,20 +68,69 @@ def create_student():
         db.session.rollback()
         return jsonify({"message": "An error occurred while creating the student"}), 500
 
-# ✅ Get all students
+# ✅ Bulk-import students from a CSV or NDJSON upload (admins only).
+# Send the file as multipart field "file" or as the raw body; columns/keys
+# are email, username and password. ?dry_run=1 only checks the rows.
+@student_bp.route('/students/import', methods=['POST'])
+@cross_origin(origins="*", supports_credentials=True)
+@jwt_required()
+def import_students():
+    if not is_admin():
+        return jsonify({"message": "Only admins can import students"}), 403
+
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    fmt = detect_format(request.args.get("format"), upload.filename if upload else None,
+                        upload.mimetype if upload else request.mimetype)
+    if fmt is None:
+        return jsonify({"message": "Upload a CSV or NDJSON file"}), 400
+
+    try:
+        dry_run = request.args.get("dry_run") in ("1", "true")
+        report = import_file(stream, fmt, get_password_hasher(), dry_run=dry_run,
+                             pool=None if dry_run else get_import_pool())
+        return jsonify(report.to_dict()), 200
+
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    except Exception as e:
+        logger.error(f"Error importing students: {e}")
+        db.session.rollback()
+        return jsonify({"message": "An error occurred while importing students"}), 500
+
+# ✅ Export all students as CSV (default) or NDJSON (?format=ndjson), streamed (admins only)
+@student_bp.route('/students/export', methods=['GET'])
+@cross_origin(origins="*", supports_credentials=True)
+@jwt_required()
+def export_students():
+    if not is_admin():
+        return jsonify({"message": "Only admins can export students"}), 403
+
+    try:
+        students = iter_query(
+            db.session.query(*student_serializer.columns()).order_by(Student.id)
+        )
+        encode = student_serializer.row_encoder()
+        if wants_ndjson():
+            return stream_rows(students, encode, ndjson=True), 200
+        return stream_csv(students, encode, student_serializer.fields, filename="students.csv"), 200
+
+    except SQLAlchemyError as e:
+        logger.error(f"Database Error: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
+
+# ✅ Get all students, streamed as a JSON array (or NDJSON with ?format=ndjson)
 @student_bp.route('/students', methods=['GET'])
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def get_students():
     try:
-        students = Student.query.all()
-        students_data = [{
-            "id": student.id,
-            "email": student.email,
-            "username": student.username,
-            "created_at": student.created_at.isoformat()
-        } for student in students]
-        return jsonify(students_data), 200
+        # Only the serialized columns, so password hashes are never loaded
+        students = iter_query(
+            db.session.query(*student_serializer.columns()).order_by(Student.id)
+        )
+        return stream_rows(students, student_serializer.row_encoder(), ndjson=wants_ndjson()), 200
 
     except SQLAlchemyError as e:
         logger.error(f"Database Error: {e}")
@@ -93,13 +147,7 @@ def get_students():
 def get_student(student_id):
     try:
         student = Student.query.get_or_404(student_id)
-        student_data = {
-            "id": student.id,
-            "email": student.email,
-            "username": student.username,
-            "created_at": student.created_at.isoformat()
-        }
-        return jsonify(student_data), 200
+        return jsonify(student_serializer(student)), 200
 
     except Exception as e:
         logger.error(f"Error retrieving student with ID {student_id}: {e}")
@@ -125,9 +173,10 @@ def update_student(student_id):
             student.username = data['username']
 
         if 'password' in data and data['password']:
-            student.password = generate_password_hash(data['password'])
+            student.password = hash_password(data['password'])
 
         db.session.commit()
+        forget_user("student", student_id)
         logger.info(f"Student with ID {student_id} updated successfully")
         return jsonify({"message": "Student updated successfully"}), 200
 
@@ -145,6 +194,7 @@ def delete_student(student_id):
         student = Student.query.get_or_404(student_id)
         db.session.delete(student)
         db.session.commit()
+        forget_user("student", student_id)
         logger.info(f"Student with ID {student_id} deleted successfully")
         return jsonify({"message": "Student deleted successfully"}), 200
 
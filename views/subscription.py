@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from flask_cors import cross_origin
+from identity import get_student_id
+from feed import feed_profile_changed
 
 def get_models():
     from models import Subscription, Category, db
@@ -13,7 +15,8 @@ subscription_bp = Blueprint('subscription', __name__)
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def subscribe():
-    student_id = get_jwt_identity()
+    Subscription, Category, db = get_models()
+    student_id = get_student_id()
     data = request.get_json()
     category_id = data.get('category_id')
 
@@ -31,6 +34,7 @@ def subscribe():
     subscription = Subscription(student_id=student_id, category_id=category_id)
     db.session.add(subscription)
     db.session.commit()
+    feed_profile_changed(student_id)
 
     return jsonify({"message": "Subscribed successfully", "subscription_id": subscription.id}), 201
     
@@ -40,7 +44,7 @@ def subscribe():
 @jwt_required()
 def get_subscriptions():
     Subscription, _, _ = get_models()
-    student_id = get_jwt_identity()
+    student_id = get_student_id()
     subscriptions = Subscription.query.filter_by(student_id=student_id).all()
 
     return jsonify([{ "subscription_id": sub.id, "category_id": sub.category_id } for sub in subscriptions]), 200
@@ -51,7 +55,7 @@ def get_subscriptions():
 @jwt_required()
 def unsubscribe(subscription_id):
     Subscription, _, db = get_models()
-    student_id = get_jwt_identity()
+    student_id = get_student_id()
     subscription = Subscription.query.get(subscription_id)
 
     if not subscription:
@@ -62,5 +66,6 @@ def unsubscribe(subscription_id):
 
     db.session.delete(subscription)
     db.session.commit()
+    feed_profile_changed(student_id)
 
     return jsonify({"message": "Unsubscribed successfully"}), 200
@@ -1,10 +1,27 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from flask_cors import cross_origin
 from models import db, Post, Wishlist
+from pagination import parse_limit, encode_cursor, decode_cursor
+from serializers import wishlist_serializer
+from identity import get_student_id
 
 wishlist_bp = Blueprint('wishlist', __name__)
 
+# Post columns a client may ask for with ?fields=; all of them by default
+WISHLIST_POST_FIELDS = {
+    "title": Post.title,
+    "content": Post.content,
+    "category_id": Post.category_id,
+    "admin_id": Post.admin_id,
+    "student_id": Post.student_id,
+    "created_at": Post.created_at,
+    "is_approved": Post.is_approved,
+    "is_flagged": Post.is_flagged,
+    "likes": Post.likes,
+    "dislikes": Post.dislikes,
+}
+
 # Helper function to get wishlist item
 def get_wishlist_item(wishlist_id, student_id):
     return Wishlist.query.filter_by(id=wishlist_id, student_id=student_id).first()
@@ -13,7 +30,7 @@ def get_wishlist_item(wishlist_id, student_id):
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def add_to_wishlist():
-    student_id = get_jwt_identity().get("id")
+    student_id = get_student_id()
     data = request.get_json()
     post_id = data.get('post_id')
 
@@ -36,38 +53,60 @@ def add_to_wishlist():
         db.session.rollback()
         return jsonify({"message": str(e)}), 500
 
+# Get the caller's saved posts, most recently saved first, in one joined query
+# Query params: limit, cursor, fields (comma-separated subset of WISHLIST_POST_FIELDS).
+# The next page's cursor is returned in the X-Next-Cursor header (absent on the last page).
 @wishlist_bp.route('/wishlist', methods=['GET'])
-@cross_origin(origins="*", supports_credentials=True)
+@cross_origin(origins="*", supports_credentials=True, expose_headers=["X-Next-Cursor"])
 @jwt_required()
 def get_wishlist():
-    student_id = get_jwt_identity().get("id")
-
-    wishlist_items = Wishlist.query.filter_by(student_id=student_id).all()
-    wishlist_data = [
-        {
-            "wishlist_id": item.id,
-            "post_id": item.post.id,
-            "title": item.post.title,
-            "content": item.post.content,
-            "category_id": item.post.category_id,
-            "admin_id": item.post.admin_id,
-            "student_id": item.post.student_id,
-            "created_at": item.post.created_at.isoformat(),
-            "is_approved": item.post.is_approved,
-            "is_flagged": item.post.is_flagged,
-            "likes": item.post.likes,
-            "dislikes": item.post.dislikes
-        }
-        for item in wishlist_items if item.post
-    ]
-
-    return jsonify(wishlist_data), 200
+    student_id = get_student_id()
+
+    fields = request.args.get('fields')
+    if fields:
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in WISHLIST_POST_FIELDS]
+        if unknown:
+            return jsonify({"message": f"Unknown fields: {', '.join(unknown)}"}), 400
+    else:
+        fields = list(WISHLIST_POST_FIELDS)
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        cursor = request.args.get('cursor')
+        last_id = decode_cursor(cursor)[1] if cursor else None
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    query = (
+        db.session.query(
+            Wishlist.id.label("wishlist_id"),
+            Post.id.label("post_id"),
+            *(WISHLIST_POST_FIELDS[field].label(field) for field in fields)
+        )
+        .join(Post, Wishlist.post_id == Post.id)
+        .filter(Wishlist.student_id == student_id)
+    )
+    if last_id is not None:
+        query = query.filter(Wishlist.id < last_id)
+    rows = query.order_by(Wishlist.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(None, rows[-1].wishlist_id)
+
+    encode = wishlist_serializer.row_encoder(("wishlist_id", "post_id", *fields))
+    response = jsonify([encode(row) for row in rows])
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, 200
 
 @wishlist_bp.route('/wishlist/<int:wishlist_id>', methods=['DELETE'])
 @cross_origin(origins="*", supports_credentials=True)
 @jwt_required()
 def remove_from_wishlist(wishlist_id):
-    student_id = get_jwt_identity().get("id")
+    student_id = get_student_id()
     wishlist_item = get_wishlist_item(wishlist_id, student_id)
 
     if not wishlist_item: